@@ -0,0 +1,206 @@
+"""
+Headless batch runner for scoring many companies offline.
+
+    python batch_assess.py companies.csv results.jsonl --concurrency 8
+    python batch_assess.py companies.jsonl results.jsonl --parquet results.parquet
+    python batch_assess.py companies.jsonl results.jsonl --archive
+    python batch_assess.py companies.jsonl - --batch-api-file batch_requests.jsonl
+
+Each input row needs ``industry``, ``size`` and ``country`` and may carry an
+``id`` and ``answers`` (a list, a dict keyed q0..qN, or a JSON string of either).
+Rows without answers only have their questions generated. Results are appended
+to the output JSONL as they complete, and rows already present there are
+skipped, so a crashed run resumes where it stopped.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from llm_scheduler import BACKGROUND
+from models import Answer, CompanyInfo
+from openai_helper import (
+    MODEL,
+    SCORE_MAX_TOKENS,
+    build_score_prompt,
+    format_answers,
+    generate_ai_readiness_score,
+    generate_questions,
+)
+from prompts import build_messages
+from results_store import results_store
+from structured_output import JSON_OBJECT_RESPONSE_FORMAT
+from telemetry import percentile
+
+
+def load_profiles(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        if path.endswith(".csv"):
+            rows = list(csv.DictReader(f))
+        else:
+            rows = [json.loads(line) for line in f if line.strip()]
+
+    profiles = []
+    for i, row in enumerate(rows):
+        answers = row.get("answers")
+        if isinstance(answers, str):
+            answers = json.loads(answers) if answers.strip() else None
+        if isinstance(answers, dict):
+            answers = list(answers.values())
+        profiles.append(
+            {
+                "id": str(row.get("id") or i),
+                "company_info": CompanyInfo(row["industry"], row["size"], row["country"]),
+                "answers": Answer.from_state(answers) if answers else None,
+            }
+        )
+    return profiles
+
+
+def load_completed_ids(path):
+    if path == "-" or not os.path.exists(path):
+        return set()
+    completed = set()
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # A partially written last line from a crashed run
+            if not record.get("error"):
+                completed.add(record["id"])
+    return completed
+
+
+def assess(profile, archive=False):
+    company_info = profile["company_info"]
+    record = {"id": profile["id"], "company_info": company_info.to_dict(), "latency": {}}
+    try:
+        started = time.perf_counter()
+        questions = generate_questions(
+            company_info.industry, company_info.size, company_info.country, priority=BACKGROUND
+        )
+        record["questions"] = [question.to_dict() for question in questions]
+        record["latency"]["questions"] = time.perf_counter() - started
+
+        if profile["answers"]:
+            started = time.perf_counter()
+            result = generate_ai_readiness_score(
+                format_answers(profile["answers"]), company_info, priority=BACKGROUND
+            )
+            record["result"] = result.to_dict()
+            record["latency"]["score"] = time.perf_counter() - started
+            if archive:
+                results_store.add(result, company_info, questions, profile["answers"])
+    except Exception as e:
+        record["error"] = str(e)
+    return record
+
+
+def batch_api_request(profile):
+    # One line of an OpenAI Batch API input file, see https://platform.openai.com/docs/guides/batch
+    prompt = build_score_prompt(format_answers(profile["answers"]), profile["company_info"])
+    return {
+        "custom_id": profile["id"],
+        "method": "POST",
+        "url": "/v1/chat/completions",
+        "body": {
+            "model": MODEL,
+            "messages": build_messages(prompt),
+            "max_tokens": SCORE_MAX_TOKENS,
+            "response_format": JSON_OBJECT_RESPONSE_FORMAT,
+        },
+    }
+
+
+def print_report(records, elapsed):
+    succeeded = [record for record in records if not record.get("error")]
+    print(f"Assessed {len(succeeded)}/{len(records)} companies in {elapsed:.1f}s", file=sys.stderr)
+    if elapsed > 0:
+        print(f"Throughput: {len(succeeded) / elapsed * 60:.1f} assessments/min", file=sys.stderr)
+    for stage in ["questions", "score"]:
+        latencies = [record["latency"][stage] for record in succeeded if stage in record["latency"]]
+        if latencies:
+            print(
+                f"{stage}: n={len(latencies)} "
+                f"p50={percentile(latencies, 0.5):.2f}s "
+                f"p95={percentile(latencies, 0.95):.2f}s "
+                f"max={max(latencies):.2f}s",
+                file=sys.stderr,
+            )
+
+
+def write_parquet(jsonl_path, parquet_path):
+    import pandas as pd
+
+    df = pd.read_json(jsonl_path, lines=True)
+    # Nested payloads are kept as JSON text so the file stays flat and portable
+    for column in ["company_info", "questions", "result", "latency"]:
+        if column in df:
+            df[column] = df[column].apply(json.dumps)
+    df.to_parquet(parquet_path, index=False)
+
+
+def run(args):
+    profiles = load_profiles(args.input)
+    completed = load_completed_ids(args.output)
+    pending = [profile for profile in profiles if profile["id"] not in completed]
+    print(f"{len(completed)} already done, {len(pending)} to run", file=sys.stderr)
+
+    out = sys.stdout if args.output == "-" else open(args.output, "a", encoding="utf-8")
+    batch_file = open(args.batch_api_file, "w", encoding="utf-8") if args.batch_api_file else None
+    write_lock = threading.Lock()
+    records = []
+    started = time.perf_counter()
+    try:
+        if batch_file:
+            for profile in pending:
+                if profile["answers"]:
+                    batch_file.write(json.dumps(batch_api_request(profile)) + "\n")
+            print(f"Wrote Batch API requests to {args.batch_api_file}", file=sys.stderr)
+            return
+
+        with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+            futures = [executor.submit(assess, profile, args.archive) for profile in pending]
+            for future in as_completed(futures):
+                record = future.result()
+                with write_lock:
+                    out.write(json.dumps(record) + "\n")
+                    out.flush()
+                records.append(record)
+                if record.get("error"):
+                    print(f"[{record['id']}] failed: {record['error']}", file=sys.stderr)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+        if batch_file:
+            batch_file.close()
+
+    if args.archive:
+        results_store.flush()
+    print_report(records, time.perf_counter() - started)
+    if args.parquet and args.output != "-":
+        write_parquet(args.output, args.parquet)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run AI readiness assessments in bulk.")
+    parser.add_argument("input", help="CSV or JSONL file of company profiles")
+    parser.add_argument("output", help="JSONL file to append results to, or - for stdout")
+    parser.add_argument("--concurrency", type=int, default=4, help="Assessments run at once")
+    parser.add_argument("--parquet", help="Also write the full output to this Parquet file")
+    parser.add_argument(
+        "--archive", action="store_true", help="Add scored results to the analytics archive"
+    )
+    parser.add_argument(
+        "--batch-api-file",
+        help="Write scoring requests in OpenAI Batch API format instead of calling the API",
+    )
+    run(parser.parse_args(argv))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+import os
+import threading
+import time
+from cache import normalize_key_part
+import sqlite_util
+
+BENCHMARK_PATH = os.getenv("AI_READINESS_BENCHMARK_PATH", ".cache/benchmarks.sqlite3")
+# Below this many results a partition is too noisy and the next coarser one is used
+MIN_SAMPLES = int(os.getenv("AI_READINESS_BENCHMARK_MIN_SAMPLES", "20"))
+# Other processes append too, so in-memory histograms are re-read at most this often
+REFRESH_SECONDS = 60
+ANY = "*"
+NUM_BUCKETS = 101  # One bucket per integer score 0-100
+
+
+def partitions(industry, size, country):
+    """Partitions a result is counted in, from most to least specific."""
+    industry, size, country = (normalize_key_part(part) for part in (industry, size, country))
+    return [
+        (industry, size, country),
+        (industry, size, ANY),
+        (industry, ANY, ANY),
+        (ANY, ANY, ANY),
+    ]
+
+
+def histogram_quantile(counts, total, fraction):
+    target = fraction * (total - 1)
+    seen = 0
+    for score, count in enumerate(counts):
+        seen += count
+        if seen > target:
+            return score
+    return NUM_BUCKETS - 1
+
+
+class BenchmarkStore:
+    """
+    Score distributions of past assessments, partitioned by industry, size and
+    country. Each partition is a fixed 101-bucket histogram, so appends and
+    percentile lookups cost the same no matter how many results are stored.
+    """
+
+    def __init__(self, path=BENCHMARK_PATH, min_samples=MIN_SAMPLES):
+        self.path = path
+        self.min_samples = min_samples
+        self._lock = threading.Lock()
+        self._conn = None
+        self._histograms = {}
+        self._loaded_at = 0.0
+
+    def _connect(self):
+        if self._conn is None:
+            self._conn = sqlite_util.connect(
+                self.path,
+                """CREATE TABLE IF NOT EXISTS score_histogram (
+                    industry TEXT NOT NULL,
+                    size TEXT NOT NULL,
+                    country TEXT NOT NULL,
+                    bucket INTEGER NOT NULL,
+                    count INTEGER NOT NULL,
+                    PRIMARY KEY (industry, size, country, bucket)
+                )""",
+            )
+        return self._conn
+
+    def _load(self):
+        if time.time() - self._loaded_at < REFRESH_SECONDS:
+            return
+        histograms = {}
+        rows = self._connect().execute(
+            "SELECT industry, size, country, bucket, count FROM score_histogram"
+        )
+        for industry, size, country, bucket, count in rows:
+            counts = histograms.setdefault((industry, size, country), [0] * NUM_BUCKETS)
+            counts[bucket] = count
+        self._histograms = histograms
+        self._loaded_at = time.time()
+
+    def add(self, score, industry, size, country):
+        bucket = min(max(int(round(float(score))), 0), NUM_BUCKETS - 1)
+        with self._lock:
+            self._load()
+            conn = self._connect()
+            for partition in partitions(industry, size, country):
+                conn.execute(
+                    "INSERT INTO score_histogram (industry, size, country, bucket, count) "
+                    "VALUES (?, ?, ?, ?, 1) "
+                    "ON CONFLICT (industry, size, country, bucket) DO UPDATE SET count = count + 1",
+                    (*partition, bucket),
+                )
+                counts = self._histograms.setdefault(partition, [0] * NUM_BUCKETS)
+                counts[bucket] += 1
+            conn.commit()
+
+    def lookup(self, industry, size, country, score=None):
+        """
+        Return benchmark figures from the most specific partition with enough
+        results, or None if there is not enough history yet.
+        """
+        with self._lock:
+            self._load()
+            for partition in partitions(industry, size, country):
+                counts = self._histograms.get(partition)
+                total = sum(counts) if counts else 0
+                if total >= self.min_samples:
+                    counts = list(counts)
+                    break
+            else:
+                return None
+
+        benchmark = {
+            "partition": dict(zip(["industry", "size", "country"], partition)),
+            "count": total,
+            "industry_avg": sum(score * count for score, count in enumerate(counts)) / total,
+            "top_10": histogram_quantile(counts, total, 0.9),
+            "median": histogram_quantile(counts, total, 0.5),
+            "bottom_10": histogram_quantile(counts, total, 0.1),
+        }
+        if score is not None:
+            bucket = min(max(int(round(float(score))), 0), NUM_BUCKETS - 1)
+            below = sum(counts[:bucket]) + counts[bucket] / 2
+            benchmark["percentile_rank"] = 100.0 * below / total
+        return benchmark
+
+
+benchmark_store = BenchmarkStore()
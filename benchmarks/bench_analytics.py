@@ -0,0 +1,143 @@
+"""
+Query latency of the analytics page against a synthetic results archive.
+
+    python benchmarks/bench_analytics.py                    # 1,000,000 assessments
+    python benchmarks/bench_analytics.py --rows 200000 --files-per-partition 20
+    python benchmarks/bench_analytics.py --skip-compact     # as left between compactions
+
+Builds an archive in a temporary directory through the same write path the app
+uses (raw tables plus rollups, hive-partitioned by industry and month) and
+times every query the analytics page runs, cold and from the query cache. On a compacted archive cold queries
+should stay well under a second at a million assessments; per-file overhead
+dominates otherwise, which is what ``results_store.py compact`` is for.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from prompts import COMPANY_SIZES, INDUSTRIES  # noqa: E402
+from results_store import ResultsStore, _schemas  # noqa: E402
+
+COUNTRIES = ["United States", "United Kingdom", "India", "Germany", "Canada", "Brazil", "Japan", "France"]
+AREAS = ["Data", "Infrastructure", "Talent", "Strategy", "Governance", "Culture"]
+QUESTIONS_PER_RESULT = 15
+MONTHS = 24
+
+
+def build_archive(store, rows, files_per_partition, seed=0):
+    # Each pass writes one file per partition, so memory stays bounded by rows / files_per_partition
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    chunk = -(-rows // files_per_partition)
+    for part in range(files_per_partition):
+        count = min(chunk, rows - part * chunk)
+        if count > 0:
+            write_chunk(store, part, part * chunk, count, rng)
+
+
+def write_chunk(store, part, offset, rows, rng):
+    import numpy as np
+    import pyarrow as pa
+
+    schemas = _schemas()
+    months = np.array([f"{2025 + m // 12}-{m % 12 + 1:02d}" for m in range(MONTHS)])
+    month_index = rng.integers(0, MONTHS, rows)
+    completed_at = (
+        np.datetime64("2025-01-01", "s") + (month_index * 30 + rng.integers(0, 28, rows)) * 86400
+    )
+    overall = np.clip(rng.normal(55 + month_index * 0.5, 15), 0, 100).round()
+    common = {
+        "result_id": pa.array(np.char.add("r", np.arange(offset, offset + rows).astype(str))),
+        "completed_at": completed_at,
+        "industry": np.array(INDUSTRIES, dtype=object)[rng.integers(0, len(INDUSTRIES), rows)],
+        "month": months.astype(object)[month_index],
+        "size": np.array(COMPANY_SIZES, dtype=object)[rng.integers(0, len(COMPANY_SIZES), rows)],
+        "country": np.array(COUNTRIES, dtype=object)[rng.integers(0, len(COUNTRIES), rows)],
+    }
+
+    def repeat(times):
+        indices = pa.array(np.repeat(np.arange(rows), times))
+        return {name: pa.array(values).take(indices) for name, values in common.items()}
+
+    answers = rows * QUESTIONS_PER_RESULT
+    questions = np.array([f"How mature is practice {i}?" for i in range(QUESTIONS_PER_RESULT)], dtype=object)
+    tables = {
+        "assessments": dict(common, overall_score=overall, projected_score=np.minimum(overall + 15, 100)),
+        "area_scores": dict(
+            repeat(len(AREAS)),
+            area=np.tile(np.array(AREAS, dtype=object), rows),
+            score=np.clip(np.repeat(overall, len(AREAS)) + rng.normal(0, 10, rows * len(AREAS)), 0, 100),
+        ),
+        "answers": dict(
+            repeat(QUESTIONS_PER_RESULT),
+            question_index=np.tile(np.arange(QUESTIONS_PER_RESULT, dtype=np.int32), rows),
+            question_text=np.tile(questions, rows),
+            question_type=np.full(answers, "scale", dtype=object),
+            answer=np.full(answers, "3", dtype=object),
+            answer_value=rng.integers(1, 6, answers).astype(float),
+        ),
+    }
+    store.write_tables(
+        {name: pa.table(columns, schema=schemas[name]) for name, columns in tables.items()},
+        batch=f"part{part}",
+    )
+
+
+def queries():
+    filtered = {"industry": ["Retail", "Finance"], "size": [COMPANY_SIZES[1]]}
+    recent = {"month": ("2026-01", "2026-06"), "country": ["India"]}
+    return [
+        ("filter_options", lambda store: store.filter_options()),
+        ("summary", lambda store: store.summary()),
+        ("summary filtered", lambda store: store.summary(filtered)),
+        ("score_by industry", lambda store: store.score_by("industry")),
+        ("score_by country recent", lambda store: store.score_by("country", recent)),
+        ("score_distribution", lambda store: store.score_distribution()),
+        ("trend by industry", lambda store: store.trend(None, "industry")),
+        ("area_scores by size", lambda store: store.area_scores(None, "size")),
+        ("area_scores filtered", lambda store: store.area_scores(filtered)),
+        ("question_stats", lambda store: store.question_stats()),
+        ("question_stats recent", lambda store: store.question_stats(recent)),
+    ]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time analytics queries on a synthetic archive.")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Assessments in the archive")
+    parser.add_argument("--files-per-partition", type=int, default=8)
+    parser.add_argument(
+        "--skip-compact", action="store_true", help="Query the uncompacted files, as between compactions"
+    )
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="bench-analytics-") as path:
+        started = time.perf_counter()
+        store = ResultsStore(path)
+        build_archive(store, args.rows, args.files_per_partition)
+        if not args.skip_compact:
+            store.compact()
+        print(f"Built {args.rows:,} assessments in {time.perf_counter() - started:.1f}s; {store.stats()['files']}")
+
+        print(f"{'query':<26} {'cold':>9} {'cached':>9}")
+        slowest = 0.0
+        for name, query in queries():
+            store.invalidate()
+            started = time.perf_counter()
+            query(store)
+            cold = time.perf_counter() - started
+            started = time.perf_counter()
+            query(store)
+            cached = time.perf_counter() - started
+            slowest = max(slowest, cold)
+            print(f"{name:<26} {cold * 1000:>7.0f}ms {cached * 1000:>7.2f}ms")
+    return 0 if slowest < 1.0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,57 @@
+"""
+Rerun cost of the results-page charts with and without figure memoization,
+measured on the path the page takes: build the figure, then hand it to
+st.plotly_chart, which validates and serializes it again on every rerun.
+
+    python benchmarks/bench_chart_cache.py [reruns]
+"""
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import streamlit as st  # noqa: E402
+from visualization import create_benchmark_chart, create_radar_chart  # noqa: E402
+
+AREA_SCORES = {
+    "AI Strategy and Leadership": 75,
+    "Data Infrastructure and Management": 50,
+    "AI/ML Capabilities and Talent": 30,
+    "Ethical AI and Governance": 80,
+    "AI Integration and Innovation": 60,
+}
+BENCHMARK = (60, 55.2, 82, 31, 57)
+
+
+def render(radar, benchmark):
+    st.plotly_chart(radar(AREA_SCORES))
+    st.plotly_chart(benchmark(*BENCHMARK))
+
+
+def time_reruns(label, fn, reruns):
+    fn()  # Warm imports and the figure cache
+    started = time.perf_counter()
+    for _ in range(reruns):
+        fn()
+    per_rerun = (time.perf_counter() - started) / reruns
+    print(f"{label:<32} {per_rerun * 1000:9.3f} ms/rerun")
+    return per_rerun
+
+
+def main():
+    reruns = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    # Outside `streamlit run` every element call warns about the missing script context
+    logging.disable(logging.WARNING)
+    uncached = time_reruns(
+        "uncached figures",
+        lambda: render(create_radar_chart.__wrapped__, create_benchmark_chart.__wrapped__),
+        reruns,
+    )
+    cached = time_reruns("memoized figures", lambda: render(create_radar_chart, create_benchmark_chart), reruns)
+    print(f"speedup per rerun: {uncached / cached:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""
+Micro-benchmarks for the code that runs on every Streamlit rerun: question
+normalization, JSON parsing, scoring, chart building and the nested results
+renderer. Inputs are synthetic LLM outputs of 15 to 500 questions.
+
+    python benchmarks/bench_hot_paths.py                  # run and save
+    python benchmarks/bench_hot_paths.py --filter parse   # run matching cases only
+    python benchmarks/bench_hot_paths.py --compare a1b2c3d
+    python benchmarks/bench_hot_paths.py --compare path/to/baseline.json
+
+Results are saved to benchmarks/results/<commit>.json, which is not checked in.
+Timings only mean something against a baseline from the same machine, so
+comparisons are made only against the one named with ``--compare``: a commit
+saved there earlier, or any results file.
+"""
+import argparse
+import json
+import logging
+import os
+import random
+import subprocess
+import sys
+import time
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+SIZES = [15, 100, 500]
+REGRESSION_THRESHOLD = 1.2
+
+from data_processing import CATEGORIES, calculate_scores, prepare_radar_chart_data  # noqa: E402
+from json_stream import iter_json_array  # noqa: E402
+from models import questions_from_response  # noqa: E402
+from structured_output import parse_json_response  # noqa: E402
+from visualization import create_bar_chart, create_gauge_chart, create_radar_chart  # noqa: E402
+from pages.results import display_dict_or_list  # noqa: E402
+
+# display_dict_or_list runs outside a script context here, which streamlit
+# warns about on every call
+logging.disable(logging.WARNING)
+
+
+def synthetic_questions(n, rng):
+    questions = []
+    for i in range(n):
+        question_type = rng.choice(["scale", "multiple-choice", "open-ended"])
+        questions.append(
+            {
+                # Some responses use the older aliases, which normalization has to map
+                "question" if i % 7 == 0 else "question_text": f"How mature is practice {i} across the organization?",
+                "explanation": "Measures how consistently this practice is applied. " * 2,
+                "type": question_type.upper() if i % 5 == 0 else question_type,
+                "impact_level": rng.choice(["high", "medium", "low", "unknown"]),
+                "options": ["None", "Ad hoc", "Defined", "Managed", "Optimized"],
+            }
+        )
+    return "```json\n" + json.dumps({"questions": questions}, indent=2) + "\n```"
+
+
+def synthetic_result(n, rng):
+    items = max(n // 5, 3)
+    return {
+        "overall_score": rng.randint(0, 100),
+        "explanation": "Overall readiness is constrained by data quality. " * 5,
+        "area_scores": {area: rng.randint(0, 100) for area in CATEGORIES},
+        "strengths": [{"area": f"Strength {i}", "insight": "Clear ownership. " * 3} for i in range(items)],
+        "improvement_areas": [
+            {"area": f"Gap {i}", "actions": [f"Step {j}" for j in range(3)]} for i in range(items)
+        ],
+        "risks": [f"Risk {i}" for i in range(items)],
+        "opportunities": [f"Opportunity {i}" for i in range(items)],
+        "ai_use_cases": {
+            "current": [f"Current use case {i}" for i in range(items)],
+            "ideal": [f"Ideal use case {i}" for i in range(items)],
+        },
+    }
+
+
+def chunked(text, size=40):
+    return [text[i : i + size] for i in range(0, len(text), size)]
+
+
+def build_cases(n, rng):
+    questions_text = synthetic_questions(n, rng)
+    chunks = chunked(questions_text)
+    answers = [rng.randint(1, 5) for _ in range(n)]
+    _, category_scores = calculate_scores(answers)
+    scores = {f"Question {i}": answer for i, answer in enumerate(answers)}
+    result = synthetic_result(n, rng)
+    return {
+        "parse_json_response": lambda: parse_json_response(questions_text),
+        "normalize_questions": lambda: questions_from_response(parse_json_response(questions_text)),
+        "stream_parse_questions": lambda: list(iter_json_array(chunks)),
+        "calculate_scores": lambda: calculate_scores(answers),
+        "prepare_radar_chart_data": lambda: prepare_radar_chart_data(category_scores),
+        # Builders are timed unmemoized; a cache hit is not what a new session pays
+        "create_radar_chart": lambda: create_radar_chart.__wrapped__(category_scores),
+        "create_gauge_chart": lambda: create_gauge_chart.__wrapped__(3.5),
+        "create_bar_chart": lambda: create_bar_chart.__wrapped__(scores, "Answers"),
+        "display_dict_or_list": lambda: display_dict_or_list(result),
+    }
+
+
+def time_case(fn, min_time):
+    fn()  # Warm up imports and caches outside the measurement
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    repeats = max(3, int(min_time / max(timer.timeit(number) / number, 1e-9) / number))
+    runs = timer.repeat(repeat=min(repeats, 20), number=number)
+    return min(runs) / number
+
+
+def current_commit():
+    try:
+        commit = subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, text=True, stderr=subprocess.DEVNULL
+        ).strip()
+        dirty = subprocess.check_output(["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT, text=True)
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return commit + ("-dirty" if dirty.strip() else "")
+
+
+def load_results(name):
+    path = name if os.path.isfile(name) else os.path.join(RESULTS_DIR, f"{name}.json")
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark per-rerun hot paths.")
+    parser.add_argument("--filter", default="", help="Only run cases whose name contains this")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Seconds to spend per case")
+    parser.add_argument(
+        "--compare", help="Baseline to compare against: a commit with saved results, or a results file"
+    )
+    parser.add_argument("--no-save", action="store_true", help="Do not write a results file")
+    args = parser.parse_args(argv)
+
+    commit = current_commit()
+    baseline = load_results(args.compare) if args.compare else None
+    rng = random.Random(0)
+    timings = {}
+    regressions = 0
+    for n in SIZES:
+        for name, fn in build_cases(n, rng).items():
+            if args.filter not in name:
+                continue
+            case = f"{name}[{n}]"
+            timings[case] = time_case(fn, args.min_time)
+            line = f"{case:<32} {timings[case] * 1e6:12.1f} us"
+            previous = (baseline or {}).get("timings", {}).get(case)
+            if previous:
+                ratio = timings[case] / previous
+                line += f"  {ratio:5.2f}x vs {baseline['commit']}"
+                if ratio > REGRESSION_THRESHOLD:
+                    line += "  REGRESSION"
+                    regressions += 1
+            print(line)
+
+    if not args.no_save:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        path = os.path.join(RESULTS_DIR, f"{commit}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "commit": commit,
+                    "timestamp": time.time(),
+                    "python": sys.version.split()[0],
+                    "timings": timings,
+                },
+                f,
+                indent=2,
+                sort_keys=True,
+            )
+        print(f"Saved {path}")
+    if regressions:
+        print(f"{regressions} case(s) more than {REGRESSION_THRESHOLD:.1f}x slower than the baseline")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
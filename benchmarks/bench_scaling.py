@@ -0,0 +1,124 @@
+"""
+Throughput of 1..N worker processes sharing the coordination store, against
+the synthetic LLM backend.
+
+    python benchmarks/bench_scaling.py                     # 1, 2 and 4 workers
+    python benchmarks/bench_scaling.py --workers 1 2 4 8 --duration 20
+    python benchmarks/bench_scaling.py --rpm 120           # check the shared budget
+
+Each worker process runs a fixed number of simulated users back to back
+(the same flow as loadtest.py), as one Streamlit server would. With the rate
+limits left high, sessions/s should grow roughly linearly with the worker
+count until the host runs out of cores. With --rpm set, the combined request
+rate of all workers is reported next to the shared budget it must stay under.
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def configure(coordination_dir, args):
+    # App modules read these at import time, so this runs first in every worker
+    os.environ.update(
+        {
+            "AI_READINESS_LLM_BACKEND": "synthetic",
+            "AI_READINESS_SYNTHETIC_LATENCY": str(args.latency),
+            "AI_READINESS_COORDINATION_PATH": os.path.join(coordination_dir, "coordination.sqlite3"),
+            "AI_READINESS_CACHE_PATH": os.path.join(coordination_dir, "llm_cache.sqlite3"),
+            "OPENAI_RPM_LIMIT": str(args.rpm),
+            "OPENAI_TPM_LIMIT": str(args.tpm),
+            "OPENAI_API_KEY": os.environ.get("OPENAI_API_KEY", "benchmark"),
+        }
+    )
+
+
+def worker(index, coordination_dir, args, start_at, results):
+    import random
+
+    configure(coordination_dir, args)
+    from llm_backends import SyntheticBackend
+    from loadtest import simulate_user
+    from openai_helper import set_llm_backend
+
+    calls = []
+
+    class CountingBackend(SyntheticBackend):
+        def complete(self, *a, **kw):
+            calls.append(time.time())
+            return super().complete(*a, **kw)
+
+    set_llm_backend(CountingBackend(median_latency=args.latency, seed=index))
+    completed = []
+    deadline = start_at + args.duration
+
+    def user_loop(user):
+        rng = random.Random(index * 1000 + user)
+        while time.time() < deadline:
+            try:
+                simulate_user(user, rng, 0)
+                completed.append(time.time())
+            except Exception as e:
+                print(f"worker {index}: {str(e)}", file=sys.stderr)
+
+    time.sleep(max(start_at - time.time(), 0))
+    threads = [threading.Thread(target=user_loop, args=(user,)) for user in range(args.users_per_worker)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    results.put((len([t for t in completed if t <= deadline]), len([t for t in calls if t <= deadline])))
+
+
+def run(workers, args):
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    with tempfile.TemporaryDirectory(prefix="bench-scaling-") as coordination_dir:
+        # Leave time for every interpreter to start before the clock runs
+        start_at = time.time() + 3 + workers * 0.5
+        processes = [
+            context.Process(target=worker, args=(i, coordination_dir, args, start_at, results))
+            for i in range(workers)
+        ]
+        for process in processes:
+            process.start()
+        totals = [results.get() for _ in processes]
+        for process in processes:
+            process.join()
+    sessions = sum(count for count, _ in totals)
+    calls = sum(count for _, count in totals)
+    return sessions / args.duration, calls / args.duration * 60
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure throughput scaling across worker processes.")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds measured per worker count")
+    parser.add_argument("--users-per-worker", type=int, default=8, help="Concurrent users per worker")
+    parser.add_argument("--latency", type=float, default=0.05, help="Median synthetic LLM latency (s)")
+    parser.add_argument("--rpm", type=int, default=1_000_000, help="Shared requests-per-minute budget")
+    parser.add_argument("--tpm", type=int, default=1_000_000_000, help="Shared tokens-per-minute budget")
+    args = parser.parse_args(argv)
+
+    print(f"{'workers':>7} {'sessions/s':>11} {'speedup':>8} {'LLM calls/min':>14}")
+    baseline = None
+    for workers in args.workers:
+        throughput, calls_per_minute = run(workers, args)
+        baseline = baseline or throughput
+        print(
+            f"{workers:>7} {throughput:>11.2f} {throughput / baseline if baseline else 0:>7.2f}x "
+            f"{calls_per_minute:>14.0f}"
+        )
+    if args.rpm < 1_000_000:
+        # The bucket starts full, so a short run may exceed the steady rate by one bucket's worth
+        print(f"Shared budget: {args.rpm} requests/min plus an initial burst of {args.rpm}")
+
+
+if __name__ == "__main__":
+    main()
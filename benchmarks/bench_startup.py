@@ -0,0 +1,76 @@
+"""
+Cold-start import cost and per-rerun overhead of the Streamlit entry point.
+
+    python benchmarks/bench_startup.py [reruns]
+
+Cold start is measured with ``python -X importtime`` in a fresh interpreter,
+so run it from a quiet machine and compare numbers across commits.
+"""
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_MODULES = ["pages.company_info", "pages.assessment", "pages.results", "pages.analytics"]
+# Modules that should only be imported on first use, not at startup
+LAZY_MODULES = ["openai", "plotly.graph_objects", "pandas"]
+
+
+def measure_imports(modules):
+    code = "import " + ", ".join(modules)
+    started = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    wall = time.perf_counter() - started
+
+    imports = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, cumulative_us, name = (
+            field.strip() for field in line[len("import time:"):].split("|")
+        )
+        if cumulative_us.isdigit():  # Skips the header line
+            imports[name] = int(cumulative_us)
+    return wall, imports
+
+
+def measure_reruns(reruns):
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(os.path.join(ROOT, "main.py"), default_timeout=30)
+    started = time.perf_counter()
+    app.run()
+    first = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for _ in range(reruns):
+        app.run()
+    return first, (time.perf_counter() - started) / reruns
+
+
+def main():
+    reruns = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    wall, imports = measure_imports(APP_MODULES)
+    print(f"cold start (interpreter + app imports): {wall * 1000:8.1f} ms")
+    for module in APP_MODULES:
+        print(f"  import {module:<28} {imports.get(module, 0) / 1000:8.1f} ms cumulative")
+    for module in LAZY_MODULES:
+        state = "imported at startup" if module in imports else "deferred"
+        print(f"  {module:<35} {state}")
+
+    os.chdir(ROOT)
+    sys.path.insert(0, ROOT)
+    first, per_rerun = measure_reruns(reruns)
+    print(f"first script run:                       {first * 1000:8.1f} ms")
+    print(f"per rerun ({reruns} reruns):                  {per_rerun * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+import hashlib
+import json
+import os
+import threading
+import time
+import sqlite_util
+
+CACHE_PATH = os.getenv("AI_READINESS_CACHE_PATH", ".cache/llm_cache.sqlite3")
+CACHE_TTL_SECONDS = int(os.getenv("AI_READINESS_CACHE_TTL", str(7 * 24 * 3600)))
+CACHE_MAX_ENTRIES = int(os.getenv("AI_READINESS_CACHE_MAX_ENTRIES", "5000"))
+
+
+def normalize_key_part(value):
+    # "  united  States" and "United States" should land on the same entry
+    return " ".join(str(value).split()).casefold()
+
+
+def make_cache_key(*parts):
+    normalized = [normalize_key_part(part) for part in parts]
+    payload = json.dumps(normalized, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    Persistent, content-addressed cache for LLM responses backed by SQLite.
+
+    Entries expire after ``ttl`` seconds and the least recently used entries
+    are evicted once the cache grows beyond ``max_entries``.
+    """
+
+    def __init__(self, path=CACHE_PATH, ttl=CACHE_TTL_SECONDS, max_entries=CACHE_MAX_ENTRIES):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _connect(self):
+        if self._conn is None:
+            self._conn = sqlite_util.connect(
+                self.path,
+                """CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at);""",
+            )
+        return self._conn
+
+    def get(self, key, allow_stale=False):
+        """
+        Return the cached value or None. Expired entries count as misses but are
+        kept until evicted so ``allow_stale`` can still serve them as a fallback.
+        A fallback lookup follows a miss that was already counted, so it only
+        counts the expired entries it serves, as stale.
+        """
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT value, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                if not allow_stale:
+                    self.misses += 1
+                return None
+            value, created_at = row
+            expired = self.ttl and now - created_at > self.ttl
+            if expired and not allow_stale:
+                self.misses += 1
+                return None
+            conn.execute(
+                "UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            conn.commit()
+            if expired:
+                self.stale += 1
+            elif not allow_stale:
+                self.hits += 1
+        return json.loads(value)
+
+    def set(self, key, value):
+        now = time.time()
+        payload = json.dumps(value, separators=(",", ":"))
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, payload, now, now),
+            )
+            self._evict(conn)
+            conn.commit()
+
+    def _evict(self, conn):
+        if not self.max_entries:
+            return
+        (count,) = conn.execute("SELECT COUNT(*) FROM responses").fetchone()
+        overflow = count - self.max_entries
+        if overflow > 0:
+            conn.execute(
+                "DELETE FROM responses WHERE key IN ("
+                "SELECT key FROM responses ORDER BY accessed_at ASC LIMIT ?)",
+                (overflow,),
+            )
+
+    def delete(self, key):
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            conn.commit()
+
+    def clear(self):
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM responses")
+            conn.commit()
+
+    def stats(self):
+        with self._lock:
+            (size,) = self._connect().execute("SELECT COUNT(*) FROM responses").fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale": self.stale,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "size": size,
+        }
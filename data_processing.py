@@ -1,23 +1,96 @@
+import numpy as np
 import pandas as pd
 
+# The five focus areas the question prompt asks for, in prompt order
+CATEGORIES = [
+    "AI Strategy and Leadership",
+    "Data Infrastructure and Management",
+    "AI/ML Capabilities and Talent",
+    "Ethical AI and Governance",
+    "AI Integration and Innovation",
+]
+IMPACT_WEIGHTS = {"high": 3.0, "medium": 2.0, "low": 1.0}
+DEFAULT_IMPACT_WEIGHT = 2.0
+
 
 def calculate_scores(answers):
     # Convert answers to numeric values
     numeric_answers = [int(answer) for answer in answers]
 
-    # Calculate average score
-    average_score = sum(numeric_answers) / len(numeric_answers)
+    overall, category_matrix = score_cohort([numeric_answers])
+    category_scores = dict(zip(CATEGORIES, category_matrix[0].tolist()))
+
+    return float(overall[0]), category_scores
+
+
+def default_question_categories(num_questions, num_categories=len(CATEGORIES)):
+    """
+    Questions are generated area by area, so split them into equal contiguous
+    blocks, e.g. 15 questions -> 3 per area.
+    """
+    return np.arange(num_questions) * num_categories // max(num_questions, 1)
+
+
+def impact_weights(impact_levels):
+    return np.array(
+        [IMPACT_WEIGHTS.get(str(level).lower(), DEFAULT_IMPACT_WEIGHT) for level in impact_levels]
+    )
+
+
+def answer_to_number(answer, question):
+    """
+    Map one answer onto the 1-5 scale. Multiple-choice options are listed from
+    least to most mature; open-ended answers cannot be scored and become NaN.
+    """
+    if question.type == "scale":
+        try:
+            return float(answer)
+        except (TypeError, ValueError):
+            return np.nan
+    if question.type == "multiple-choice":
+        options = question.options
+        if answer in options and len(options) > 1:
+            return 1.0 + 4.0 * options.index(answer) / (len(options) - 1)
+    return np.nan
+
+
+def score_cohort(answer_matrix, question_categories=None, impact_levels=None, num_categories=len(CATEGORIES)):
+    """
+    Score N assessments at once.
+
+    ``answer_matrix`` is (N x Q) on the 1-5 scale with NaN for unscorable
+    answers, ``question_categories`` maps each question to a category index and
+    ``impact_levels`` gives each question's high/medium/low weight. Returns the
+    overall scores (N,) and per-category scores (N x categories); a category
+    with no scorable answers is NaN.
+    """
+    answers = np.asarray(answer_matrix, dtype=float)
+    if answers.ndim == 1:
+        answers = answers[np.newaxis, :]
+    num_questions = answers.shape[1]
+
+    if question_categories is None:
+        question_categories = default_question_categories(num_questions, num_categories)
+    weights = (
+        impact_weights(impact_levels) if impact_levels is not None else np.ones(num_questions)
+    )
+
+    answered = ~np.isnan(answers)
+    weighted_answers = np.where(answered, answers, 0.0) * weights
+    answer_weights = answered * weights
+
+    # One-hot (Q x C) membership turns the per-category sums into two matrix products
+    membership = np.zeros((num_questions, num_categories))
+    membership[np.arange(num_questions), np.asarray(question_categories)] = 1.0
 
-    # Calculate scores for different categories
-    categories = ["Policy", "Data Governance", "Strategy", "AI Capabilities", "Ethics"]
-    category_scores = {
-        cat: sum(numeric_answers[i : i + 2]) / 2 for i, cat in enumerate(categories)
-    }
+    with np.errstate(invalid="ignore", divide="ignore"):
+        category_scores = (weighted_answers @ membership) / (answer_weights @ membership)
+        overall_scores = weighted_answers.sum(axis=1) / answer_weights.sum(axis=1)
 
-    return average_score, category_scores
+    return overall_scores, category_scores
 
 
 def prepare_radar_chart_data(category_scores):
     df = pd.DataFrame(list(category_scores.items()), columns=["Category", "Score"])
-    df["Angle"] = [0, 2 * 3.14 / 3, 4 * 3.14 / 3]
+    df["Angle"] = np.linspace(0, 2 * np.pi, len(df), endpoint=False)
     return df
@@ -0,0 +1,150 @@
+import json
+
+
+class _JSONStreamScanner:
+    """
+    Scans a stream of text chunks for the first top-level JSON container that
+    opens with ``_open`` and tracks strings, escapes and nesting depth across
+    chunk boundaries. Subclasses decide what a completed top-level element is
+    by implementing ``_decode`` and, if needed, ``_close_nested``.
+    """
+
+    _open = None
+
+    def __init__(self):
+        self._buffer = ""
+        self._pos = 0
+        self._started = False
+        self._finished = False
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._start = None
+
+    @property
+    def finished(self):
+        return self._finished
+
+    def feed(self, chunk):
+        if self._finished or not chunk:
+            return []
+
+        self._buffer += chunk
+        elements = []
+        buffer = self._buffer
+        i = self._pos
+
+        while i < len(buffer):
+            char = buffer[i]
+
+            if not self._started:
+                if char == self._open:
+                    self._started = True
+                    self._depth = 1
+                i += 1
+                continue
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                i += 1
+                continue
+
+            if char == '"':
+                self._in_string = True
+                if self._depth == 1 and self._start is None:
+                    self._start = i
+            elif char in "{[":
+                if self._depth == 1 and self._start is None:
+                    self._start = i
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._finished = True
+                    self._flush(buffer, i, elements)
+                    break
+                if self._depth == 1:
+                    self._close_nested(buffer, i, elements)
+            elif char == "," and self._depth == 1:
+                self._flush(buffer, i, elements)
+            elif self._depth == 1 and self._start is None and not char.isspace():
+                self._start = i
+            i += 1
+
+        # Drop everything that has already been consumed to keep memory flat
+        keep_from = self._start if self._start is not None else i
+        self._buffer = buffer[keep_from:]
+        self._pos = i - keep_from
+        if self._start is not None:
+            self._start = 0
+        return elements
+
+    def _flush(self, buffer, end, elements):
+        # A top-level element ends at the "," or closing bracket that follows it
+        if self._start is None:
+            return
+        text = buffer[self._start : end].strip()
+        self._start = None
+        if text:
+            elements.extend(self._decode(text))
+
+    def _close_nested(self, buffer, end, elements):
+        """Called when a container nested directly in the top level closes at ``end``."""
+
+    def _decode(self, text):
+        raise NotImplementedError
+
+
+class JSONArrayStreamParser(_JSONStreamScanner):
+    """
+    Incrementally parses the first JSON array found in a stream of text chunks
+    and returns each element as soon as it is complete.
+
+    Anything before the opening bracket (markdown fences, a wrapping object such
+    as ``{"questions": [``) is skipped, so partial LLM output can be fed in as it
+    arrives.
+    """
+
+    _open = "["
+
+    def _close_nested(self, buffer, end, elements):
+        # Objects and arrays are complete at their closing bracket, without waiting for ","
+        elements.extend(self._decode(buffer[self._start : end + 1]))
+        self._start = None
+
+    def _decode(self, text):
+        try:
+            return [json.loads(text)]
+        except json.JSONDecodeError as json_error:
+            raise ValueError(f"Invalid JSON element in stream: {str(json_error)}")
+
+
+def iter_json_array(chunks):
+    parser = JSONArrayStreamParser()
+    for chunk in chunks:
+        for element in parser.feed(chunk):
+            yield element
+        if parser.finished:
+            break
+
+
+class JSONObjectStreamParser(_JSONStreamScanner):
+    """
+    Incrementally parses the first JSON object found in a stream of text chunks
+    and returns each top-level ``(key, value)`` member as soon as it is complete.
+
+    Like ``JSONArrayStreamParser``, anything before the opening brace is skipped.
+    """
+
+    _open = "{"
+
+    def _decode(self, text):
+        try:
+            return list(json.loads("{" + text + "}").items())
+        except json.JSONDecodeError as json_error:
+            raise ValueError(f"Invalid JSON member in stream: {str(json_error)}")
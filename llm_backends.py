@@ -0,0 +1,262 @@
+"""
+Pluggable chat-completion backends behind ``openai_helper``.
+
+Every backend exposes ``complete(model, messages, max_tokens, **kwargs)`` and
+returns objects shaped like the OpenAI SDK's (``choices[0].message.content``,
+``usage``, ``model``; an iterator of delta chunks when ``stream=True``), so the
+helpers treat them all the same. Select one with ``AI_READINESS_LLM_BACKEND``:
+
+    openai                 live API (default)
+    synthetic              generated responses, no network
+    record:<path.jsonl>    live API, saving every request/response pair
+    replay:<path.jsonl>    answer from a previous recording, no network
+"""
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+from types import SimpleNamespace
+
+STREAM_CHUNK_CHARS = 40
+_QUESTION_COUNT = re.compile(r"Generate (\d+) questions")
+
+
+class BackendError(Exception):
+    """A simulated upstream failure; the scheduler retries these like a 5xx."""
+
+    retryable = True
+
+
+def make_completion(content, model, prompt_tokens=0, completion_tokens=0, finish_reason="stop"):
+    return SimpleNamespace(
+        model=model,
+        choices=[SimpleNamespace(message=SimpleNamespace(content=content), finish_reason=finish_reason)],
+        usage=SimpleNamespace(
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            total_tokens=prompt_tokens + completion_tokens,
+        ),
+    )
+
+
+def iter_stream_chunks(content, model, prompt_tokens=0, completion_tokens=0, delay=0.0):
+    for start in range(0, len(content), STREAM_CHUNK_CHARS):
+        if delay:
+            time.sleep(delay)
+        yield SimpleNamespace(
+            model=model,
+            usage=None,
+            choices=[SimpleNamespace(delta=SimpleNamespace(content=content[start : start + STREAM_CHUNK_CHARS]))],
+        )
+    # Final usage-only chunk, as sent with stream_options={"include_usage": True}
+    yield SimpleNamespace(
+        model=model,
+        choices=[],
+        usage=SimpleNamespace(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens),
+    )
+
+
+def request_key(model, messages, max_tokens, response_format=None):
+    payload = json.dumps(
+        [model, messages, max_tokens, response_format], sort_keys=True, separators=(",", ":")
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class OpenAIBackend:
+    def __init__(self, client_factory):
+        self.client_factory = client_factory
+
+    def complete(self, model, messages, max_tokens, **kwargs):
+        return self.client_factory().chat.completions.create(
+            model=model, messages=messages, max_tokens=max_tokens, **kwargs
+        )
+
+
+class RecordReplayBackend:
+    """
+    In ``record`` mode, forwards calls to ``inner`` and appends each
+    request/response pair to a JSONL file. In ``replay`` mode, answers from that
+    file and raises KeyError for requests that were never recorded.
+    """
+
+    def __init__(self, path, mode="replay", inner=None):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown record/replay mode: {mode}")
+        if mode == "record" and inner is None:
+            raise ValueError("Record mode needs a backend to forward calls to")
+        self.path = path
+        self.mode = mode
+        self.inner = inner
+        self._lock = threading.Lock()
+        self._responses = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self._responses[entry["key"]] = entry
+
+    def complete(self, model, messages, max_tokens, **kwargs):
+        stream = kwargs.get("stream", False)
+        key = request_key(model, messages, max_tokens, kwargs.get("response_format"))
+
+        if self.mode == "replay":
+            entry = self._responses.get(key)
+            if entry is None:
+                raise KeyError(f"No recorded response for request {key[:12]}")
+        else:
+            entry = self._record(key, model, messages, max_tokens, kwargs)
+
+        usage = entry.get("usage", {})
+        args = (entry["content"], entry["model"], usage.get("prompt_tokens", 0), usage.get("completion_tokens", 0))
+        if stream:
+            return iter_stream_chunks(*args)
+        # Older recordings did not keep the finish reason
+        return make_completion(*args, finish_reason=entry.get("finish_reason", "stop"))
+
+    def _record(self, key, model, messages, max_tokens, kwargs):
+        # Always record the non-streamed form; replay can stream it back in chunks
+        kwargs = {k: v for k, v in kwargs.items() if k not in ("stream", "stream_options")}
+        completion = self.inner.complete(model, messages, max_tokens, **kwargs)
+        usage = getattr(completion, "usage", None)
+        entry = {
+            "key": key,
+            "request": {"model": model, "messages": messages, "max_tokens": max_tokens, **kwargs},
+            "model": completion.model,
+            "content": completion.choices[0].message.content,
+            "finish_reason": completion.choices[0].finish_reason,
+            "usage": {
+                "prompt_tokens": getattr(usage, "prompt_tokens", 0),
+                "completion_tokens": getattr(usage, "completion_tokens", 0),
+            },
+        }
+        with self._lock:
+            self._responses[key] = entry
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+        return entry
+
+
+class SyntheticBackend:
+    """
+    Returns well-formed fake responses for the questions, recommendations and
+    scoring prompts after a latency drawn from a log-normal distribution, and
+    fails a configurable fraction of calls.
+    """
+
+    def __init__(self, median_latency=2.0, latency_sigma=0.5, failure_rate=0.0, tokens_per_second=0.0, seed=None):
+        self.median_latency = median_latency
+        self.latency_sigma = latency_sigma
+        self.failure_rate = failure_rate
+        # When set, streamed output is paced like real token generation
+        self.tokens_per_second = tokens_per_second
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _draw(self):
+        with self._lock:
+            latency = self.median_latency * self._random.lognormvariate(0, self.latency_sigma)
+            failed = self._random.random() < self.failure_rate
+            seed = self._random.random()
+        return latency, failed, random.Random(seed)
+
+    def complete(self, model, messages, max_tokens, **kwargs):
+        latency, failed, rng = self._draw()
+        content = self._content(messages, kwargs.get("response_format"), rng)
+        prompt_tokens = sum(len(message["content"]) for message in messages) // 4
+        completion_tokens = len(content) // 4
+
+        if not kwargs.get("stream"):
+            time.sleep(latency)
+            if failed:
+                raise BackendError("Synthetic upstream failure")
+            return make_completion(content, model, prompt_tokens, completion_tokens)
+
+        # Time to first token is a fraction of the full latency when streaming
+        time.sleep(latency * 0.2)
+        if failed:
+            raise BackendError("Synthetic upstream failure")
+        chunks = max(len(content) // STREAM_CHUNK_CHARS, 1)
+        if self.tokens_per_second:
+            delay = completion_tokens / self.tokens_per_second / chunks
+        else:
+            delay = latency * 0.8 / chunks
+        return iter_stream_chunks(content, model, prompt_tokens, completion_tokens, delay)
+
+    def _content(self, messages, response_format, rng):
+        prompt = messages[-1]["content"]
+        if response_format and response_format.get("type") == "json_schema":
+            return json.dumps({"questions": self._questions(prompt, rng)})
+        if "'recommendations' key" in prompt:
+            return json.dumps({"recommendations": self._recommendations(rng)})
+        return json.dumps(self._score(rng))
+
+    def _questions(self, prompt, rng):
+        match = _QUESTION_COUNT.search(prompt)
+        count = int(match.group(1)) if match else 15
+        questions = []
+        for i in range(count):
+            question_type = rng.choice(["scale", "multiple-choice", "open-ended"])
+            questions.append(
+                {
+                    "question_text": f"Synthetic question {i + 1}?",
+                    "explanation": "Generated by the synthetic backend.",
+                    "type": question_type,
+                    "impact_level": rng.choice(["high", "medium", "low"]),
+                    "options": ["None", "Ad hoc", "Defined", "Managed", "Optimized"]
+                    if question_type == "multiple-choice"
+                    else [],
+                }
+            )
+        return questions
+
+    def _recommendations(self, rng):
+        return [
+            {
+                "Action": f"Synthetic action {i + 1}",
+                "Rationale": "Generated by the synthetic backend.",
+                "Timeline": rng.choice(["short-term", "medium-term", "long-term"]),
+                "Key Performance Indicators": ["KPI A", "KPI B"],
+            }
+            for i in range(5)
+        ]
+
+    def _score(self, rng):
+        from prompts import FOCUS_AREAS
+
+        area_scores = {area: rng.randint(20, 90) for area in FOCUS_AREAS}
+        overall = round(sum(area_scores.values()) / len(area_scores))
+        return {
+            "overall_score": overall,
+            "explanation": "Generated by the synthetic backend.",
+            "area_scores": area_scores,
+            "strengths": ["Synthetic strength"],
+            "improvement_areas": ["Synthetic improvement area"],
+            "projected_score": min(overall + 15, 100),
+            "risks": ["Synthetic risk"],
+            "opportunities": ["Synthetic opportunity"],
+            "ai_use_cases": {"current": "Synthetic current use case", "ideal": "Synthetic ideal scenario"},
+            "policy_strategy_insights": "Generated by the synthetic backend.",
+            "recommendations_for_future": ["Synthetic recommendation"],
+        }
+
+
+def backend_from_env(client_factory, spec=None):
+    spec = spec if spec is not None else os.getenv("AI_READINESS_LLM_BACKEND", "openai")
+    kind, _, path = spec.partition(":")
+    if kind == "openai":
+        return OpenAIBackend(client_factory)
+    if kind == "synthetic":
+        return SyntheticBackend(
+            median_latency=float(os.getenv("AI_READINESS_SYNTHETIC_LATENCY", "2.0")),
+            failure_rate=float(os.getenv("AI_READINESS_SYNTHETIC_FAILURE_RATE", "0")),
+        )
+    if kind == "record":
+        return RecordReplayBackend(path, "record", OpenAIBackend(client_factory))
+    if kind == "replay":
+        return RecordReplayBackend(path, "replay")
+    raise ValueError(f"Unknown LLM backend: {spec}")
@@ -0,0 +1,307 @@
+import heapq
+import itertools
+import os
+import random
+import threading
+import time
+from prompts import count_message_tokens
+from telemetry import logger, note_retry
+import sqlite_util
+
+INTERACTIVE = 0
+BACKGROUND = 1
+
+REQUESTS_PER_MINUTE = int(os.getenv("OPENAI_RPM_LIMIT", "500"))
+TOKENS_PER_MINUTE = int(os.getenv("OPENAI_TPM_LIMIT", "200000"))
+MAX_CONNECTIONS = int(os.getenv("OPENAI_MAX_CONNECTIONS", "20"))
+MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", "4"))
+RETRY_BASE_DELAY = 0.5
+RETRY_MAX_DELAY = 20.0
+# Set to a SQLite path (ideally on local disk or /dev/shm) to share the rate-limit
+# budget between every app worker process on the host
+COORDINATION_PATH = os.getenv("AI_READINESS_COORDINATION_PATH")
+
+
+class Priority:
+    """A request's priority, which can still be raised while the request waits for admission."""
+
+    __slots__ = ("level",)
+
+    def __init__(self, level):
+        self.level = level
+
+
+def create_http_client(max_connections=MAX_CONNECTIONS):
+    from openai import DEFAULT_CONNECTION_LIMITS, DefaultHttpxClient
+
+    # Build the limits with whatever HTTP library the installed openai SDK uses
+    limits = type(DEFAULT_CONNECTION_LIMITS)(
+        max_connections=max_connections,
+        max_keepalive_connections=max_connections,
+    )
+    return DefaultHttpxClient(limits=limits)
+
+
+def estimate_tokens(messages, max_tokens):
+    # Rate limits count the prompt plus the full output budget
+    return count_message_tokens(messages) + (max_tokens or 0)
+
+
+class TokenBucket:
+    def __init__(self, per_minute):
+        self.capacity = float(per_minute)
+        self.tokens = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.updated_at = time.monotonic()
+
+    def refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def wait_time(self, amount):
+        # Requests larger than the whole bucket are admitted once it is full
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def consume(self, amount):
+        self.tokens -= min(amount, self.capacity)
+
+
+class SharedRateLimiter:
+    """
+    Request and token buckets stored in SQLite, so every worker process on the
+    host draws from one OpenAI budget. Each admission check refills and, if
+    both buckets have room, debits them in a single write transaction.
+    """
+
+    def __init__(self, path, requests_per_minute=REQUESTS_PER_MINUTE, tokens_per_minute=TOKENS_PER_MINUTE):
+        self.path = path
+        self.limits = {"requests": requests_per_minute, "tokens": tokens_per_minute}
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _connect(self):
+        if self._conn is None:
+            # Autocommit mode so the transaction can be opened with BEGIN IMMEDIATE
+            self._conn = sqlite_util.connect(
+                self.path,
+                """CREATE TABLE IF NOT EXISTS rate_buckets (
+                    name TEXT PRIMARY KEY,
+                    tokens REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )""",
+                isolation_level=None,
+                timeout=10,
+            )
+        return self._conn
+
+    def try_acquire(self, tokens):
+        """Debit one request and ``tokens``; returns 0, or the seconds to wait before retrying."""
+        amounts = {"requests": 1, "tokens": tokens}
+        # Wall-clock time, since the stored timestamps are compared across processes
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                stored = {
+                    name: (level, updated_at)
+                    for name, level, updated_at in conn.execute(
+                        "SELECT name, tokens, updated_at FROM rate_buckets"
+                    )
+                }
+                buckets = {}
+                for name, per_minute in self.limits.items():
+                    bucket = buckets[name] = TokenBucket(per_minute)
+                    bucket.tokens, bucket.updated_at = stored.get(name, (bucket.capacity, now))
+                    bucket.refill(now)
+                wait = max(bucket.wait_time(amounts[name]) for name, bucket in buckets.items())
+                if wait == 0:
+                    for name, bucket in buckets.items():
+                        bucket.consume(amounts[name])
+                conn.executemany(
+                    "INSERT OR REPLACE INTO rate_buckets (name, tokens, updated_at) VALUES (?, ?, ?)",
+                    [(name, bucket.tokens, now) for name, bucket in buckets.items()],
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return wait
+
+
+def is_retryable(error):
+    if getattr(error, "retryable", False):
+        return True  # Simulated failures from llm_backends
+    from openai import APIConnectionError, APIStatusError, APITimeoutError, RateLimitError
+
+    if isinstance(error, (RateLimitError, APIConnectionError, APITimeoutError)):
+        return True
+    return isinstance(error, APIStatusError) and error.status_code >= 500
+
+
+def has_content(chunk):
+    choices = getattr(chunk, "choices", None)
+    return bool(choices) and bool(getattr(choices[0].delta, "content", None))
+
+
+def retry_delay(error, attempt):
+    response = getattr(error, "response", None)
+    retry_after = response.headers.get("retry-after") if response is not None else None
+    if retry_after:
+        try:
+            return min(float(retry_after), RETRY_MAX_DELAY)
+        except ValueError:
+            pass
+    # Full jitter keeps many sessions that hit a 429 together from retrying in lockstep
+    return random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt))
+
+
+class RequestScheduler:
+    """
+    Process-wide admission control for OpenAI calls.
+
+    Calls wait for request-per-minute and token-per-minute budget and for a free
+    connection slot; interactive calls are always admitted ahead of background ones.
+    Streamed calls keep their slot until the stream has been read or closed.
+    Rate-limit and server errors are retried with jittered exponential backoff.
+    With a ``shared`` SharedRateLimiter the budget is host-wide instead of per process.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute=REQUESTS_PER_MINUTE,
+        tokens_per_minute=TOKENS_PER_MINUTE,
+        max_concurrency=MAX_CONNECTIONS,
+        max_retries=MAX_RETRIES,
+        shared=None,
+    ):
+        self.request_bucket = TokenBucket(requests_per_minute)
+        self.token_bucket = TokenBucket(tokens_per_minute)
+        self.shared = shared
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.in_flight = 0
+        self.retries = 0
+        self._waiting = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+
+    def acquire(self, tokens, priority=INTERACTIVE):
+        handle = priority if isinstance(priority, Priority) else Priority(priority)
+        sequence = next(self._sequence)
+        with self._condition:
+            heapq.heappush(self._waiting, (handle.level, sequence, handle))
+            try:
+                while True:
+                    timeout = None
+                    if self._waiting[0][1] == sequence and self.in_flight < self.max_concurrency:
+                        timeout = self._take_budget(tokens)
+                        if timeout == 0:
+                            self.in_flight += 1
+                            return
+                    self._condition.wait(timeout)
+            finally:
+                self._waiting = [ticket for ticket in self._waiting if ticket[1] != sequence]
+                heapq.heapify(self._waiting)
+                self._condition.notify_all()
+
+    def raise_priority(self, handle, level):
+        """Move a waiting (or future) request made with ``handle`` up to ``level``."""
+        with self._condition:
+            if level >= handle.level:
+                return
+            handle.level = level
+            self._waiting = [
+                (level if waiting is handle else current, sequence, waiting)
+                for current, sequence, waiting in self._waiting
+            ]
+            heapq.heapify(self._waiting)
+            self._condition.notify_all()
+
+    def _take_budget(self, tokens):
+        if self.shared is not None:
+            return self.shared.try_acquire(tokens)
+        now = time.monotonic()
+        self.request_bucket.refill(now)
+        self.token_bucket.refill(now)
+        timeout = max(self.request_bucket.wait_time(1), self.token_bucket.wait_time(tokens))
+        if timeout == 0:
+            self.request_bucket.consume(1)
+            self.token_bucket.consume(tokens)
+        return timeout
+
+    def release(self):
+        with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+
+    def call(self, request, tokens, priority=INTERACTIVE, stream=False):
+        """
+        Run ``request`` once admitted, retrying transient failures. With ``stream``
+        the request returns a chunk iterator, and the result is an iterator that
+        holds its connection slot until the stream is exhausted or closed.
+        """
+        if stream:
+            return self._stream(request, tokens, priority)
+        attempt = 0
+        while True:
+            self.acquire(tokens, priority)
+            try:
+                return request()
+            except Exception as e:
+                if attempt >= self.max_retries or not is_retryable(e):
+                    raise
+                delay = retry_delay(e, attempt)
+            finally:
+                self.release()
+            attempt += 1
+            self._backoff(delay, attempt)
+
+    def _stream(self, request, tokens, priority):
+        attempt = 0
+        while True:
+            self.acquire(tokens, priority)
+            upstream = None
+            delivered = False
+            try:
+                upstream = request()
+                for chunk in upstream:
+                    delivered = delivered or has_content(chunk)
+                    yield chunk
+                return
+            except Exception as e:
+                # A fresh completion cannot be spliced onto text the caller already has,
+                # so only failures before the first content chunk are retried
+                if delivered or attempt >= self.max_retries or not is_retryable(e):
+                    raise
+                delay = retry_delay(e, attempt)
+            finally:
+                # Also reached when the caller closes the stream early
+                close = getattr(upstream, "close", None)
+                if close is not None:
+                    close()
+                self.release()
+            attempt += 1
+            self._backoff(delay, attempt)
+
+    def _backoff(self, delay, attempt):
+        self.retries += 1
+        note_retry()
+        logger.warning("Retrying OpenAI request in %.2fs (attempt %d)", delay, attempt)
+        time.sleep(delay)
+
+    def stats(self):
+        with self._condition:
+            return {
+                "in_flight": self.in_flight,
+                "waiting": len(self._waiting),
+                "retries": self.retries,
+            }
+
+
+scheduler = RequestScheduler(
+    shared=SharedRateLimiter(COORDINATION_PATH) if COORDINATION_PATH else None
+)
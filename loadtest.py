@@ -0,0 +1,163 @@
+"""
+Asyncio load driver that runs simulated users through the app flow with no
+network access.
+
+    python loadtest.py --users 200 --concurrency 50
+    python loadtest.py --users 50 --latency 0.5 --failure-rate 0.05
+    python loadtest.py --users 20 --backend replay:recordings.jsonl
+
+Each user picks a company profile (company_info), streams its question set
+and answers it (assessment), then runs the results pipeline for the score
+and recommendations (results). By default the synthetic backend stands in for
+OpenAI and the question cache lives in a throwaway directory, so the numbers
+reflect this code's scheduling, caching and parsing overhead.
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from prompts import COMPANY_SIZES, INDUSTRIES
+from telemetry import percentile
+
+COUNTRIES = ["United States", "United Kingdom", "Germany", "India", "Brazil", "Japan"]
+STAGES = ["questions", "score", "recommendations", "session"]
+
+
+def configure(args):
+    # Must run before the app modules are imported, since they read these at import time
+    os.environ["AI_READINESS_LLM_BACKEND"] = args.backend
+    os.environ["AI_READINESS_SYNTHETIC_LATENCY"] = str(args.latency)
+    os.environ["AI_READINESS_SYNTHETIC_FAILURE_RATE"] = str(args.failure_rate)
+    os.environ.setdefault("OPENAI_API_KEY", "loadtest")
+    if args.rpm:
+        os.environ["OPENAI_RPM_LIMIT"] = str(args.rpm)
+    if args.tpm:
+        os.environ["OPENAI_TPM_LIMIT"] = str(args.tpm)
+    if not args.keep_cache:
+        os.environ["AI_READINESS_CACHE_PATH"] = os.path.join(
+            tempfile.mkdtemp(prefix="loadtest-"), "llm_cache.sqlite3"
+        )
+
+
+def answer(question, rng):
+    if question.type == "multiple-choice" and question.options:
+        return rng.choice(question.options)
+    if question.type == "scale":
+        return rng.randint(1, 5)
+    return "We are piloting a few AI projects but have no formal programme yet."
+
+
+def simulate_user(user_id, rng, think_time):
+    from models import Answer, CompanyInfo
+    from openai_helper import format_answers, generate_questions_stream
+    from pipeline import ResultsPipeline
+
+    company_info = CompanyInfo(rng.choice(INDUSTRIES), rng.choice(COMPANY_SIZES), rng.choice(COUNTRIES))
+    latency = {}
+    session_started = time.perf_counter()
+
+    started = time.perf_counter()
+    questions = list(
+        generate_questions_stream(company_info.industry, company_info.size, company_info.country)
+    )
+    latency["questions"] = time.perf_counter() - started
+
+    if think_time:
+        time.sleep(rng.uniform(0, think_time))
+    answers = Answer.from_state([answer(question, rng) for question in questions])
+
+    pipeline = ResultsPipeline(format_answers(answers), company_info)
+    started = time.perf_counter()
+    pipeline.result("score")
+    latency["score"] = time.perf_counter() - started
+    pipeline.result("recommendations")
+    latency["recommendations"] = time.perf_counter() - started
+
+    latency["session"] = time.perf_counter() - session_started
+    return {"id": user_id, "latency": latency}
+
+
+async def run_user(user_id, semaphore, rng, think_time):
+    async with semaphore:
+        try:
+            return await asyncio.to_thread(simulate_user, user_id, rng, think_time)
+        except Exception as e:
+            return {"id": user_id, "error": str(e)}
+
+
+async def run(args):
+    # Seeded per user so a run is reproducible regardless of completion order
+    rngs = [random.Random(args.seed * 100003 + i) for i in range(args.users)]
+    semaphore = asyncio.Semaphore(args.concurrency)
+    loop = asyncio.get_running_loop()
+    loop.set_default_executor(ThreadPoolExecutor(max_workers=args.concurrency))
+
+    tasks = []
+    for i in range(args.users):
+        tasks.append(asyncio.create_task(run_user(i, semaphore, rngs[i], args.think_time)))
+        if args.ramp_up:
+            await asyncio.sleep(args.ramp_up / args.users)
+    return await asyncio.gather(*tasks)
+
+
+def print_report(records, elapsed):
+    from llm_scheduler import scheduler
+    from openai_helper import single_flight_stats
+
+    succeeded = [record for record in records if "error" not in record]
+    print(f"Completed {len(succeeded)}/{len(records)} sessions in {elapsed:.1f}s", file=sys.stderr)
+    print(f"Throughput: {len(succeeded) / elapsed:.2f} sessions/s", file=sys.stderr)
+    for stage in STAGES:
+        latencies = [record["latency"][stage] for record in succeeded]
+        if latencies:
+            print(
+                f"{stage}: p50={percentile(latencies, 0.5):.3f}s "
+                f"p95={percentile(latencies, 0.95):.3f}s "
+                f"p99={percentile(latencies, 0.99):.3f}s "
+                f"max={max(latencies):.3f}s",
+                file=sys.stderr,
+            )
+    print(f"Scheduler retries: {scheduler.stats()['retries']}", file=sys.stderr)
+    flights = single_flight_stats()
+    print(
+        f"Coalesced LLM requests: {flights['coalesced']} shared, {flights['leaders']} upstream",
+        file=sys.stderr,
+    )
+    errors = {}
+    for record in records:
+        if "error" in record:
+            errors[record["error"]] = errors.get(record["error"], 0) + 1
+    for error, count in sorted(errors.items(), key=lambda item: -item[1]):
+        print(f"{count} x {error}", file=sys.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the assessment flow without network access.")
+    parser.add_argument("--users", type=int, default=100, help="Simulated sessions to run")
+    parser.add_argument("--concurrency", type=int, default=25, help="Sessions in flight at once")
+    parser.add_argument("--ramp-up", type=float, default=0.0, help="Seconds over which sessions start")
+    parser.add_argument("--think-time", type=float, default=0.0, help="Max seconds a user spends answering")
+    parser.add_argument(
+        "--backend", default="synthetic", help="LLM backend spec, e.g. synthetic or replay:path.jsonl"
+    )
+    parser.add_argument("--latency", type=float, default=1.0, help="Median synthetic response time in seconds")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Fraction of synthetic calls that fail")
+    parser.add_argument("--rpm", type=int, help="Override the scheduler's requests-per-minute budget")
+    parser.add_argument("--tpm", type=int, help="Override the scheduler's tokens-per-minute budget")
+    parser.add_argument("--keep-cache", action="store_true", help="Use the real question cache")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    configure(args)
+    started = time.perf_counter()
+    records = asyncio.run(run(args))
+    print_report(records, time.perf_counter() - started)
+
+
+if __name__ == "__main__":
+    main()
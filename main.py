@@ -1,13 +1,34 @@
 import streamlit as st
-from pages import company_info, assessment, results
+from pages import company_info, assessment, results, analytics
+from session_store import checkpoint_session, new_session_token, restore_session
 
 st.set_page_config(page_title="AI Readiness Assessment", layout="wide")
 
+
+@st.cache_resource(show_spinner=False)
+def load_css(path):
+    # main.py is re-executed on every rerun, so the cache has to live in Streamlit rather than
+    # in this module; the <style> tag itself still has to be emitted every time
+    with open(path) as f:
+        return f'<style>{f.read()}</style>'
+
+
 # Load custom CSS
-with open("styles/custom.css") as f:
-    st.markdown(f'<style>{f.read()}</style>', unsafe_allow_html=True)
+st.markdown(load_css("styles/custom.css"), unsafe_allow_html=True)
+
+def get_session_token():
+    # The token lives in the URL so a reload or reconnect resumes the same session
+    token = st.query_params.get("session")
+    if not token:
+        token = new_session_token()
+        st.query_params["session"] = token
+    return token
+
 
 def main():
+    session_token = get_session_token()
+    restore_session(st.session_state, session_token)
+
     st.markdown("<div class='xibonai-title'>XIBONAI</div>", unsafe_allow_html=True)
     st.title("AI Readiness Assessment")
     
@@ -16,6 +37,7 @@ def main():
         "Company Information": company_info,
         "Assessment": assessment,
         "Results": results,
+        "Analytics": analytics,
     }
     
     # Add the navigation to the main content area
@@ -31,5 +53,7 @@ def main():
     
     st.markdown("</div>", unsafe_allow_html=True)
 
+    checkpoint_session(st.session_state, session_token)
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
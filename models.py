@@ -0,0 +1,141 @@
+"""
+Typed records for the data that moves between the LLM helpers, the pages and
+the stores.
+
+Responses are validated once, when they come back from the model
+(``from_dict``), and everything downstream can rely on the field types without
+re-checking them. Each record has a compact JSON form for caches and
+persisted sessions: questions are stored as positional rows instead of
+key/value objects.
+"""
+from dataclasses import asdict, dataclass, field, fields
+from structured_output import normalize_question, questions_payload, validate_readiness_result
+
+
+@dataclass(slots=True, frozen=True)
+class CompanyInfo:
+    industry: str
+    size: str
+    country: str
+
+    @classmethod
+    def from_dict(cls, data):
+        if isinstance(data, cls):
+            return data
+        if not isinstance(data, dict) or not data.get("industry") or not data.get("size"):
+            raise ValueError("Company information needs an industry and a size")
+        return cls(*(str(data.get(name) or "").strip() for name in ("industry", "size", "country")))
+
+    def to_dict(self):
+        return asdict(self)
+
+
+@dataclass(slots=True, frozen=True)
+class Question:
+    question_text: str
+    explanation: str = ""
+    type: str = "open-ended"
+    impact_level: str = ""
+    options: tuple = ()
+
+    @classmethod
+    def from_dict(cls, data):
+        """Validate a question from the model; returns None if it cannot be used."""
+        normalized = normalize_question(data)
+        if normalized is None:
+            return None
+        normalized["options"] = tuple(normalized["options"])
+        return cls(**normalized)
+
+    def to_dict(self):
+        return {
+            "question_text": self.question_text,
+            "explanation": self.explanation,
+            "type": self.type,
+            "impact_level": self.impact_level,
+            "options": list(self.options),
+        }
+
+    def to_row(self):
+        return [self.question_text, self.explanation, self.type, self.impact_level, list(self.options)]
+
+    @classmethod
+    def from_row(cls, row):
+        # Rows were validated before they were stored; older stores hold dicts
+        if isinstance(row, dict):
+            return cls.from_dict(row)
+        text, explanation, question_type, impact_level, options = row
+        return cls(text, explanation, question_type, impact_level, tuple(options))
+
+
+def questions_from_response(data):
+    questions = [Question.from_dict(q) for q in questions_payload(data)]
+    return [question for question in questions if question is not None]
+
+
+def encode_questions(questions):
+    return [question.to_row() for question in questions]
+
+
+def decode_questions(rows):
+    questions = [Question.from_row(row) for row in rows or []]
+    return [question for question in questions if question is not None]
+
+
+@dataclass(slots=True, frozen=True)
+class Answer:
+    question_index: int
+    value: object
+
+    @classmethod
+    def from_state(cls, answers):
+        """Answers in question order from a list or a ``{"q0": ..., "q1": ...}`` dict."""
+        if isinstance(answers, dict):
+            indexed = sorted((int(str(key).lstrip("q")), value) for key, value in answers.items())
+        else:
+            indexed = enumerate(answers)
+        return [cls(index, value) for index, value in indexed]
+
+
+@dataclass(slots=True)
+class ReadinessResult:
+    overall_score: object = "N/A"
+    explanation: str = "No explanation available."
+    area_scores: dict = field(default_factory=dict)
+    strengths: list = field(default_factory=list)
+    improvement_areas: list = field(default_factory=list)
+    projected_score: object = "N/A"
+    risks: list = field(default_factory=list)
+    opportunities: list = field(default_factory=list)
+    ai_use_cases: dict = field(default_factory=dict)
+    policy_strategy_insights: object = "No policy and strategy insights available."
+    recommendations_for_future: list = field(default_factory=list)
+    # Keys the model returned beyond the ones asked for, kept for exports
+    extra: dict = field(default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, data):
+        if isinstance(data, cls):
+            return data
+        data = validate_readiness_result(data)
+        values = {}
+        extra = dict(data)
+        for spec in fields(cls):
+            value = extra.pop(spec.name, None)
+            if spec.name == "extra" or value is None:
+                continue
+            if spec.type is list and not isinstance(value, list):
+                value = [value]
+            elif spec.type is dict and not isinstance(value, dict):
+                extra[spec.name] = value  # Unusable shape; kept verbatim for exports
+                continue
+            values[spec.name] = value
+        return cls(**values, extra=extra)
+
+    def has_score(self):
+        return isinstance(self.overall_score, (int, float)) and not isinstance(self.overall_score, bool)
+
+    def to_dict(self):
+        data = {spec.name: getattr(self, spec.name) for spec in fields(self) if spec.name != "extra"}
+        data.update(self.extra)
+        return data
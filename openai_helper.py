@@ -1,202 +1,386 @@
 import os
-from openai import OpenAI
-import json
+import threading
+import time
 from dotenv import load_dotenv
+from cache import ResponseCache, make_cache_key
+from json_stream import JSONArrayStreamParser, JSONObjectStreamParser
+from models import (
+    Question,
+    ReadinessResult,
+    decode_questions,
+    encode_questions,
+    questions_from_response,
+)
+from llm_backends import backend_from_env
+from structured_output import (
+    JSON_OBJECT_RESPONSE_FORMAT,
+    QUESTIONS_RESPONSE_FORMAT,
+    parse_json_response,
+    validate_recommendations,
+)
+from prompts import (
+    NUM_QUESTIONS,
+    NUM_RECOMMENDATIONS,
+    QUESTIONS_PROMPT,
+    RECOMMENDATIONS_PROMPT,
+    SCORE_OUTPUT_TOKENS,
+    SCORE_PROMPT,
+    build_messages,
+    questions_max_tokens,
+    recommendations_max_tokens,
+    trim_answers,
+)
+from llm_scheduler import INTERACTIVE, Priority, create_http_client, estimate_tokens, scheduler
+from single_flight import SingleFlight, flight_key
+from telemetry import (
+    instrumented,
+    log_response,
+    logger,
+    note_cache_hit,
+    note_coalesced,
+    note_stale_cache,
+    note_usage,
+)
 load_dotenv()
 
 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-openai_client = OpenAI(api_key=OPENAI_API_KEY)
-
-
-def generate_questions(industry, size, country):
-    prompt = f"""Generate 15 questions for an AI readiness assessment for a {size} company in the {industry} industry located in {country}. 
-    The questions should cover the following areas:
-    1. AI Strategy and Leadership
-    2. Data Infrastructure and Management
-    3. AI/ML Capabilities and Talent
-    4. Ethical AI and Governance
-    5. AI Integration and Innovation
-
-    For each question, provide:
-    1. A clear, concise question text that is specific to the company's size, industry, and location
-    2. A brief explanation of why this question is important in the context of AI readiness
-    3. The type of question (scale, multiple-choice, or open-ended)
-    4. The impact level of this question (high, medium, or low) on overall AI readiness
-    5. For multiple-choice questions, provide 4-5 options that reflect varying levels of AI maturity
-
-    Guidelines for creating questions:
-    - Tailor questions to the specific industry, considering unique challenges and opportunities
-    - Adjust the complexity based on the company size (e.g., more sophisticated for larger companies)
-    - Consider regional factors that might influence AI adoption in the given country
-    - Include a mix of technical and non-technical questions to assess overall organizational readiness
-    - Ensure questions are actionable and provide insights for improvement
-
-    Format the output as a JSON string with a list of question objects, each containing the following fields:
-    - question_text
-    - explanation
-    - type
-    - impact_level
-    - options (for multiple-choice questions only)
-
-    Example structure:
-    [
-      {{
-        "question_text": "...",
-        "explanation": "...",
-        "type": "scale|multiple-choice|open-ended",
-        "impact_level": "high|medium|low",
-        "options": ["...", "...", "...", "..."] // Only for multiple-choice
-      }},
-      // ... more questions ...
-    ]"""
+openai_client = None
+_client_lock = threading.Lock()
+llm_backend = None
+
+MODEL = "gpt-4o-mini"
+# Bump whenever the questions prompt changes so stale cached sets are not served
+QUESTIONS_PROMPT_VERSION = "3"
+
+SCORE_MAX_TOKENS = SCORE_OUTPUT_TOKENS
+# Identical requests already in flight share one upstream call instead of each paying for it
+SINGLE_FLIGHT = os.getenv("AI_READINESS_SINGLE_FLIGHT", "1") != "0"
+# Total budget for one request, retries included; defaults to how long the results page waits,
+# so a hung completion cannot keep its connection slot long after the page has given up
+REQUEST_TIMEOUT_SECONDS = float(
+    os.getenv("OPENAI_REQUEST_TIMEOUT", os.getenv("AI_READINESS_RESULTS_TIMEOUT", "120"))
+)
+
+question_cache = ResponseCache()
+in_flight = SingleFlight()
+
+
+def questions_cache_key(industry, size, country):
+    return make_cache_key(
+        "questions", industry, size, country, QUESTIONS_PROMPT_VERSION, MODEL
+    )
+
+
+def get_openai_client():
+    # The openai SDK is slow to import, so it is only loaded on the first call
+    global openai_client
+    if openai_client is None:
+        with _client_lock:
+            if openai_client is None:
+                from openai import OpenAI
+
+                # Retries are handled by the scheduler so they count against the rate-limit budget
+                openai_client = OpenAI(
+                    api_key=OPENAI_API_KEY,
+                    http_client=create_http_client(),
+                    max_retries=0,
+                    timeout=REQUEST_TIMEOUT_SECONDS,
+                )
+    return openai_client
+
+
+def get_llm_backend():
+    global llm_backend
+    if llm_backend is None:
+        with _client_lock:
+            if llm_backend is None:
+                llm_backend = backend_from_env(get_openai_client)
+    return llm_backend
+
+
+def set_llm_backend(backend):
+    """Route every helper through ``backend``, e.g. a SyntheticBackend in load tests."""
+    global llm_backend
+    llm_backend = backend
+
+
+def create_completion(prompt, max_tokens, priority=INTERACTIVE, **kwargs):
+    messages = build_messages(prompt)
+    stream = kwargs.get("stream")
+    if stream:
+        # Streamed responses only report token usage when asked to
+        kwargs.setdefault("stream_options", {"include_usage": True})
+
+    level = Priority(priority)
+    deadline = time.monotonic() + REQUEST_TIMEOUT_SECONDS
+
+    def request():
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutError(f"OpenAI request ran past its {REQUEST_TIMEOUT_SECONDS:g}s budget")
+        return get_llm_backend().complete(MODEL, messages, max_tokens, timeout=remaining, **kwargs)
+
+    def call():
+        return scheduler.call(
+            request,
+            tokens=estimate_tokens(messages, max_tokens),
+            priority=level,
+            stream=bool(stream),
+        )
+
+    if not SINGLE_FLIGHT:
+        completion, shared = call(), False
+    else:
+        # Priority only decides queueing, so it is not part of the request identity; instead an
+        # interactive caller joining a background leader moves the leader up the queue
+        key = flight_key(MODEL, messages, max_tokens, kwargs)
+        completion, shared = (in_flight.do_stream if stream else in_flight.do)(
+            key, call, tag=level, on_join=lambda leader: scheduler.raise_priority(leader, priority)
+        )
+
+    if shared:
+        # The leader already accounted for the tokens
+        note_coalesced()
+        if stream:
+            completion = (chunk for chunk in completion if chunk.choices)
+    elif not stream:
+        note_usage(completion.usage, completion.model)
+    return completion
+
+
+def single_flight_stats():
+    return in_flight.stats()
+
+
+class IncompleteQuestionSet(Exception):
+    """The completion held fewer questions than requested, e.g. because it hit max_tokens."""
+
+    def __init__(self, questions, finish_reason=None):
+        super().__init__(
+            f"Error generating questions: got {len(questions)} of {NUM_QUESTIONS} questions "
+            f"(finish_reason={finish_reason})"
+        )
+        self.questions = questions
+
+
+@instrumented
+def generate_questions(industry, size, country, priority=INTERACTIVE):
+    key = questions_cache_key(industry, size, country)
+    cached = question_cache.get(key)
+    if cached is not None:
+        note_cache_hit()
+        return decode_questions(cached)
 
     try:
-        completion = openai_client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=2000,
+        questions = _generate_questions_uncached(industry, size, country, priority)
+    except Exception as e:
+        # Serve an expired set rather than failing the session outright
+        stale = question_cache.get(key, allow_stale=True)
+        if stale is not None:
+            print("Falling back to a stale cached question set")
+            note_stale_cache()
+            return decode_questions(stale)
+        if isinstance(e, IncompleteQuestionSet):
+            # A short assessment beats none, but it is never cached
+            return e.questions
+        raise
+    question_cache.set(key, encode_questions(questions))
+    return questions
+
+
+@instrumented
+def generate_questions_stream(industry, size, country, priority=INTERACTIVE):
+    """
+    Yield validated Questions one at a time as the completion streams in.
+    Cached question sets are replayed immediately.
+    """
+    key = questions_cache_key(industry, size, country)
+    cached = question_cache.get(key)
+    if cached is not None:
+        note_cache_hit()
+        yield from decode_questions(cached)
+        return
+
+    prompt = build_questions_prompt(industry, size, country)
+    questions = []
+    parser = JSONArrayStreamParser()
+    try:
+        stream = create_completion(
+            prompt,
+            questions_max_tokens(),
+            priority,
+            stream=True,
+            response_format=QUESTIONS_RESPONSE_FORMAT,
+        )
+        for text in _iter_stream_content(stream):
+            for question_data in parser.feed(text):
+                question = Question.from_dict(question_data)
+                if question is None:
+                    continue
+                questions.append(question)
+                yield question
+            if parser.finished:
+                break
+    except Exception as e:
+        print(f"Error in generate_questions_stream: {str(e)}")
+        stale = question_cache.get(key, allow_stale=True) if not questions else None
+        if stale is not None:
+            print("Falling back to a stale cached question set")
+            note_stale_cache()
+            yield from decode_questions(stale)
+            return
+        raise Exception(f"Error generating questions: {str(e)}")
+
+    if not questions:
+        raise Exception("Error generating questions: OpenAI returned no questions.")
+    if not parser.finished or len(questions) != NUM_QUESTIONS:
+        # The questions shown so far stay, but a cut-off stream must not become the cached set
+        print(f"Not caching an incomplete question set ({len(questions)} of {NUM_QUESTIONS})")
+        return
+    question_cache.set(key, encode_questions(questions))
+
+
+def _iter_stream_content(stream):
+    for chunk in stream:
+        if getattr(chunk, "usage", None):
+            note_usage(chunk.usage, chunk.model)
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield chunk.choices[0].delta.content
+
+
+def build_questions_prompt(industry, size, country, num_questions=NUM_QUESTIONS):
+    return QUESTIONS_PROMPT.render(
+        num_questions=num_questions, industry=industry, size=size, country=country
+    )
+
+
+def _generate_questions_uncached(industry, size, country, priority=INTERACTIVE):
+    prompt = build_questions_prompt(industry, size, country)
+
+    try:
+        completion = create_completion(
+            prompt, questions_max_tokens(), priority, response_format=QUESTIONS_RESPONSE_FORMAT
         )
         content = completion.choices[0].message.content
         if not content:
             raise ValueError("OpenAI returned an empty response.")
 
-        # Print the raw content for debugging
-        print("Raw OpenAI response:")
-        print(content)
-
-        # Remove any markdown formatting if present
-        content = content.replace("```json", "").replace("```", "").strip()
-
-        try:
-            questions_data = json.loads(content)
-            # Check if the response is a dictionary with a 'questions' key
-            if isinstance(questions_data, dict) and 'questions' in questions_data:
-                questions = questions_data['questions']
-            # Check if the response is already a list of questions
-            elif isinstance(questions_data, list):
-                questions = questions_data
-            else:
-                raise ValueError("Unexpected JSON structure")
-
-            # Normalize the question structure and validate question types
-            normalized_questions = []
-            for q in questions:
-                question_text = q.get("question", q.get("question_text", ""))
-                if not question_text:
-                    continue  # Skip questions without text
-
-                question_type = q.get("type", "").lower()
-                if question_type not in ["scale", "multiple-choice", "open-ended"]:
-                    question_type = "open-ended"  # Default to open-ended if type is invalid
-
-                normalized_q = {
-                    "question_text": question_text,
-                    "explanation": q.get("explanation", q.get("importance", "")),
-                    "type": question_type,
-                    "impact_level": q.get("impact_level", ""),
-                    "options": q.get("options", []) if question_type == "multiple-choice" else []
-                }
-                normalized_questions.append(normalized_q)
-
-            return normalized_questions
-        except json.JSONDecodeError as json_error:
-            print(f"JSON decoding error: {str(json_error)}")
-            raise ValueError(f"Invalid JSON response from OpenAI: {str(json_error)}")
+        log_response("generate_questions", content)
+
+        questions = questions_from_response(parse_json_response(content))
     except Exception as e:
         print(f"Error in generate_questions: {str(e)}")
         raise Exception(f"Error generating questions: {str(e)}")
 
-def generate_recommendations(answers, company_info):
-    prompt = f"""Based on the following AI readiness assessment answers for a {company_info['size']} company in the {company_info['industry']} industry located in {company_info['country']}, provide 5 detailed recommendations to improve their AI readiness:
+    # parse_json_response repairs truncated output, which leaves a plausible but short set
+    if completion.choices[0].finish_reason == "length" or len(questions) != NUM_QUESTIONS:
+        raise IncompleteQuestionSet(questions, completion.choices[0].finish_reason)
+    return questions
 
-    Assessment Answers:
-    {answers}
+def build_recommendations_prompt(answers, company_info):
+    return RECOMMENDATIONS_PROMPT.render(
+        num_recommendations=NUM_RECOMMENDATIONS,
+        answers=trim_answers(answers),
+        industry=company_info.industry,
+        size=company_info.size,
+        country=company_info.country,
+    )
 
-    For each recommendation, include:
-    1. Action: A specific action the company should take
-    2. Rationale: Why this action is important
-    3. Benefits: The potential benefits of implementing this recommendation
-    4. Challenges: Potential challenges or obstacles in implementing this recommendation
-    5. Example: A brief example or case study of a company that successfully implemented a similar action
-    6. Timeline: An estimated timeline for implementation (e.g., short-term, medium-term, long-term)
-    7. Key Performance Indicators: 2-3 KPIs to measure the success of this recommendation
 
-    Format the output as a JSON string with a list of recommendation objects."""
+@instrumented
+def generate_recommendations(answers, company_info, priority=INTERACTIVE):
+    prompt = build_recommendations_prompt(answers, company_info)
 
     try:
-        completion = openai_client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=2500,
+        completion = create_completion(
+            prompt,
+            recommendations_max_tokens(),
+            priority,
+            response_format=JSON_OBJECT_RESPONSE_FORMAT,
         )
         content = completion.choices[0].message.content
         if not content:
             raise ValueError("OpenAI returned an empty response.")
 
-        # Print the raw content for debugging
-        print("Raw OpenAI response:")
-        print(content)
+        log_response("generate_recommendations", content)
 
-        # Remove any markdown formatting if present
-        content = content.replace("```json", "").replace("```", "").strip()
-
-        try:
-            recommendations = json.loads(content)
-            return recommendations
-        except json.JSONDecodeError as json_error:
-            print(f"JSON decoding error: {str(json_error)}")
-            raise ValueError(f"Invalid JSON response from OpenAI: {str(json_error)}")
+        return validate_recommendations(parse_json_response(content))
     except Exception as e:
         print(f"Error in generate_recommendations: {str(e)}")
         raise Exception(f"Error generating recommendations: {str(e)}")
 
 
-def generate_ai_readiness_score(answers, company_info):
-    prompt = f"""Based on the following AI readiness assessment answers for a {company_info['size']} company in the {company_info['industry']} industry located in {company_info['country']}, provide:
-    1. An overall AI readiness score on a scale of 0-100
-    2. A detailed explanation of the score, including key factors that influenced it
-    3. Scores for each of the 5 focus areas (AI Strategy and Leadership, Data Infrastructure and Management, AI/ML Capabilities and Talent, Ethical AI and Governance, AI Integration and Innovation) on a scale of 0-100
-    4. Key strengths and areas for improvement, with actionable insights for each
-    5. A projected AI readiness score in 12 months if the company implements the recommended improvements
-    6. Potential risks and opportunities based on the current AI readiness level
-    7. Relevant specific examples of AI use cases based on the organization's current AI readiness scores, and compare them with ideal scenarios
-    8. Insights on developing stronger AI policies, strategies, and frameworks based on the assessment results
-    9. Recommendations for future AI readiness assessment, including potential areas for improvement and actionable steps
+def format_answers(answers):
+    return "\n".join(f"Q{answer.question_index + 1}: {answer.value}" for answer in answers)
+
 
-    Assessment Answers:
-    {answers}
+def build_score_prompt(answers, company_info):
+    return SCORE_PROMPT.render(
+        answers=trim_answers(answers),
+        industry=company_info.industry,
+        size=company_info.size,
+        country=company_info.country,
+    )
 
-    Consider industry-specific factors, company size, and country-specific regulations when analyzing the AI readiness.
-    Provide deep, critical analysis of the user's scores and rich insights for improving AI readiness.
-    Include specific recommendations for developing stronger AI policies, strategies, and frameworks.
-    Provide detailed comparisons between current AI use cases and ideal scenarios based on the readiness scores.
 
-    Format the output as a JSON string with keys for 'overall_score', 'explanation', 'area_scores', 'strengths', 'improvement_areas', 'projected_score', 'risks', 'opportunities', 'ai_use_cases', 'policy_strategy_insights', and 'recommendations for future'."""
+@instrumented
+def generate_ai_readiness_score(answers, company_info, priority=INTERACTIVE, on_section=None):
+    """
+    Score the answers. With ``on_section`` the completion is streamed and
+    ``on_section(key, value)`` is called for each top-level member of the
+    response as soon as it is complete, so callers can render it section by
+    section. The returned result is parsed from the full response either way.
+    """
+    prompt = build_score_prompt(answers, company_info)
 
     try:
-        completion = openai_client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=3500,
-        )
-        content = completion.choices[0].message.content
+        if on_section is None:
+            completion = create_completion(
+                prompt, SCORE_MAX_TOKENS, priority, response_format=JSON_OBJECT_RESPONSE_FORMAT
+            )
+            content = completion.choices[0].message.content
+        else:
+            stream = create_completion(
+                prompt,
+                SCORE_MAX_TOKENS,
+                priority,
+                stream=True,
+                response_format=JSON_OBJECT_RESPONSE_FORMAT,
+            )
+            content = _stream_sections(stream, on_section)
         if not content:
             raise ValueError("OpenAI returned an empty response.")
 
-        # Print the raw content for debugging
-        print("Raw OpenAI response:")
-        print(content)
+        log_response("generate_ai_readiness_score", content)
 
-        # Remove any markdown formatting if present
-        content = content.replace("```json", "").replace("```", "").strip()
-
-        try:
-            ai_readiness_result = json.loads(content)
-            return ai_readiness_result
-        except json.JSONDecodeError as json_error:
-            print(f"JSON decoding error: {str(json_error)}")
-            raise ValueError(f"Invalid JSON response from OpenAI: {str(json_error)}")
+        return ReadinessResult.from_dict(parse_json_response(content))
     except Exception as e:
         print(f"Error in generate_ai_readiness_score: {str(e)}")
         raise Exception(f"Error generating AI readiness score: {str(e)}")
+
+
+def _stream_sections(stream, on_section):
+    parser = JSONObjectStreamParser()
+    publishing = True
+    parts = []
+    try:
+        for text in _iter_stream_content(stream):
+            parts.append(text)
+            if not publishing or parser.finished:
+                continue
+            try:
+                members = parser.feed(text)
+            except ValueError as e:
+                # Stop publishing; the full response still goes through parse_json_response
+                logger.warning("Stopped streaming score sections: %s", e)
+                publishing = False
+                continue
+            for key, value in members:
+                on_section(key, value)
+    finally:
+        # on_section may raise to abandon the response, e.g. when the results pipeline is cancelled
+        close = getattr(stream, "close", None)
+        if close is not None:
+            close()
+    return "".join(parts)
@@ -0,0 +1,95 @@
+import streamlit as st
+from results_store import available, results_store
+from visualization import create_bar_chart, create_distribution_chart, create_trend_chart
+
+DIMENSION_LABELS = {"industry": "Industry", "size": "Company Size", "country": "Country"}
+BIN_WIDTH = 5
+
+
+def select_filters(options):
+    filters = {}
+    columns = st.columns(3)
+    for column, (dimension, label) in zip(columns, DIMENSION_LABELS.items()):
+        with column:
+            selected = st.multiselect(label, options[dimension], key=f"analytics_{dimension}")
+        if selected:
+            filters[dimension] = selected
+
+    months = options["month"]
+    if len(months) > 1:
+        start, end = st.select_slider(
+            "Months", options=months, value=(months[0], months[-1]), key="analytics_months"
+        )
+        if (start, end) != (months[0], months[-1]):
+            filters["month"] = (start, end)
+    return filters
+
+
+def app():
+    st.markdown("<h2 style='color: #4b0082;'>Cohort Analytics</h2>", unsafe_allow_html=True)
+    if not available():
+        st.info("Cohort analytics needs pyarrow. Install it to archive and explore completed assessments.")
+        return
+    # Every tab runs on every rerun, so only query the archive once asked to
+    if not st.toggle("Show cohort analytics", key="analytics_enabled"):
+        return
+
+    options = results_store.filter_options()
+    if not options["month"]:
+        st.info("No completed assessments have been archived yet.")
+        return
+
+    filters = select_filters(options)
+    summary = results_store.summary(filters)
+    if not summary["count"]:
+        st.warning("No assessments match these filters.")
+        return
+
+    metrics = st.columns(4)
+    metrics[0].metric("Assessments", f"{summary['count']:,}")
+    metrics[1].metric("Mean Score", f"{summary['mean']:.1f}")
+    metrics[2].metric("Median Score", summary["median"])
+    metrics[3].metric("10th-90th Percentile", f"{summary['p10']}-{summary['p90']}")
+
+    dimension = st.selectbox(
+        "Group by",
+        list(DIMENSION_LABELS),
+        format_func=DIMENSION_LABELS.get,
+        key="analytics_group_by",
+    )
+    label = DIMENSION_LABELS[dimension]
+
+    by_group = results_store.score_by(dimension, filters)
+    st.plotly_chart(
+        create_bar_chart(
+            dict(zip(by_group[dimension], by_group["mean"].round(1))),
+            f"Mean Score by {label}",
+            max_score=100,
+        )
+    )
+    st.dataframe(by_group, hide_index=True)
+
+    distribution = results_store.score_distribution(filters, BIN_WIDTH)
+    st.plotly_chart(
+        create_distribution_chart(dict(zip(distribution["bin"], distribution["count"])), BIN_WIDTH)
+    )
+
+    trend = results_store.trend(filters, dimension)
+    series = {
+        str(group): dict(zip(points["month"], points["mean"].round(1)))
+        for group, points in trend.groupby(dimension)
+    }
+    st.plotly_chart(create_trend_chart(series, f"Mean Score per Month by {label}"))
+
+    areas = results_store.area_scores(filters)
+    if len(areas):
+        st.plotly_chart(
+            create_bar_chart(
+                dict(zip(areas["area"], areas["mean"].round(1))), "Mean Score by Focus Area", max_score=100
+            )
+        )
+
+    questions = results_store.question_stats(filters)
+    if len(questions):
+        st.markdown("<h3 style='color: #1E90FF;'>Most Asked Questions</h3>", unsafe_allow_html=True)
+        st.dataframe(questions, hide_index=True)
@@ -1,5 +1,11 @@
+import json
+import time
 import streamlit as st
-from openai_helper import generate_questions
+from models import encode_questions
+from openai_helper import generate_questions_stream
+from prompts import NUM_QUESTIONS
+from question_bank import question_bank
+from telemetry import log_response
 
 def app():
     st.header("AI Readiness Assessment")
@@ -8,65 +14,136 @@ def app():
         st.warning("Please fill out the Company Information first.")
         return
 
+    progress_bar = None
+    rendered = 0
     if "questions" not in st.session_state:
-        try:
-            with st.spinner("Generating questions..."):
-                st.session_state.questions = generate_questions(
-                    st.session_state.company_info["industry"],
-                    st.session_state.company_info["size"],
-                    st.session_state.company_info["country"],
-                )
-            # Debugging: Print the structure of questions
-            print("Generated questions:", st.session_state.questions)
-        except Exception as e:
-            st.error(f"An error occurred while generating questions: {str(e)}")
-            st.write("Please try again or contact support if the issue persists.")
-            st.session_state.questions = []
+        init_answer_state()
+        company_info = st.session_state.company_info
+        question_bank.record_request(company_info.country)
+        # Standard profiles are served from the pre-generated bank without an LLM call
+        banked = question_bank.get(company_info.industry, company_info.size, company_info.country)
+        if banked:
+            st.session_state.questions = banked
+        else:
+            progress_bar, rendered = stream_questions(company_info)
 
     if not st.session_state.questions:
         st.warning("No questions were generated. Please try again or contact support.")
         return
 
+    init_answer_state()
+
+    if progress_bar is None:
+        progress_bar = st.progress(0)
+
+    for i in range(rendered, len(st.session_state.questions)):
+        render_question(i, st.session_state.questions[i])
+
+    # Answers are only recorded when a widget changes, so this is a running count
+    progress_bar.progress(
+        min(st.session_state.answered_count / len(st.session_state.questions), 1.0)
+    )
+
+    if st.button("Submit Assessment"):
+        if st.session_state.answered_count >= len(st.session_state.questions):
+            # Widget defaults count as answers, so only an explicit submit unlocks scoring
+            st.session_state.assessment_submitted = True
+            st.success("Assessment completed. Please proceed to the Results page.")
+        else:
+            st.warning("Please answer all questions before submitting.")
+
+
+def stream_questions(company_info):
+    """Generate questions live, rendering each one as soon as it arrives."""
+    status = st.empty()
+    status.info("Generating questions...")
+    progress_bar = st.progress(0)
+    questions = []
+    rendered = 0
+    try:
+        for question in generate_questions_stream(
+            company_info.industry, company_info.size, company_info.country
+        ):
+            questions.append(question)
+            render_question(len(questions) - 1, question)
+            progress_bar.progress(min(len(questions) / NUM_QUESTIONS, 1.0))
+        st.session_state.questions = questions
+        rendered = len(questions)
+        log_response("assessment.questions", json.dumps(encode_questions(questions)))
+    except Exception as e:
+        st.error(f"An error occurred while generating questions: {str(e)}")
+        st.write("Please try again or contact support if the issue persists.")
+        st.session_state.questions = []
+        for key in ["answers", "answer_log", "answered_count", "assessment_submitted"]:
+            st.session_state.pop(key, None)
+    status.empty()
+    return progress_bar, rendered
+
+
+def is_answered(answer):
+    return answer is not None and answer != ""
+
+
+def init_answer_state():
     if "answers" not in st.session_state:
         st.session_state.answers = {}
+    if "answer_log" not in st.session_state:
+        st.session_state.answer_log = []
+    if "answered_count" not in st.session_state:
+        # Only needed once, e.g. after answers were restored from a saved session
+        st.session_state.answered_count = sum(
+            is_answered(answer) for answer in st.session_state.answers.values()
+        )
 
-    progress_bar = st.progress(0)
 
-    for i, question_data in enumerate(st.session_state.questions):
-        if not isinstance(question_data, dict) or "question_text" not in question_data:
-            st.error(f"Invalid question data for question {i+1}")
-            continue
-
-        st.subheader(f"Question {i+1}")
-        st.write(question_data["question_text"])
-        st.info(question_data.get("explanation", "No explanation available"))
-        st.write(f"**Impact:** {question_data.get('impact_level', 'Not specified')}")
-
-        question_type = question_data.get("type", "").lower()
-        if question_type == "scale":
-            answer = st.slider(
-                "Rate your agreement (1: Strongly Disagree, 5: Strongly Agree)",
-                1,
-                5,
-                key=f"q{i}",
-            )
-        elif question_type == "multiple-choice":
-            options = question_data.get("options", [])
-            if options:
-                answer = st.selectbox("Select one option:", options, key=f"q{i}")
-            else:
-                st.error(f"Error: No options provided for question {i+1}")
-                answer = ""
-        else:  # open-ended
-            answer = st.text_area("Your answer:", key=f"q{i}")
+def set_answer(key, answer):
+    answers = st.session_state.answers
+    st.session_state.answered_count += is_answered(answer) - is_answered(answers.get(key))
+    answers[key] = answer
 
-        st.session_state.answers[f"q{i}"] = answer
 
-        progress = (i + 1) / len(st.session_state.questions)
-        progress_bar.progress(progress)
+def record_answer(key):
+    """on_change callback: capture only the widget that changed."""
+    answer = st.session_state[key]
+    set_answer(key, answer)
+    st.session_state.answer_log.append(
+        {"question": key, "answer": answer, "timestamp": time.time()}
+    )
 
-    if st.button("Submit Assessment"):
-        if len(st.session_state.answers) == len(st.session_state.questions):
-            st.success("Assessment completed. Please proceed to the Results page.")
+
+def render_question(i, question):
+    # Questions were validated when they came back from the model
+    st.subheader(f"Question {i+1}")
+    st.write(question.question_text)
+    st.info(question.explanation or "No explanation available")
+    st.write(f"**Impact:** {question.impact_level or 'Not specified'}")
+
+    if question.type == "scale":
+        answer = st.slider(
+            "Rate your agreement (1: Strongly Disagree, 5: Strongly Agree)",
+            1,
+            5,
+            key=f"q{i}",
+            on_change=record_answer,
+            args=(f"q{i}",),
+        )
+    elif question.type == "multiple-choice":
+        if question.options:
+            answer = st.selectbox(
+                "Select one option:",
+                question.options,
+                key=f"q{i}",
+                on_change=record_answer,
+                args=(f"q{i}",),
+            )
         else:
-            st.warning("Please answer all questions before submitting.")
\ No newline at end of file
+            st.error(f"Error: No options provided for question {i+1}")
+            answer = ""
+    else:  # open-ended
+        answer = st.text_area(
+            "Your answer:", key=f"q{i}", on_change=record_answer, args=(f"q{i}",)
+        )
+
+    if f"q{i}" not in st.session_state.answers:
+        # Widgets start on a default value without firing on_change
+        set_answer(f"q{i}", answer)
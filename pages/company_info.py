@@ -1,32 +1,16 @@
 import streamlit as st
+from models import CompanyInfo
+from prompts import COMPANY_SIZES, INDUSTRIES
 
 
 def app():
     st.markdown("<h2 style='color: #4b0082;'>Company Information</h2>", unsafe_allow_html=True)
-    # Initialize session state variables if they don't exist
-    if "company_info" not in st.session_state:
-        st.session_state.company_info = {}
-
     # Input fields for company information
-    industry = st.selectbox(
-        "Industry",
-        ["Technology", "Healthcare", "Finance", "Retail", "Manufacturing", "Other"],
-    )
-    size = st.selectbox(
-        "Company Size",
-        [
-            "Small (1-50 employees)",
-            "Medium (51-500 employees)",
-            "Large (501+ employees)",
-        ],
-    )
+    industry = st.selectbox("Industry", INDUSTRIES)
+    size = st.selectbox("Company Size", COMPANY_SIZES)
     country = st.text_input("Country")
 
     if st.button("Next"):
         # Store company information in session state
-        st.session_state.company_info = {
-            "industry": industry,
-            "size": size,
-            "country": country,
-        }
+        st.session_state.company_info = CompanyInfo(industry, size, country.strip())
         st.success("Company information saved. Please proceed to the Assessment page.")
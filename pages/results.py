@@ -1,96 +1,138 @@
 import streamlit as st
-import plotly.graph_objects as go
-from openai_helper import generate_ai_readiness_score
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from functools import partial
+from benchmark_store import benchmark_store
+from models import Answer, ReadinessResult
+from openai_helper import format_answers
+from pipeline import RESULTS_TASKS, ResultsPipeline
+from reports import pdf_available, render_report_html, render_report_pdf
+from results_store import available as results_store_available, results_store
+from score_cache import SCORE_CACHE_ENABLED, score_with_cache
+from structured_output import normalize_result_key
+from telemetry import log_response
+from visualization import create_benchmark_chart, create_radar_chart
 import json
 
 
-def create_radar_chart(area_scores):
-    categories = list(area_scores.keys())
-    values = list(area_scores.values())
-
-    fig = go.Figure(data=go.Scatterpolar(r=values, theta=categories, fill="toself"))
-
-    fig.update_layout(
-        polar=dict(radialaxis=dict(visible=True, range=[0, 100])), showlegend=False
-    )
-
-    return fig
-
-
-def create_benchmark_chart(company_score, industry_avg, top_10, bottom_10, median):
-    fig = go.Figure()
-
-    fig.add_trace(
-        go.Bar(
-            x=["Your Company", "Industry Average", "Top 10%", "Median", "Bottom 10%"],
-            y=[company_score, industry_avg, top_10, median, bottom_10],
-            marker_color=["#1E90FF", "#808080", "#90EE90", "#FFA500", "#FF6347"],
-        )
-    )
-
-    fig.update_layout(
-        title="AI Readiness Score Benchmark",
-        yaxis_title="AI Readiness Score",
-        yaxis=dict(range=[0, 100]),
-    )
-
-    return fig
-
-
-def display_dict_or_list(data, indent_level=0):
+def dict_or_list_markdown(data, indent_level=0):
     """
-    A helper function to recursively display nested dictionaries or lists.
+    Render nested dictionaries or lists as one markdown string, a paragraph per
+    key or item.
     """
     indent = "&nbsp;" * 4 * indent_level  # Adjusts for indentation in markdown
+    lines = []
 
     if isinstance(data, dict):
         for key, value in data.items():
-            st.markdown(f"{indent}**{key}:**", unsafe_allow_html=True)
+            lines.append(f"{indent}**{key}:**")
             if isinstance(value, (dict, list)):
-                display_dict_or_list(value, indent_level + 1)
+                lines.append(dict_or_list_markdown(value, indent_level + 1))
             else:
-                st.markdown(f"{indent}&nbsp;&nbsp;{value}", unsafe_allow_html=True)
+                lines.append(f"{indent}&nbsp;&nbsp;{value}")
     elif isinstance(data, list):
         for item in data:
             if isinstance(item, (dict, list)):
-                display_dict_or_list(item, indent_level + 1)
+                lines.append(dict_or_list_markdown(item, indent_level + 1))
             else:
-                st.markdown(f"{indent}- {item}", unsafe_allow_html=True)
+                lines.append(f"{indent}- {item}")
+    return "\n\n".join(line for line in lines if line)
+
+
+def display_dict_or_list(data, indent_level=0):
+    """
+    Display nested dictionaries or lists in a single markdown element.
+    """
+    st.markdown(dict_or_list_markdown(data, indent_level), unsafe_allow_html=True)
 
 
 def app():
     st.header("Assessment Results")
 
-    if "answers" not in st.session_state or not st.session_state.answers:
-        st.warning("Please complete the assessment first.")
+    if not st.session_state.get("assessment_submitted") or not st.session_state.get("answers"):
+        st.warning("Please complete and submit the assessment first.")
         return
 
     if "ai_readiness_result" not in st.session_state:
         try:
-            # Generate AI readiness score and insights
-            answers_text = "\n".join(
-                [
-                    f"Q{i+1}: {answer}"
-                    for i, answer in enumerate(st.session_state.answers.values())
-                ]
-            )
-            ai_readiness_result = generate_ai_readiness_score(
-                answers_text, st.session_state.company_info
-            )
+            if "results_pipeline" not in st.session_state:
+                # Generate AI readiness score, recommendations and insights concurrently
+                answers_text = format_answers(Answer.from_state(st.session_state.answers))
+                tasks = RESULTS_TASKS
+                if SCORE_CACHE_ENABLED:
+                    tasks = dict(
+                        RESULTS_TASKS,
+                        score=partial(
+                            score_with_cache,
+                            questions=st.session_state.get("questions", []),
+                            answers=dict(st.session_state.answers),
+                        ),
+                    )
+                st.session_state.results_pipeline = ResultsPipeline(
+                    answers_text, st.session_state.company_info, tasks
+                )
+
+            placeholders = result_placeholders()
+            with st.spinner("Generating results..."):
+                ai_readiness_result = stream_results(
+                    st.session_state.results_pipeline, placeholders
+                )
             st.session_state.ai_readiness_result = ai_readiness_result
+            record_benchmark(ai_readiness_result, st.session_state.company_info)
+            archive_result(ai_readiness_result)
 
-            # Print the raw AI readiness result
-            print("Raw AI Readiness Result:")
-            print(json.dumps(ai_readiness_result, indent=2))
+            log_response("results.ai_readiness_result", json.dumps(ai_readiness_result.to_dict()))
 
         except Exception as e:
             print(f"Exception details: {type(e).__name__}: {str(e)}")
-            st.error(f"An error occurred while generating results: {str(e)}")
+            if isinstance(e, FutureTimeoutError):
+                st.error("Generating results took too long.")
+            else:
+                st.error(f"An error occurred while generating results: {str(e)}")
             st.write("Please try again or contact support if the issue persists.")
+            discard_pipeline()
             return
+    else:
+        # Sections were already rendered while streaming on the run that produced the result
+        display_results(st.session_state.ai_readiness_result)
 
-    # Display results
-    display_results(st.session_state.ai_readiness_result)
+    display_benchmark(
+        st.session_state.ai_readiness_result, st.session_state.company_info
+    )
+
+    # Recommendations arrive independently of the score
+    recommendations_placeholder = st.empty()
+    if "recommendations" not in st.session_state and "results_pipeline" in st.session_state:
+        try:
+            with recommendations_placeholder.container():
+                with st.spinner("Generating recommendations..."):
+                    st.session_state.recommendations = (
+                        st.session_state.results_pipeline.result("recommendations")
+                    )
+        except Exception as e:
+            print(f"Exception details: {type(e).__name__}: {str(e)}")
+            st.session_state.recommendations = None
+    with recommendations_placeholder.container():
+        display_recommendations(st.session_state.get("recommendations"))
+
+    # Reports are only rendered when a download is actually clicked
+    report_args = (
+        st.session_state.ai_readiness_result,
+        st.session_state.company_info,
+        st.session_state.get("recommendations"),
+    )
+    st.download_button(
+        "Download Report (HTML)",
+        data=partial(render_report_html, *report_args),
+        file_name="ai_readiness_report.html",
+        mime="text/html",
+    )
+    if pdf_available():
+        st.download_button(
+            "Download Report (PDF)",
+            data=partial(render_report_pdf, *report_args),
+            file_name="ai_readiness_report.pdf",
+            mime="application/pdf",
+        )
 
     # Reset button
     if "reset_button_key" not in st.session_state:
@@ -99,112 +141,220 @@ def app():
     if st.button(
         "Start New Assessment", key=f"reset_button_{st.session_state.reset_button_key}"
     ):
-        for key in ["company_info", "questions", "answers", "ai_readiness_result"]:
+        discard_pipeline()
+        for key in [
+            "company_info",
+            "questions",
+            "answers",
+            "answer_log",
+            "answered_count",
+            "assessment_submitted",
+            "ai_readiness_result",
+            "recommendations",
+        ]:
             if key in st.session_state:
                 del st.session_state[key]
         st.session_state.reset_button_key += 1
         st.success(
             "Assessment reset. Please start again from the Company Information page."
         )
-        st.experimental_rerun()
+        st.rerun()
 
 
-def display_results(ai_readiness_result):
-    with st.container():
-        # Overall Score
-        st.markdown(
-            "<h3 style='color: #1E90FF;'>AI Readiness Score</h3>",
-            unsafe_allow_html=True,
-        )
-        overall_score = ai_readiness_result.get("overall_score", "N/A")
-        st.markdown(
-            f"<b>Overall Score:</b> {overall_score}/100",
-            unsafe_allow_html=True,
-        )
-        explanation = ai_readiness_result.get(
-            "explanation", "No explanation available."
-        )
-        st.markdown(
-            f"<b>Explanation:</b> {explanation}",
-            unsafe_allow_html=True,
+def record_benchmark(ai_readiness_result, company_info):
+    if not ai_readiness_result.has_score():
+        return
+    try:
+        benchmark_store.add(
+            ai_readiness_result.overall_score,
+            company_info.industry,
+            company_info.size,
+            company_info.country,
         )
+    except Exception as e:
+        print(f"Could not record benchmark: {str(e)}")
+
 
-        # Area Scores
-        st.markdown("<br>", unsafe_allow_html=True)
-        st.markdown(
-            "<h3 style='color: #1E90FF;'>Area Scores</h3>", unsafe_allow_html=True
+def archive_result(ai_readiness_result):
+    # Unsubmitted assessments only hold widget defaults, which would skew the cohort statistics
+    if not st.session_state.get("assessment_submitted") or not results_store_available():
+        return
+    try:
+        results_store.add(
+            ai_readiness_result,
+            st.session_state.company_info,
+            st.session_state.get("questions", []),
+            Answer.from_state(st.session_state.answers),
         )
-        area_scores = ai_readiness_result.get("area_scores", {})
-        if isinstance(area_scores, dict):
-            radar_chart = create_radar_chart(area_scores)
-            st.plotly_chart(radar_chart)
-            for area, score in area_scores.items():
-                st.markdown(f"- **{area}:** {score}/100")
-        else:
-            st.write("No area scores available or invalid format.")
+    except Exception as e:
+        print(f"Could not archive result: {str(e)}")
 
-        # Strengths and Improvement Areas
-        for title, key in [
-            ("Strengths", "strengths"),
-            ("Improvement Areas", "improvement_areas"),
-        ]:
-            st.markdown(
-                f"<h3 style='color: #1E90FF;'>{title}</h3>", unsafe_allow_html=True
-            )
-            items = ai_readiness_result.get(key, [])
-            if isinstance(items, list):
-                for item in items:
-                    st.markdown(f"- {item}")
-            else:
-                st.write(f"No {title.lower()} available or invalid format.")
 
-        # Projected Score
-        st.markdown(
-            "<h3 style='color: #1E90FF;'>Projected Score</h3>", unsafe_allow_html=True
-        )
-        projected_score = ai_readiness_result.get("projected_score", "N/A")
-        st.markdown(f"**Projected Score in 12 months:** {projected_score}/100")
-
-        # Risks and Opportunities
-        for title, key in [("Risks", "risks"), ("Opportunities", "opportunities")]:
-            st.markdown(
-                f"<h3 style='color: #1E90FF;'>{title}</h3>", unsafe_allow_html=True
-            )
-            items = ai_readiness_result.get(key, [])
-            if isinstance(items, list):
-                for item in items:
-                    st.markdown(f"- {item}")
-            else:
-                st.write(f"No {title.lower()} available or invalid format.")
+def display_benchmark(ai_readiness_result, company_info):
+    if not ai_readiness_result.has_score():
+        return
+    score = ai_readiness_result.overall_score
+    benchmark = benchmark_store.lookup(
+        company_info.industry, company_info.size, company_info.country, score
+    )
+    if benchmark is None:
+        return
 
-        # AI Use Cases
-        st.markdown(
-            "<h3 style='color: #1E90FF;'>AI Use Cases</h3>", unsafe_allow_html=True
-        )
-        use_cases = ai_readiness_result.get("ai_use_cases", {})
-        st.markdown("**Current Use Cases:**")
-        st.markdown(f"- {use_cases.get('current', 'No current use cases available.')}")
-        st.markdown("**Ideal Scenarios:**")
-        st.markdown(f"- {use_cases.get('ideal', 'No ideal scenarios available.')}")
-
-        # Policy and Strategy Insights
-        st.markdown(
-            "<h3 style='color: #1E90FF;'>Policy and Strategy Insights</h3>",
-            unsafe_allow_html=True,
-        )
-        policy_insights = ai_readiness_result.get(
-            "policy_strategy_insights", "No policy and strategy insights available."
+    st.markdown(
+        "<h3 style='color: #1E90FF;'>Benchmark</h3>", unsafe_allow_html=True
+    )
+    st.plotly_chart(
+        create_benchmark_chart(
+            score,
+            benchmark["industry_avg"],
+            benchmark["top_10"],
+            benchmark["bottom_10"],
+            benchmark["median"],
         )
-        st.write(policy_insights)
+    )
+    st.markdown(
+        f"Your score is higher than {benchmark['percentile_rank']:.0f}% of "
+        f"{benchmark['count']} comparable assessments."
+    )
 
-        # Recommendations for Future
-        st.markdown(
-            "<h3 style='color: #1E90FF;'>Recommendations for Future</h3>",
-            unsafe_allow_html=True,
-        )
-        recommendations = ai_readiness_result.get("recommendations_for_future", [])
-        if isinstance(recommendations, list):
-            for recommendation in recommendations:
-                st.markdown(f"- {recommendation}")
+
+def discard_pipeline():
+    if "results_pipeline" in st.session_state:
+        st.session_state.results_pipeline.cancel()
+        del st.session_state["results_pipeline"]
+
+
+def display_recommendations(recommendations):
+    if isinstance(recommendations, (dict, list)) and recommendations:
+        body = dict_or_list_markdown(recommendations)
+    else:
+        body = "No detailed recommendations available."
+    st.markdown(section_markdown("Detailed Recommendations", body), unsafe_allow_html=True)
+
+
+def section_markdown(title, *lines):
+    return "\n\n".join([f"<h3 style='color: #1E90FF;'>{title}</h3>", *(line for line in lines if line)])
+
+
+def bullet_list(items):
+    return "\n".join(
+        dict_or_list_markdown(item, 1) if isinstance(item, (dict, list)) else f"- {item}" for item in items
+    )
+
+
+def render_overall_score(result):
+    st.markdown(
+        section_markdown("AI Readiness Score", f"<b>Overall Score:</b> {result.overall_score}/100"),
+        unsafe_allow_html=True,
+    )
+
+
+def render_explanation(result):
+    st.markdown(f"<b>Explanation:</b> {result.explanation}", unsafe_allow_html=True)
+
+
+def render_area_scores(result):
+    area_scores = result.area_scores
+    with st.container():
+        st.markdown("<br>\n\n" + section_markdown("Area Scores"), unsafe_allow_html=True)
+        if area_scores:
+            st.plotly_chart(create_radar_chart(area_scores))
+            st.markdown("\n".join(f"- **{area}:** {score}/100" for area, score in area_scores.items()))
         else:
-            st.markdown("No recommendations available or invalid format.")
+            st.write("No area scores available.")
+
+
+def render_list(title, field):
+    def render(result):
+        st.markdown(section_markdown(title, bullet_list(getattr(result, field))), unsafe_allow_html=True)
+
+    return render
+
+
+def render_projected_score(result):
+    st.markdown(
+        section_markdown(
+            "Projected Score",
+            f"**Projected Score in 12 months:** {result.projected_score}/100",
+        ),
+        unsafe_allow_html=True,
+    )
+
+
+def render_ai_use_cases(result):
+    use_cases = result.ai_use_cases
+    st.markdown(
+        section_markdown(
+            "AI Use Cases",
+            "**Current Use Cases:**",
+            f"- {use_cases.get('current', 'No current use cases available.')}",
+            "**Ideal Scenarios:**",
+            f"- {use_cases.get('ideal', 'No ideal scenarios available.')}",
+        ),
+        unsafe_allow_html=True,
+    )
+
+
+def render_policy_strategy_insights(result):
+    insights = result.policy_strategy_insights
+    body = dict_or_list_markdown(insights) if isinstance(insights, (dict, list)) else str(insights)
+    st.markdown(section_markdown("Policy and Strategy Insights", body), unsafe_allow_html=True)
+
+
+def render_recommendations_for_future(result):
+    recommendations = result.recommendations_for_future
+    body = bullet_list(recommendations) if recommendations else "No recommendations available."
+    st.markdown(section_markdown("Recommendations for Future", body), unsafe_allow_html=True)
+
+
+# One placeholder per top-level key of the score response, in page order
+RESULT_SECTIONS = {
+    "overall_score": render_overall_score,
+    "explanation": render_explanation,
+    "area_scores": render_area_scores,
+    "strengths": render_list("Strengths", "strengths"),
+    "improvement_areas": render_list("Improvement Areas", "improvement_areas"),
+    "projected_score": render_projected_score,
+    "risks": render_list("Risks", "risks"),
+    "opportunities": render_list("Opportunities", "opportunities"),
+    "ai_use_cases": render_ai_use_cases,
+    "policy_strategy_insights": render_policy_strategy_insights,
+    "recommendations_for_future": render_recommendations_for_future,
+}
+
+
+def result_placeholders():
+    return {key: st.empty() for key in RESULT_SECTIONS}
+
+
+def render_section(placeholders, key, result):
+    # Each renderer emits a single element, which replaces the placeholder's content
+    with placeholders[key]:
+        RESULT_SECTIONS[key](result)
+
+
+def stream_results(pipeline, placeholders):
+    """
+    Render each section of the score response as soon as it has streamed in,
+    then fill any section the response left out. Returns the final result.
+    """
+    sections = {}
+    for key, value in pipeline.sections("score"):
+        sections[key] = value
+        key = normalize_result_key(key)
+        if key in RESULT_SECTIONS:
+            render_section(placeholders, key, ReadinessResult.from_dict(sections))
+
+    result = pipeline.result("score")
+    rendered = {normalize_result_key(key) for key in sections}
+    for key in RESULT_SECTIONS:
+        if key not in rendered:
+            render_section(placeholders, key, result)
+    return result
+
+
+def display_results(ai_readiness_result):
+    # A ReadinessResult, so every field already has the expected type
+    placeholders = result_placeholders()
+    for key in RESULT_SECTIONS:
+        render_section(placeholders, key, ai_readiness_result)
@@ -0,0 +1,137 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from llm_scheduler import MAX_CONNECTIONS
+from openai_helper import generate_ai_readiness_score, generate_recommendations
+
+RESULTS_TIMEOUT_SECONDS = float(os.getenv("AI_READINESS_RESULTS_TIMEOUT", "120"))
+
+# Shared across sessions so concurrent users do not each spin up their own threads. Every task
+# holds one scheduler slot, so with fewer workers than slots tasks would sit in this queue,
+# where the results timeout is already running, while connections stay idle
+executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("AI_READINESS_PIPELINE_WORKERS", str(MAX_CONNECTIONS))),
+    thread_name_prefix="results-pipeline",
+)
+
+# Every analysis prompt the results page needs; they are all fired at once
+RESULTS_TASKS = {
+    "score": generate_ai_readiness_score,
+    "recommendations": generate_recommendations,
+}
+# Tasks that accept ``on_section`` and publish parts of their result while running
+STREAMED_TASKS = {"score"}
+
+
+class PipelineCancelled(Exception):
+    pass
+
+
+class SectionFeed:
+    """Sections of a streamed task in arrival order, readable from another thread."""
+
+    def __init__(self):
+        self._sections = []
+        self._closed = False
+        self._condition = threading.Condition()
+
+    def publish(self, key, value):
+        with self._condition:
+            if self._closed:
+                # Closed before the task finished, i.e. the pipeline was cancelled
+                raise PipelineCancelled("Pipeline cancelled while streaming.")
+            self._sections.append((key, value))
+            self._condition.notify_all()
+
+    def close(self):
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    def iter(self, deadline):
+        """
+        Yield every section published so far, then the rest as they arrive,
+        until the task finishes. Raises ``TimeoutError`` after ``deadline``
+        (a ``time.monotonic()`` value).
+        """
+        index = 0
+        while True:
+            with self._condition:
+                while index >= len(self._sections) and not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise FutureTimeoutError()
+                    self._condition.wait(remaining)
+                if index >= len(self._sections):
+                    return
+                section = self._sections[index]
+            index += 1
+            yield section
+
+
+def _run_streamed(task, feed, *args):
+    try:
+        return task(*args, on_section=feed.publish)
+    finally:
+        feed.close()
+
+
+class ResultsPipeline:
+    """
+    Runs the results-page completions concurrently so the page can render the
+    score as soon as it lands and fill in the slower sections afterwards.
+    """
+
+    def __init__(self, answers_text, company_info, tasks=None, timeout=RESULTS_TIMEOUT_SECONDS):
+        self.timeout = timeout
+        self.cancelled = False
+        self.feeds = {}
+        self.futures = {}
+        for name, task in (tasks or RESULTS_TASKS).items():
+            if name in STREAMED_TASKS:
+                self.feeds[name] = SectionFeed()
+                self.futures[name] = executor.submit(
+                    _run_streamed, task, self.feeds[name], answers_text, company_info
+                )
+            else:
+                self.futures[name] = executor.submit(task, answers_text, company_info)
+
+    def done(self, name):
+        return self.futures[name].done()
+
+    def result(self, name, timeout=None):
+        """
+        Block until the named task finishes. Raises ``concurrent.futures.TimeoutError``
+        if it takes longer than ``timeout`` (the pipeline default when omitted).
+        """
+        if self.cancelled:
+            raise PipelineCancelled(f"Pipeline cancelled before '{name}' completed.")
+        return self.futures[name].result(
+            timeout=self.timeout if timeout is None else timeout
+        )
+
+    def sections(self, name, timeout=None):
+        """
+        Yield ``(key, value)`` sections of a streamed task as they arrive,
+        starting over from the first one on every call. Call ``result`` for
+        the finished value once the sections run out.
+        """
+        if self.cancelled:
+            raise PipelineCancelled(f"Pipeline cancelled before '{name}' completed.")
+        feed = self.feeds.get(name)
+        if feed is None:
+            return
+        deadline = time.monotonic() + (self.timeout if timeout is None else timeout)
+        yield from feed.iter(deadline)
+
+    def cancel(self):
+        # Tasks still queued never start. Streamed tasks stop at their next
+        # section, which closes their stream; other in-flight requests finish
+        # in the background, at most REQUEST_TIMEOUT_SECONDS after they were
+        # made, and their results are discarded.
+        self.cancelled = True
+        for future in self.futures.values():
+            future.cancel()
+        for feed in self.feeds.values():
+            feed.close()
@@ -0,0 +1,189 @@
+"""
+Prompt templates for the OpenAI helpers.
+
+Each template is split into a static part, built once at import, and a short
+dynamic tail filled in per call. Static text goes first and every request
+starts with the same system message, so consecutive calls share the longest
+possible prefix for provider-side prompt caching.
+"""
+from functools import lru_cache
+from string import Template
+from textwrap import dedent
+
+NUM_QUESTIONS = 15
+NUM_RECOMMENDATIONS = 5
+# Output budgets measured on real responses, with headroom
+TOKENS_PER_QUESTION = 120
+TOKENS_PER_RECOMMENDATION = 450
+SCORE_OUTPUT_TOKENS = 3500
+OUTPUT_OVERHEAD_TOKENS = 100
+# Long open-ended answers are trimmed so one essay cannot blow the input budget
+MAX_ANSWER_TOKENS = 300
+
+# Choices offered on the company information page
+INDUSTRIES = ["Technology", "Healthcare", "Finance", "Retail", "Manufacturing", "Other"]
+COMPANY_SIZES = [
+    "Small (1-50 employees)",
+    "Medium (51-500 employees)",
+    "Large (501+ employees)",
+]
+
+FOCUS_AREAS = [
+    "AI Strategy and Leadership",
+    "Data Infrastructure and Management",
+    "AI/ML Capabilities and Talent",
+    "Ethical AI and Governance",
+    "AI Integration and Innovation",
+]
+
+SYSTEM_PROMPT = Template(
+    dedent(
+        """\
+        You are an expert AI readiness consultant assessing organizations across five focus areas:
+        $focus_areas
+
+        Consider industry-specific factors, company size, and country-specific regulations.
+        Always respond with a single valid JSON object and no other text."""
+    )
+).substitute(focus_areas="\n".join(f"{i}. {area}" for i, area in enumerate(FOCUS_AREAS, 1)))
+
+
+@lru_cache(maxsize=None)
+def _get_encoding():
+    # Loading an encoding is slow and may download it, so it happens on the first count, not at import
+    try:
+        import tiktoken
+
+        return tiktoken.get_encoding("o200k_base")  # gpt-4o family
+    except Exception:
+        return None
+
+
+def count_tokens(text):
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text))
+    # Close to what o200k_base gives for English prose
+    return (len(text) + 3) // 4
+
+
+def count_message_tokens(messages):
+    # Every chat message carries a few tokens of framing
+    return sum(count_tokens(message.get("content") or "") + 4 for message in messages) + 2
+
+
+def trim_to_tokens(text, max_tokens):
+    text = str(text)
+    if count_tokens(text) <= max_tokens:
+        return text
+    encoding = _get_encoding()
+    if encoding is not None:
+        return encoding.decode(encoding.encode(text)[:max_tokens]) + "..."
+    return text[: max_tokens * 4] + "..."
+
+
+def trim_answers(answers, max_tokens=MAX_ANSWER_TOKENS):
+    return "\n".join(trim_to_tokens(line, max_tokens) for line in str(answers).splitlines())
+
+
+def build_messages(prompt):
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": prompt},
+    ]
+
+
+class PromptTemplate:
+    def __init__(self, static, dynamic):
+        self.static = dedent(static).strip() + "\n\n"
+        self.dynamic = Template(dedent(dynamic).strip())
+
+    def render(self, **values):
+        return self.static + self.dynamic.substitute(values)
+
+
+QUESTIONS_PROMPT = PromptTemplate(
+    """
+    Write questions for an AI readiness assessment covering all five focus areas.
+
+    For each question, provide:
+    1. A clear, concise question text that is specific to the company's size, industry, and location
+    2. A brief explanation of why this question is important in the context of AI readiness
+    3. The type of question (scale, multiple-choice, or open-ended)
+    4. The impact level of this question (high, medium, or low) on overall AI readiness
+    5. For multiple-choice questions, provide 4-5 options that reflect varying levels of AI maturity, from least to most mature
+
+    Guidelines for creating questions:
+    - Tailor questions to the specific industry, considering unique challenges and opportunities
+    - Adjust the complexity based on the company size (e.g., more sophisticated for larger companies)
+    - Consider regional factors that might influence AI adoption in the given country
+    - Include a mix of technical and non-technical questions to assess overall organizational readiness
+    - Ensure questions are actionable and provide insights for improvement
+
+    Group the questions by focus area, in the order listed above.
+    Format the output as {"questions": [...]} where each question object has the fields
+    question_text, explanation, type (scale|multiple-choice|open-ended),
+    impact_level (high|medium|low) and options (an empty list unless multiple-choice).
+    """,
+    """
+    Generate $num_questions questions for a $size company in the $industry industry located in $country.
+    """,
+)
+
+RECOMMENDATIONS_PROMPT = PromptTemplate(
+    """
+    Provide detailed recommendations to improve the company's AI readiness based on its assessment answers.
+
+    For each recommendation, include:
+    1. Action: A specific action the company should take
+    2. Rationale: Why this action is important
+    3. Benefits: The potential benefits of implementing this recommendation
+    4. Challenges: Potential challenges or obstacles in implementing this recommendation
+    5. Example: A brief example or case study of a company that successfully implemented a similar action
+    6. Timeline: An estimated timeline for implementation (e.g., short-term, medium-term, long-term)
+    7. Key Performance Indicators: 2-3 KPIs to measure the success of this recommendation
+
+    Format the output as a JSON object with a 'recommendations' key containing a list of recommendation objects.
+    """,
+    """
+    Provide $num_recommendations recommendations for a $size company in the $industry industry located in $country.
+
+    Assessment Answers:
+    $answers
+    """,
+)
+
+SCORE_PROMPT = PromptTemplate(
+    """
+    Analyze the company's AI readiness assessment answers and provide:
+    1. An overall AI readiness score on a scale of 0-100
+    2. A detailed explanation of the score, including key factors that influenced it
+    3. Scores for each of the 5 focus areas on a scale of 0-100
+    4. Key strengths and areas for improvement, with actionable insights for each
+    5. A projected AI readiness score in 12 months if the company implements the recommended improvements
+    6. Potential risks and opportunities based on the current AI readiness level
+    7. Relevant specific examples of AI use cases based on the organization's current AI readiness scores, and compare them with ideal scenarios
+    8. Insights on developing stronger AI policies, strategies, and frameworks based on the assessment results
+    9. Recommendations for future AI readiness assessment, including potential areas for improvement and actionable steps
+
+    Provide deep, critical analysis of the user's scores and rich insights for improving AI readiness.
+    Include specific recommendations for developing stronger AI policies, strategies, and frameworks.
+    Provide detailed comparisons between current AI use cases and ideal scenarios based on the readiness scores.
+
+    Format the output as a JSON object with keys for 'overall_score', 'explanation', 'area_scores', 'strengths', 'improvement_areas', 'projected_score', 'risks', 'opportunities', 'ai_use_cases', 'policy_strategy_insights', and 'recommendations_for_future'.
+    """,
+    """
+    The company is a $size company in the $industry industry located in $country.
+
+    Assessment Answers:
+    $answers
+    """,
+)
+
+
+def questions_max_tokens(num_questions=NUM_QUESTIONS):
+    return num_questions * TOKENS_PER_QUESTION + OUTPUT_OVERHEAD_TOKENS
+
+
+def recommendations_max_tokens(num_recommendations=NUM_RECOMMENDATIONS):
+    return num_recommendations * TOKENS_PER_RECOMMENDATION + OUTPUT_OVERHEAD_TOKENS
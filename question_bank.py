@@ -0,0 +1,206 @@
+"""
+Pre-generated question sets for the standard company profiles.
+
+Industry and size come from fixed lists, so a set can be generated ahead of
+time for every (industry, size) pair in the most frequently requested
+countries. The assessment page serves a banked set instantly and only calls
+the LLM for profiles the bank has not seen.
+
+    python question_bank.py                      # fill missing and outdated sets once
+    python question_bank.py --every 21600        # keep refreshing every 6 hours
+    python question_bank.py --top-countries 20 --concurrency 8
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from cache import normalize_key_part
+from models import decode_questions, encode_questions
+import sqlite_util
+
+BANK_PATH = os.getenv("AI_READINESS_QUESTION_BANK_PATH", ".cache/question_bank.sqlite3")
+# Banked sets older than this are regenerated by the next warm-up run
+REFRESH_SECONDS = int(os.getenv("AI_READINESS_QUESTION_BANK_REFRESH", str(7 * 24 * 3600)))
+TOP_COUNTRIES = int(os.getenv("AI_READINESS_QUESTION_BANK_COUNTRIES", "10"))
+# Warmed even before any traffic has been seen
+SEED_COUNTRIES = ["United States", "United Kingdom", "India", "Germany", "Canada"]
+
+
+def bank_version():
+    from openai_helper import MODEL, QUESTIONS_PROMPT_VERSION
+
+    return f"{QUESTIONS_PROMPT_VERSION}:{MODEL}"
+
+
+class QuestionBank:
+    """
+    SQLite-backed store of question sets keyed by normalized profile, plus a
+    count of requests per country used to decide which countries to warm.
+    Sets generated for an older prompt version or model are never served.
+    """
+
+    def __init__(self, path=BANK_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _connect(self):
+        if self._conn is None:
+            self._conn = sqlite_util.connect(
+                self.path,
+                """CREATE TABLE IF NOT EXISTS question_sets (
+                    industry TEXT NOT NULL,
+                    size TEXT NOT NULL,
+                    country TEXT NOT NULL,
+                    version TEXT NOT NULL,
+                    questions TEXT NOT NULL,
+                    generated_at REAL NOT NULL,
+                    PRIMARY KEY (industry, size, country)
+                );
+                CREATE TABLE IF NOT EXISTS country_requests (
+                    country_key TEXT PRIMARY KEY,
+                    country TEXT NOT NULL,
+                    requests INTEGER NOT NULL
+                );""",
+            )
+        return self._conn
+
+    @staticmethod
+    def _key(industry, size, country):
+        return tuple(normalize_key_part(part) for part in (industry, size, country))
+
+    def get(self, industry, size, country, version=None):
+        version = version or bank_version()
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT questions FROM question_sets "
+                "WHERE industry = ? AND size = ? AND country = ? AND version = ?",
+                self._key(industry, size, country) + (version,),
+            ).fetchone()
+        return decode_questions(json.loads(row[0])) if row else None
+
+    def put(self, industry, size, country, questions, version=None):
+        payload = json.dumps(encode_questions(questions), separators=(",", ":"))
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO question_sets "
+                "(industry, size, country, version, questions, generated_at) VALUES (?, ?, ?, ?, ?, ?)",
+                self._key(industry, size, country) + (version or bank_version(), payload, time.time()),
+            )
+            conn.commit()
+
+    def is_fresh(self, industry, size, country, max_age=REFRESH_SECONDS, version=None):
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT generated_at FROM question_sets "
+                "WHERE industry = ? AND size = ? AND country = ? AND version = ?",
+                self._key(industry, size, country) + (version or bank_version(),),
+            ).fetchone()
+        return row is not None and time.time() - row[0] < max_age
+
+    def record_request(self, country):
+        country = " ".join(str(country).split())
+        if not country:
+            return
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT INTO country_requests (country_key, country, requests) VALUES (?, ?, 1) "
+                "ON CONFLICT (country_key) DO UPDATE SET requests = requests + 1",
+                (normalize_key_part(country), country),
+            )
+            conn.commit()
+
+    def top_countries(self, limit=TOP_COUNTRIES):
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT country FROM country_requests ORDER BY requests DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [country for (country,) in rows]
+
+    def stats(self):
+        with self._lock:
+            conn = self._connect()
+            (size,) = conn.execute(
+                "SELECT COUNT(*) FROM question_sets WHERE version = ?", (bank_version(),)
+            ).fetchone()
+            (countries,) = conn.execute("SELECT COUNT(*) FROM country_requests").fetchone()
+        return {"sets": size, "countries_seen": countries}
+
+
+question_bank = QuestionBank()
+
+
+def warm_profiles(bank, top_countries=TOP_COUNTRIES):
+    from prompts import COMPANY_SIZES, INDUSTRIES
+
+    countries = {}
+    for country in bank.top_countries(top_countries) + SEED_COUNTRIES:
+        countries.setdefault(normalize_key_part(country), country)
+    return [
+        (industry, size, country)
+        for country in countries.values()
+        for industry in INDUSTRIES
+        for size in COMPANY_SIZES
+    ]
+
+
+def warm(bank=question_bank, top_countries=TOP_COUNTRIES, max_age=REFRESH_SECONDS, concurrency=4):
+    """Generate every missing or outdated set; returns (generated, failed)."""
+    from llm_scheduler import BACKGROUND
+    from openai_helper import _generate_questions_uncached
+
+    pending = [
+        profile for profile in warm_profiles(bank, top_countries)
+        if not bank.is_fresh(*profile, max_age=max_age)
+    ]
+    print(f"Question bank: {len(pending)} set(s) to generate", file=sys.stderr)
+
+    def generate(profile):
+        questions = _generate_questions_uncached(*profile, priority=BACKGROUND)
+        if not questions:
+            raise ValueError("no questions returned")
+        bank.put(*profile, questions)
+
+    generated = failed = 0
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = {executor.submit(generate, profile): profile for profile in pending}
+        for future in as_completed(futures):
+            try:
+                future.result()
+                generated += 1
+            except Exception as e:
+                failed += 1
+                print(f"Question bank: {futures[future]} failed: {str(e)}", file=sys.stderr)
+    return generated, failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pre-generate question sets for standard profiles.")
+    parser.add_argument("--top-countries", type=int, default=TOP_COUNTRIES, help="Most requested countries to warm")
+    parser.add_argument("--max-age", type=int, default=REFRESH_SECONDS, help="Regenerate sets older than this (s)")
+    parser.add_argument("--concurrency", type=int, default=4, help="Sets generated at once")
+    parser.add_argument("--every", type=int, help="Keep running, warming again every N seconds")
+    args = parser.parse_args(argv)
+
+    while True:
+        started = time.perf_counter()
+        generated, failed = warm(
+            top_countries=args.top_countries, max_age=args.max_age, concurrency=args.concurrency
+        )
+        print(
+            f"Question bank: generated {generated}, failed {failed} in "
+            f"{time.perf_counter() - started:.1f}s; {question_bank.stats()}",
+            file=sys.stderr,
+        )
+        if not args.every:
+            return 1 if failed else 0
+        time.sleep(args.every)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,238 @@
+"""
+Static HTML and PDF reports for an ``ai_readiness_result``.
+
+Charts are drawn as inline SVG so a report is a single self-contained file and
+rendering needs neither a browser nor plotly's image export. HTML is streamed
+from the compiled template chunk by chunk; PDF needs the optional
+``weasyprint`` package.
+
+    python reports.py results.jsonl reports/                  # one HTML file per row
+    python reports.py results.jsonl reports/ --format pdf --workers 8
+
+The batch input is the JSONL written by batch_assess.py.
+"""
+import argparse
+import importlib.util
+import json
+import math
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from functools import lru_cache
+from html import escape
+from models import ReadinessResult
+from prompts import FOCUS_AREAS
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates")
+REPORT_TEMPLATE = "report.html"
+# (title, result key) for the sections rendered generically after the scores
+REPORT_SECTIONS = [
+    ("Strengths", "strengths"),
+    ("Improvement Areas", "improvement_areas"),
+    ("Risks", "risks"),
+    ("Opportunities", "opportunities"),
+    ("AI Use Cases", "ai_use_cases"),
+    ("Policy and Strategy Insights", "policy_strategy_insights"),
+    ("Recommendations for Future", "recommendations_for_future"),
+]
+CHART_COLOR = "#1E90FF"
+
+
+@lru_cache(maxsize=None)
+def get_template(name=REPORT_TEMPLATE):
+    # Compiled once per process; Jinja's own cache would still re-check the file on every call
+    from jinja2 import Environment, FileSystemLoader, select_autoescape
+
+    environment = Environment(
+        loader=FileSystemLoader(TEMPLATE_DIR),
+        autoescape=select_autoescape(["html"]),
+        auto_reload=False,
+    )
+    return environment.get_template(name)
+
+
+def _number(value):
+    return value if isinstance(value, (int, float)) and not isinstance(value, bool) else 0
+
+
+def radar_svg(area_scores, max_score=100, size=320):
+    labels = list(area_scores) or FOCUS_AREAS
+    center = size / 2
+    radius = size / 2 - 60
+    angles = [2 * math.pi * i / len(labels) - math.pi / 2 for i in range(len(labels))]
+
+    def point(angle, fraction):
+        return (center + radius * fraction * math.cos(angle), center + radius * fraction * math.sin(angle))
+
+    parts = [f'<svg xmlns="http://www.w3.org/2000/svg" width="{size}" height="{size}" viewBox="0 0 {size} {size}">']
+    for ring in (0.25, 0.5, 0.75, 1.0):
+        ring_points = " ".join(f"{x:.1f},{y:.1f}" for x, y in (point(angle, ring) for angle in angles))
+        parts.append(f'<polygon points="{ring_points}" fill="none" stroke="#ddd"/>')
+    score_points = " ".join(
+        f"{x:.1f},{y:.1f}"
+        for x, y in (
+            point(angle, min(max(_number(area_scores.get(label, 0)) / max_score, 0), 1))
+            for angle, label in zip(angles, labels)
+        )
+    )
+    parts.append(
+        f'<polygon points="{score_points}" fill="{CHART_COLOR}" fill-opacity="0.3" stroke="{CHART_COLOR}" stroke-width="2"/>'
+    )
+    for angle, label in zip(angles, labels):
+        x, y = point(angle, 1.12)
+        anchor = "middle" if abs(math.cos(angle)) < 0.3 else ("start" if math.cos(angle) > 0 else "end")
+        parts.append(
+            f'<text x="{x:.1f}" y="{y:.1f}" font-size="10" text-anchor="{anchor}">{escape(str(label))}</text>'
+        )
+    parts.append("</svg>")
+    return "".join(parts)
+
+
+def score_svg(score, max_score=100, width=320, height=60):
+    fraction = min(max(_number(score) / max_score, 0), 1)
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" viewBox="0 0 {width} {height}">'
+        f'<rect x="0" y="20" width="{width}" height="20" rx="4" fill="#eee"/>'
+        f'<rect x="0" y="20" width="{width * fraction:.1f}" height="20" rx="4" fill="{CHART_COLOR}"/>'
+        f'<text x="0" y="14" font-size="12">Overall score: {escape(str(score))}/{max_score}</text>'
+        "</svg>"
+    )
+
+
+def iter_report_html(result, company_info=None, recommendations=None):
+    """Yield the report in chunks as the template renders, without building it in memory."""
+    from markupsafe import Markup
+
+    result = ReadinessResult.from_dict(result)
+    charts = {
+        "radar": Markup(radar_svg(result.area_scores)) if result.area_scores else "",
+        "score": Markup(score_svg(result.overall_score)),
+    }
+    return get_template().generate(
+        result=result,
+        company_info=company_info,
+        recommendations=recommendations,
+        sections=REPORT_SECTIONS,
+        charts=charts,
+    )
+
+
+def render_report_html(result, company_info=None, recommendations=None):
+    return "".join(iter_report_html(result, company_info, recommendations))
+
+
+def write_report_html(path, result, company_info=None, recommendations=None):
+    with open(path, "w", encoding="utf-8") as f:
+        for chunk in iter_report_html(result, company_info, recommendations):
+            f.write(chunk)
+
+
+def pdf_available():
+    return importlib.util.find_spec("weasyprint") is not None
+
+
+def render_report_pdf(result, company_info=None, recommendations=None, target=None):
+    """
+    Render the report to PDF bytes, or into ``target`` (a path or file object)
+    when given. Requires the optional weasyprint package.
+    """
+    try:
+        from weasyprint import HTML
+    except ImportError:
+        raise RuntimeError("PDF reports need the weasyprint package: pip install weasyprint")
+    html = render_report_html(result, company_info, recommendations)
+    return HTML(string=html, base_url=TEMPLATE_DIR).write_pdf(target)
+
+
+def _safe_filename(name):
+    return "".join(char if char.isalnum() or char in "-_." else "_" for char in str(name)) or "report"
+
+
+def render_record(record, output_dir, report_format):
+    """Render one batch_assess.py output row; returns the path, or None if it has no result."""
+    if not isinstance(record.get("result"), dict):
+        return None
+    path = os.path.join(output_dir, f"{_safe_filename(record['id'])}.{report_format}")
+    args = (record["result"], record.get("company_info"), record.get("recommendations"))
+    if report_format == "pdf":
+        render_report_pdf(*args, target=path)
+    else:
+        write_report_html(path, *args)
+    return path
+
+
+def _render_lines(lines, output_dir, report_format):
+    results = []
+    for line in lines:
+        try:
+            results.append((render_record(json.loads(line), output_dir, report_format), None))
+        except Exception as e:
+            results.append((None, str(e)))
+    return results
+
+
+def iter_chunks(path, size):
+    chunk = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                chunk.append(line)
+            if len(chunk) >= size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+
+def render_batch(input_path, output_dir, report_format="html", workers=None, chunksize=16):
+    """
+    Render every row of a batch_assess.py results file in worker processes.
+    Rows are read and dispatched in chunks with a bounded number in flight, so
+    the input never has to fit in memory. Returns (rendered, skipped, failed).
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    counts = {"rendered": 0, "skipped": 0, "failed": 0}
+
+    def collect(futures):
+        for future in futures:
+            for path, error in future.result():
+                if error:
+                    counts["failed"] += 1
+                    print(f"Report failed: {error}", file=sys.stderr)
+                else:
+                    counts["rendered" if path else "skipped"] += 1
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        in_flight = set()
+        for chunk in iter_chunks(input_path, chunksize):
+            if len(in_flight) >= workers * 2:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                collect(done)
+            in_flight.add(executor.submit(_render_lines, chunk, output_dir, report_format))
+        collect(in_flight)
+    return counts["rendered"], counts["skipped"], counts["failed"]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render AI readiness reports in bulk.")
+    parser.add_argument("input", help="JSONL results written by batch_assess.py")
+    parser.add_argument("output_dir", help="Directory to write one report per row into")
+    parser.add_argument("--format", choices=["html", "pdf"], default="html")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: one per CPU)")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    rendered, skipped, failed = render_batch(args.input, args.output_dir, args.format, args.workers)
+    elapsed = time.perf_counter() - started
+    print(
+        f"Rendered {rendered} report(s), skipped {skipped} without a result, {failed} failed "
+        f"in {elapsed:.1f}s ({rendered / elapsed if elapsed else 0:.0f}/s)",
+        file=sys.stderr,
+    )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,534 @@
+"""
+Columnar archive of completed assessments for cohort analytics.
+
+Results are written as Parquet files in three tables that share a
+``result_id``, each hive-partitioned by industry and month:
+
+    <root>/assessments/industry=Retail/month=2026-10/<id>.parquet   one row per assessment
+    <root>/area_scores/...                                          one row per focus area
+    <root>/answers/...                                              one row per answered question
+
+Every flush also writes rollups next to them: counts and sums per industry,
+month, size and country, plus a 101-bucket overall score histogram as in
+benchmark_store. The analytics queries only read rollups, whose size depends
+on how many distinct profiles there are rather than on how many assessments,
+so they stay interactive at millions of rows. Filters on industry and month
+prune whole directories, other filters are pushed down to the Parquet
+row-group statistics, and results are cached for a minute.
+
+Writes are buffered and flushed as one file per partition, so each worker
+process adds a few files a minute at most. Merge them periodically:
+
+    python results_store.py compact
+    python results_store.py compact --every 3600    # keep compacting hourly
+    python results_store.py stats
+"""
+import argparse
+import atexit
+import os
+import shutil
+import sys
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timezone
+from benchmark_store import NUM_BUCKETS, histogram_quantile
+
+RESULTS_PATH = os.getenv("AI_READINESS_RESULTS_PATH", ".cache/results")
+# Assessments buffered in memory before they are written out
+FLUSH_ROWS = int(os.getenv("AI_READINESS_RESULTS_FLUSH_ROWS", "200"))
+FLUSH_SECONDS = float(os.getenv("AI_READINESS_RESULTS_FLUSH_SECONDS", "30"))
+# Other processes append too, so cached aggregates are recomputed at most this often
+REFRESH_SECONDS = 60
+QUERY_CACHE_SIZE = 256
+TABLES = ["assessments", "area_scores", "answers"]
+DIMENSIONS = ["industry", "size", "country", "month"]
+# Rollup name -> (source table, grouping columns beyond DIMENSIONS, summed measures)
+ROLLUPS = {
+    "score_rollup": ("assessments", ["bucket"], ["count", "score_sum"]),
+    "area_rollup": ("area_scores", ["area"], ["count", "score_sum"]),
+    "question_rollup": ("answers", ["question_text"], ["answers", "value_count", "value_sum"]),
+}
+
+
+def available():
+    try:
+        import pyarrow.dataset  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _score(value):
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return float(str(value).strip().rstrip("%"))
+    except (TypeError, ValueError):
+        return None
+
+
+def _schemas():
+    import pyarrow as pa
+
+    common = [
+        ("result_id", pa.string()),
+        ("completed_at", pa.timestamp("s", tz="UTC")),
+        ("industry", pa.string()),
+        ("month", pa.string()),
+        ("size", pa.string()),
+        ("country", pa.string()),
+    ]
+    dimensions = [(column, pa.string()) for column in ["industry", "month", "size", "country"]]
+    return {
+        "assessments": pa.schema(
+            common + [("overall_score", pa.float64()), ("projected_score", pa.float64())]
+        ),
+        "area_scores": pa.schema(common + [("area", pa.string()), ("score", pa.float64())]),
+        "answers": pa.schema(
+            common
+            + [
+                ("question_index", pa.int32()),
+                ("question_text", pa.string()),
+                ("question_type", pa.string()),
+                ("answer", pa.string()),
+                ("answer_value", pa.float64()),
+            ]
+        ),
+        "score_rollup": pa.schema(
+            dimensions + [("bucket", pa.int16()), ("count", pa.int64()), ("score_sum", pa.float64())]
+        ),
+        "area_rollup": pa.schema(
+            dimensions + [("area", pa.string()), ("count", pa.int64()), ("score_sum", pa.float64())]
+        ),
+        "question_rollup": pa.schema(
+            dimensions
+            + [
+                ("question_text", pa.string()),
+                ("answers", pa.int64()),
+                ("value_count", pa.int64()),
+                ("value_sum", pa.float64()),
+            ]
+        ),
+    }
+
+
+def _partitioning():
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    return ds.partitioning(pa.schema([("industry", pa.string()), ("month", pa.string())]), flavor="hive")
+
+
+def result_rows(result, company_info, questions=(), answers=(), completed_at=None, result_id=None):
+    """Rows for every table describing one completed assessment."""
+    from data_processing import answer_to_number
+
+    completed_at = completed_at or datetime.now(timezone.utc)
+    common = {
+        "result_id": result_id or uuid.uuid4().hex,
+        "completed_at": completed_at,
+        "industry": company_info.industry,
+        "month": completed_at.strftime("%Y-%m"),
+        "size": company_info.size,
+        "country": " ".join(company_info.country.split()),
+    }
+    rows = {
+        "assessments": [
+            dict(
+                common,
+                overall_score=_score(result.overall_score),
+                projected_score=_score(result.projected_score),
+            )
+        ],
+        "area_scores": [
+            dict(common, area=str(area), score=_score(score))
+            for area, score in (result.area_scores or {}).items()
+        ],
+        "answers": [],
+    }
+    for answer in answers:
+        question = questions[answer.question_index] if answer.question_index < len(questions) else None
+        value = answer_to_number(answer.value, question) if question is not None else float("nan")
+        rows["answers"].append(
+            dict(
+                common,
+                question_index=answer.question_index,
+                question_text=question.question_text if question is not None else None,
+                question_type=question.type if question is not None else None,
+                answer=None if answer.value is None else str(answer.value),
+                answer_value=None if value != value else value,  # NaN means unscorable
+            )
+        )
+    return rows
+
+
+def _rollup_measures(name, table):
+    """Per-row measures of a raw table, ready to be summed into rollup ``name``."""
+    import numpy as np
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    ones = pa.array(np.ones(len(table), dtype=np.int64))
+    if name == "score_rollup":
+        scored = table.filter(pc.is_valid(table["overall_score"]))
+        scores = scored["overall_score"]
+        clipped = pc.min_element_wise(pc.max_element_wise(scores, 0.0), NUM_BUCKETS - 1.0)
+        bucket = pc.cast(pc.round(clipped), pa.int16())
+        return pa.table(
+            {column: scored[column] for column in DIMENSIONS}
+            | {"bucket": bucket, "count": ones[: len(scored)], "score_sum": scores}
+        )
+    if name == "area_rollup":
+        scored = table.filter(pc.is_valid(table["score"]))
+        return pa.table(
+            {column: scored[column] for column in DIMENSIONS}
+            | {"area": scored["area"], "count": ones[: len(scored)], "score_sum": scored["score"]}
+        )
+    asked = table.filter(pc.is_valid(table["question_text"]))
+    return pa.table(
+        {column: asked[column] for column in DIMENSIONS}
+        | {
+            "question_text": asked["question_text"],
+            "answers": ones[: len(asked)],
+            "value_count": pc.cast(pc.is_valid(asked["answer_value"]), pa.int64()),
+            "value_sum": pc.fill_null(asked["answer_value"], 0.0),
+        }
+    )
+
+
+def _sum_by(table, keys, measures):
+    grouped = table.group_by(keys).aggregate([(measure, "sum") for measure in measures])
+    summed = {f"{measure}_sum": measure for measure in measures}
+    return grouped.rename_columns([summed.get(name, name) for name in grouped.column_names])
+
+
+def _rollup(name, table):
+    _, keys, measures = ROLLUPS[name]
+    return _sum_by(table, DIMENSIONS + keys, measures).select(_schemas()[name].names).cast(_schemas()[name])
+
+
+class ResultsStore:
+    """
+    Buffered Parquet writer plus cached aggregate queries over everything
+    written so far. Filters are dicts such as ``{"industry": ["Retail"],
+    "month": ("2026-01", "2026-06")}``; list values match any of the given
+    values and a ``month`` pair is an inclusive range.
+    """
+
+    def __init__(self, path=RESULTS_PATH, flush_rows=FLUSH_ROWS, flush_seconds=FLUSH_SECONDS):
+        self.path = path
+        self.flush_rows = flush_rows
+        self.flush_seconds = flush_seconds
+        self._pending = {table: [] for table in TABLES}
+        self._pending_results = 0
+        self._condition = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._thread = None
+        self._query_lock = threading.Lock()
+        self._queries = OrderedDict()
+        self._datasets = {}
+
+    # -- writing ---------------------------------------------------------
+
+    def add(self, result, company_info, questions=(), answers=(), completed_at=None):
+        rows = result_rows(result, company_info, questions, answers, completed_at)
+        with self._condition:
+            for table in TABLES:
+                self._pending[table].extend(rows[table])
+            self._pending_results += 1
+            full = self._pending_results >= self.flush_rows
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="results-writer", daemon=True)
+                self._thread.start()
+                atexit.register(self.flush)
+            self._condition.notify()
+        if full:
+            self.flush()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._pending_results:
+                    self._condition.wait()
+            time.sleep(self.flush_seconds)
+            self.flush()
+
+    def flush(self):
+        import pyarrow as pa
+
+        with self._condition:
+            pending, self._pending = self._pending, {table: [] for table in TABLES}
+            self._pending_results = 0
+        if not any(pending.values()):
+            return
+        schemas = _schemas()
+        try:
+            self.write_tables(
+                {table: pa.Table.from_pylist(rows, schema=schemas[table]) for table, rows in pending.items()}
+            )
+        except Exception as e:
+            print(f"Error archiving results: {str(e)}")
+
+    def write_tables(self, tables, batch=None):
+        """Append Arrow tables of raw rows, keyed by table name, and their rollups."""
+        batch = batch or uuid.uuid4().hex
+        outputs = dict(tables)
+        for name, (source, _, _) in ROLLUPS.items():
+            if source in tables:
+                outputs[name] = _rollup(name, _rollup_measures(name, tables[source]))
+        with self._write_lock:
+            for name, table in outputs.items():
+                if len(table):
+                    self._write_partitioned(name, table, f"{batch}-{{i}}.parquet")
+        self.invalidate()
+
+    def _write_partitioned(self, name, table, basename_template):
+        import pyarrow.dataset as ds
+
+        ds.write_dataset(
+            table,
+            os.path.join(self.path, name),
+            format="parquet",
+            partitioning=_partitioning(),
+            basename_template=basename_template,
+            existing_data_behavior="overwrite_or_ignore",
+        )
+
+    def compact(self):
+        """Merge the files of each partition into one; returns the number of files removed."""
+        import pyarrow.parquet as pq
+
+        removed = 0
+        for name in TABLES + list(ROLLUPS):
+            root = os.path.join(self.path, name)
+            for directory, _, files in os.walk(root):
+                parts = sorted(part for part in files if part.endswith(".parquet"))
+                if len(parts) < 2:
+                    continue
+                paths = [os.path.join(directory, part) for part in parts]
+                merged = pq.ParquetDataset(paths, partitioning=None).read()
+                if name in ROLLUPS:
+                    _, keys, measures = ROLLUPS[name]
+                    partition_keys = [column for column in DIMENSIONS if column in merged.column_names]
+                    merged = _sum_by(merged, partition_keys + keys, measures)
+                target = os.path.join(directory, f"{uuid.uuid4().hex}-compacted.parquet")
+                # Write beside the inputs and rename, so a reader never sees half a file
+                pq.write_table(merged, target + ".tmp")
+                os.replace(target + ".tmp", target)
+                for path in paths:
+                    os.remove(path)
+                removed += len(paths) - 1
+        self.invalidate()
+        return removed
+
+    def clear(self):
+        with self._write_lock:
+            shutil.rmtree(self.path, ignore_errors=True)
+        self.invalidate()
+
+    # -- querying --------------------------------------------------------
+
+    def invalidate(self):
+        with self._query_lock:
+            self._queries.clear()
+            self._datasets.clear()
+
+    def _dataset(self, name):
+        import pyarrow.dataset as ds
+
+        with self._query_lock:
+            entry = self._datasets.get(name)
+            if entry is not None and time.time() - entry[0] < REFRESH_SECONDS:
+                return entry[1]
+        root = os.path.join(self.path, name)
+        if not os.path.isdir(root):
+            return None
+        dataset = ds.dataset(root, schema=_schemas()[name], format="parquet", partitioning=_partitioning())
+        with self._query_lock:
+            self._datasets[name] = (time.time(), dataset)
+        return dataset
+
+    def _scan(self, name, columns, filters):
+        try:
+            return self._scan_dataset(name, columns, filters)
+        except FileNotFoundError:
+            # Another process compacted the partition after the file list was cached
+            self.invalidate()
+            return self._scan_dataset(name, columns, filters)
+
+    def _scan_dataset(self, name, columns, filters):
+        import pyarrow.dataset as ds
+
+        dataset = self._dataset(name)
+        if dataset is None:
+            return _schemas()[name].empty_table().select(columns)
+        expression = None
+        for column, value in (filters or {}).items():
+            if column == "month" and isinstance(value, tuple):
+                start, end = value
+                condition = (ds.field("month") >= start) & (ds.field("month") <= end)
+            elif value:
+                condition = ds.field(column).isin(list(value))
+            else:
+                continue
+            expression = condition if expression is None else expression & condition
+        return dataset.to_table(columns=columns, filter=expression)
+
+    def _rollup_totals(self, name, keys, filters):
+        _, _, measures = ROLLUPS[name]
+        table = self._scan(name, keys + measures, filters)
+        return _sum_by(table, keys, measures).to_pandas()
+
+    def _cached(self, name, filters, compute, *args):
+        key = (name, _freeze_filters(filters), args)
+        with self._query_lock:
+            entry = self._queries.get(key)
+            if entry is not None and time.time() - entry[0] < REFRESH_SECONDS:
+                self._queries.move_to_end(key)
+                return entry[1]
+        value = compute(filters, *args)
+        with self._query_lock:
+            self._queries[key] = (time.time(), value)
+            while len(self._queries) > QUERY_CACHE_SIZE:
+                self._queries.popitem(last=False)
+        return value
+
+    def filter_options(self):
+        """Distinct values of each dimension, for building filter widgets."""
+        return self._cached("filter_options", None, self._filter_options)
+
+    def _filter_options(self, filters):
+        import pyarrow.compute as pc
+
+        table = self._scan("score_rollup", DIMENSIONS, None)
+        return {
+            column: sorted(value for value in pc.unique(table[column]).to_pylist() if value is not None)
+            for column in DIMENSIONS
+        }
+
+    def summary(self, filters=None):
+        return self._cached("summary", filters, self._summary)
+
+    def _summary(self, filters):
+        frame = self._rollup_totals("score_rollup", ["bucket"], filters)
+        return _histogram_summary(frame)
+
+    def score_by(self, dimension, filters=None):
+        """Count, mean and median overall score per value of ``dimension``."""
+        return self._cached("score_by", filters, self._score_by, dimension)
+
+    def _score_by(self, filters, dimension):
+        import pandas as pd
+
+        frame = self._rollup_totals("score_rollup", [dimension, "bucket"], filters)
+        rows = [
+            dict(_histogram_summary(group), **{dimension: value})
+            for value, group in frame.groupby(dimension, sort=True)
+        ]
+        return pd.DataFrame(rows, columns=[dimension, "count", "mean", "p10", "median", "p90"])
+
+    def score_distribution(self, filters=None, bin_width=5):
+        """Number of assessments per overall score bin of ``bin_width`` points."""
+        return self._cached("score_distribution", filters, self._score_distribution, bin_width)
+
+    def _score_distribution(self, filters, bin_width):
+        frame = self._rollup_totals("score_rollup", ["bucket"], filters)
+        frame["bin"] = frame["bucket"] // bin_width * bin_width
+        return frame.groupby("bin", as_index=False)["count"].sum().sort_values("bin").reset_index(drop=True)
+
+    def trend(self, filters=None, dimension=None):
+        """Monthly count and mean overall score, optionally split by ``dimension``."""
+        return self._cached("trend", filters, self._trend, dimension)
+
+    def _trend(self, filters, dimension):
+        keys = ["month"] + ([dimension] if dimension and dimension != "month" else [])
+        frame = self._rollup_totals("score_rollup", keys, filters)
+        frame["mean"] = frame["score_sum"] / frame["count"]
+        return frame[keys + ["count", "mean"]].sort_values(keys).reset_index(drop=True)
+
+    def area_scores(self, filters=None, dimension=None):
+        """Mean score per focus area, optionally split by ``dimension``."""
+        return self._cached("area_scores", filters, self._area_scores, dimension)
+
+    def _area_scores(self, filters, dimension):
+        keys = ["area"] + ([dimension] if dimension else [])
+        frame = self._rollup_totals("area_rollup", keys, filters)
+        frame["mean"] = frame["score_sum"] / frame["count"]
+        return frame[keys + ["count", "mean"]].sort_values(keys).reset_index(drop=True)
+
+    def question_stats(self, filters=None, limit=20):
+        """Most frequently asked questions with their mean answer on the 1-5 scale."""
+        return self._cached("question_stats", filters, self._question_stats, limit)
+
+    def _question_stats(self, filters, limit):
+        frame = self._rollup_totals("question_rollup", ["question_text"], filters)
+        frame["mean_answer"] = frame["value_sum"] / frame["value_count"].where(frame["value_count"] > 0)
+        frame = frame.sort_values("answers", ascending=False).head(limit)
+        return frame[["question_text", "answers", "mean_answer"]].reset_index(drop=True)
+
+    def stats(self):
+        files = {}
+        for name in TABLES + list(ROLLUPS):
+            root = os.path.join(self.path, name)
+            files[name] = sum(
+                part.endswith(".parquet") for _, _, parts in os.walk(root) for part in parts
+            )
+        return {"assessments": self.summary()["count"], "files": files}
+
+
+def _histogram_summary(frame):
+    counts = [0] * NUM_BUCKETS
+    for bucket, count in zip(frame["bucket"], frame["count"]):
+        counts[int(bucket)] += int(count)
+    total = sum(counts)
+    if not total:
+        return {"count": 0, "mean": None, "p10": None, "median": None, "p90": None}
+    return {
+        "count": total,
+        "mean": float(frame["score_sum"].sum()) / total,
+        "p10": histogram_quantile(counts, total, 0.1),
+        "median": histogram_quantile(counts, total, 0.5),
+        "p90": histogram_quantile(counts, total, 0.9),
+    }
+
+
+def _freeze_filters(filters):
+    if not filters:
+        return ()
+    return tuple(
+        sorted(
+            (column, ("any", tuple(sorted(value)))) if isinstance(value, (list, set)) else (column, value)
+            for column, value in filters.items()
+        )
+    )
+
+
+results_store = ResultsStore()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Maintain the columnar results archive.")
+    parser.add_argument("command", choices=["compact", "stats"])
+    parser.add_argument("--every", type=int, help="Keep running, compacting again every N seconds")
+    args = parser.parse_args(argv)
+    if not available():
+        print("pyarrow is not installed", file=sys.stderr)
+        return 1
+
+    while True:
+        if args.command == "compact":
+            started = time.perf_counter()
+            removed = results_store.compact()
+            print(f"Removed {removed} file(s) in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+        print(results_store.stats(), file=sys.stderr)
+        if not args.every or args.command != "compact":
+            return 0
+        time.sleep(args.every)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,165 @@
+import copy
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+from collections import OrderedDict
+from cache import make_cache_key
+from llm_scheduler import estimate_tokens
+from prompts import build_messages, count_tokens
+from openai_helper import build_score_prompt, generate_ai_readiness_score
+from telemetry import instrumented, note_cache_hit
+
+SCORE_CACHE_ENABLED = os.getenv("AI_READINESS_SCORE_CACHE", "").lower() in ("1", "true", "yes")
+SIMILARITY_THRESHOLD = float(os.getenv("AI_READINESS_SCORE_CACHE_THRESHOLD", "0.9"))
+SCORE_CACHE_MAX_ENTRIES = int(os.getenv("AI_READINESS_SCORE_CACHE_MAX_ENTRIES", "1000"))
+
+NUM_PERMUTATIONS = 64
+_MERSENNE_PRIME = (1 << 61) - 1
+_rng = random.Random(1234)  # Fixed seed so signatures are comparable across processes
+_PERMUTATIONS = [
+    (_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+    for _ in range(NUM_PERMUTATIONS)
+]
+
+
+def _hash64(text):
+    return int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def minhash(text):
+    words = re.findall(r"\w+", str(text).lower())
+    # Word bigrams capture phrasing; single words keep very short answers comparable
+    shingles = {" ".join(words[i : i + 2]) for i in range(max(len(words) - 1, 1))} if words else {""}
+    hashes = [_hash64(shingle) for shingle in shingles]
+    return tuple(
+        min((a * h + b) % _MERSENNE_PRIME for h in hashes) for a, b in _PERMUTATIONS
+    )
+
+
+def fingerprint(questions, answers):
+    """
+    One entry per question: the exact answer for scale and multiple-choice
+    questions, a MinHash signature for open-ended text.
+    """
+    values = list(answers.values()) if isinstance(answers, dict) else list(answers)
+    features = []
+    for question, answer in zip(questions, values):
+        if question.type in ("scale", "multiple-choice"):
+            features.append(("exact", str(answer)))
+        else:
+            features.append(("minhash", minhash(answer)))
+    return tuple(features)
+
+
+def similarity(a, b):
+    if len(a) != len(b) or not a:
+        return 0.0
+    total = 0.0
+    for (kind_a, value_a), (kind_b, value_b) in zip(a, b):
+        if kind_a != kind_b:
+            continue
+        if kind_a == "exact":
+            total += value_a == value_b
+        else:
+            total += sum(x == y for x, y in zip(value_a, value_b)) / NUM_PERMUTATIONS
+    return total / len(a)
+
+
+class ScoreCache:
+    """
+    Bounded LRU cache of readiness results that also matches near-duplicate
+    submissions from the same industry, company size and country that were
+    asked the same questions.
+    """
+
+    def __init__(self, threshold=SIMILARITY_THRESHOLD, max_entries=SCORE_CACHE_MAX_ENTRIES):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.lookups = 0
+        self.exact_hits = 0
+        self.near_hits = 0
+        self.tokens_saved = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _key(self, company_info, questions, features):
+        # Answers are fingerprinted by position, so they are only comparable for the same question set
+        question_set = hashlib.sha256(
+            json.dumps([question.question_text for question in questions]).encode("utf-8")
+        ).hexdigest()
+        partition = make_cache_key(
+            company_info.industry, company_info.size, company_info.country, question_set
+        )
+        exact = hashlib.sha256(json.dumps(features).encode("utf-8")).hexdigest()
+        return partition, exact
+
+    def lookup(self, company_info, questions, answers):
+        features = fingerprint(questions, answers)
+        partition, exact = self._key(company_info, questions, features)
+        with self._lock:
+            self.lookups += 1
+            entry = self._entries.get((partition, exact))
+            if entry is not None:
+                self.exact_hits += 1
+                best = entry
+            else:
+                best, best_similarity = None, self.threshold
+                for (entry_partition, _), candidate in self._entries.items():
+                    if entry_partition != partition:
+                        continue
+                    score = similarity(features, candidate["features"])
+                    if score >= best_similarity:
+                        best, best_similarity = candidate, score
+                if best is None:
+                    return None
+                self.near_hits += 1
+            self._entries.move_to_end(best["key"])
+            self.tokens_saved += best["tokens"]
+            return copy.deepcopy(best["result"])
+
+    def add(self, company_info, questions, answers, result, tokens):
+        features = fingerprint(questions, answers)
+        key = self._key(company_info, questions, features)
+        with self._lock:
+            self._entries[key] = {
+                "key": key,
+                "features": features,
+                "result": copy.deepcopy(result),
+                "tokens": tokens,
+            }
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            hits = self.exact_hits + self.near_hits
+            return {
+                "lookups": self.lookups,
+                "exact_hits": self.exact_hits,
+                "near_hits": self.near_hits,
+                "hit_rate": hits / self.lookups if self.lookups else 0.0,
+                "estimated_tokens_saved": self.tokens_saved,
+                "size": len(self._entries),
+            }
+
+
+score_cache = ScoreCache()
+
+
+@instrumented
+def score_with_cache(answers_text, company_info, questions, answers, **kwargs):
+    """generate_ai_readiness_score, reusing results for near-identical submissions."""
+    cached = score_cache.lookup(company_info, questions, answers)
+    if cached is not None:
+        note_cache_hit()
+        return cached
+
+    result = generate_ai_readiness_score(answers_text, company_info, **kwargs)
+    prompt = build_score_prompt(answers_text, company_info)
+    tokens = estimate_tokens(build_messages(prompt), 0) + count_tokens(json.dumps(result.to_dict()))
+    score_cache.add(company_info, questions, answers, result, tokens)
+    return result
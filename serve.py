@@ -0,0 +1,78 @@
+"""
+Run several Streamlit workers on one host that share caches, sessions and the
+OpenAI rate-limit budget.
+
+    python serve.py --workers 4                 # ports 8501-8504
+    python serve.py --workers 8 --base-port 9000
+
+Put a load balancer with sticky sessions (cookie or client-IP affinity) in
+front of the ports. Report downloads are generated into the in-memory media
+store of the worker that rendered the page, so a download request routed to
+any other worker gets a 404. Every worker runs from this directory, so the
+SQLite stores under .cache/ (question cache, question bank, sessions,
+benchmarks) are shared, and AI_READINESS_COORDINATION_PATH points them all at
+one token bucket. Session state is written through on every rerun, so when a
+worker restarts or is taken out of rotation, the reconnect to another worker
+resumes where the user left off.
+"""
+import argparse
+import os
+import signal
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_COORDINATION_PATH = os.path.join(".cache", "coordination.sqlite3")
+
+
+def start_workers(workers, base_port, extra_args=()):
+    env = dict(os.environ)
+    env.setdefault("AI_READINESS_COORDINATION_PATH", DEFAULT_COORDINATION_PATH)
+    processes = []
+    for i in range(workers):
+        port = base_port + i
+        command = [
+            sys.executable, "-m", "streamlit", "run", "main.py",
+            "--server.port", str(port),
+            "--server.headless", "true",
+            *extra_args,
+        ]
+        processes.append(subprocess.Popen(command, cwd=ROOT, env=env))
+        print(f"Worker {i} on http://localhost:{port}", file=sys.stderr)
+    return processes
+
+
+def stop_workers(processes, grace=10):
+    for process in processes:
+        if process.poll() is None:
+            process.send_signal(signal.SIGTERM)
+    deadline = time.monotonic() + grace
+    for process in processes:
+        try:
+            process.wait(max(deadline - time.monotonic(), 0))
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run N app workers sharing one coordination store.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--base-port", type=int, default=8501)
+    args, extra_args = parser.parse_known_args(argv)
+
+    processes = start_workers(args.workers, args.base_port, extra_args)
+    try:
+        # Exit as soon as any worker dies so a supervisor can restart the set
+        while all(process.poll() is None for process in processes):
+            time.sleep(1)
+        print("A worker exited; stopping the rest", file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        return 0
+    finally:
+        stop_workers(processes)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
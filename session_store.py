@@ -0,0 +1,209 @@
+import atexit
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+import zlib
+from models import CompanyInfo, ReadinessResult, decode_questions, encode_questions
+import sqlite_util
+
+SESSION_STORE_PATH = os.getenv("AI_READINESS_SESSION_PATH", ".cache/sessions.sqlite3")
+SESSION_TTL_SECONDS = int(os.getenv("AI_READINESS_SESSION_TTL", str(7 * 24 * 3600)))
+# Slider moves within this window are coalesced into a single write. With several
+# workers, a reconnect after a worker restart or failover can land on any of them, so write through
+FLUSH_INTERVAL_SECONDS = float(
+    os.getenv(
+        "AI_READINESS_SESSION_FLUSH_INTERVAL",
+        "0" if os.getenv("AI_READINESS_COORDINATION_PATH") else "2",
+    )
+)
+
+# Session state worth keeping across restarts: everything we paid a completion for
+PERSISTED_KEYS = [
+    "company_info",
+    "questions",
+    "answers",
+    "assessment_submitted",
+    "ai_readiness_result",
+    "recommendations",
+]
+DIGESTS_KEY = "_persisted_digests"
+# (to JSON, from JSON) for persisted keys that hold typed records
+CODECS = {
+    "company_info": (CompanyInfo.to_dict, CompanyInfo.from_dict),
+    "questions": (encode_questions, decode_questions),
+    "ai_readiness_result": (ReadinessResult.to_dict, ReadinessResult.from_dict),
+}
+
+
+def encode(value, key=None):
+    if key in CODECS:
+        value = CODECS[key][0](value)
+    return json.dumps(value, separators=(",", ":")).encode("utf-8")
+
+
+def serialize(value):
+    return zlib.compress(encode(value))
+
+
+def deserialize(blob):
+    return json.loads(zlib.decompress(blob).decode("utf-8"))
+
+
+def new_session_token():
+    return uuid.uuid4().hex
+
+
+class SessionStore:
+    """Key-value interface every session backend implements."""
+
+    def load(self, token):
+        """Return all stored keys for a session as a dict (empty if unknown)."""
+        raise NotImplementedError
+
+    def write_many(self, items):
+        """Apply ``{(token, key): blob or None}``; None deletes the key."""
+        raise NotImplementedError
+
+    def delete(self, token):
+        raise NotImplementedError
+
+
+class SQLiteSessionStore(SessionStore):
+    def __init__(self, path=SESSION_STORE_PATH, ttl=SESSION_TTL_SECONDS):
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _connect(self):
+        if self._conn is None:
+            self._conn = sqlite_util.connect(
+                self.path,
+                """CREATE TABLE IF NOT EXISTS session_values (
+                    token TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    value BLOB NOT NULL,
+                    updated_at REAL NOT NULL,
+                    PRIMARY KEY (token, key)
+                )""",
+            )
+        return self._conn
+
+    def load(self, token):
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT key, value FROM session_values WHERE token = ? AND updated_at > ?",
+                (token, time.time() - self.ttl),
+            ).fetchall()
+        return {key: deserialize(value) for key, value in rows}
+
+    def write_many(self, items):
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            for (token, key), blob in items.items():
+                if blob is None:
+                    conn.execute(
+                        "DELETE FROM session_values WHERE token = ? AND key = ?", (token, key)
+                    )
+                else:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO session_values (token, key, value, updated_at) "
+                        "VALUES (?, ?, ?, ?)",
+                        (token, key, blob, now),
+                    )
+            conn.execute("DELETE FROM session_values WHERE updated_at <= ?", (now - self.ttl,))
+            conn.commit()
+
+    def delete(self, token):
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM session_values WHERE token = ?", (token,))
+            conn.commit()
+
+
+class DebouncedWriter:
+    """
+    Buffers writes in memory and flushes them to the backend in one batch on a
+    background thread, keeping only the latest value per key.
+    """
+
+    def __init__(self, store, interval=FLUSH_INTERVAL_SECONDS):
+        self.store = store
+        self.interval = interval
+        self._pending = {}
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="session-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.flush)
+
+    def write(self, token, key, blob):
+        with self._condition:
+            self._pending[(token, key)] = blob
+            self._condition.notify()
+
+    def flush(self):
+        with self._condition:
+            pending, self._pending = self._pending, {}
+        if pending:
+            try:
+                self.store.write_many(pending)
+            except Exception as e:
+                print(f"Error persisting session state: {str(e)}")
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._pending:
+                    self._condition.wait()
+            time.sleep(self.interval)
+            self.flush()
+
+
+session_store = SQLiteSessionStore()
+session_writer = DebouncedWriter(session_store)
+
+
+def restore_session(session_state, token):
+    """Load a persisted session into ``session_state`` unless it is already populated."""
+    if DIGESTS_KEY in session_state:
+        return
+    # Pending writes for this token must land before we read it back
+    session_writer.flush()
+    digests = {}
+    for key, value in session_store.load(token).items():
+        if key not in PERSISTED_KEYS:
+            continue
+        if key in CODECS:
+            try:
+                value = CODECS[key][1](value)
+            except (TypeError, ValueError) as e:
+                print(f"Discarding unreadable persisted {key}: {str(e)}")
+                continue
+        session_state[key] = value
+        digests[key] = hashlib.sha1(encode(value, key)).hexdigest()
+        if key == "answers":
+            # Seed the answer widgets so they show the restored values
+            for widget_key, answer in value.items():
+                if widget_key not in session_state:
+                    session_state[widget_key] = answer
+    session_state[DIGESTS_KEY] = digests
+
+
+def checkpoint_session(session_state, token):
+    """Queue writes for persisted keys that changed since the last checkpoint."""
+    digests = session_state.get(DIGESTS_KEY, {})
+    for key in PERSISTED_KEYS:
+        if key in session_state:
+            encoded = encode(session_state[key], key)
+            digest = hashlib.sha1(encoded).hexdigest()
+            if digests.get(key) != digest:
+                digests[key] = digest
+                session_writer.write(token, key, zlib.compress(encoded))
+        elif key in digests:
+            del digests[key]
+            session_writer.write(token, key, None)
+    session_state[DIGESTS_KEY] = digests
@@ -0,0 +1,199 @@
+"""
+Coalescing of identical in-flight LLM requests.
+
+When many sessions ask for the same completion at the same moment, e.g. a
+cohort from one company starting together, only the first caller (the leader)
+goes upstream. Everyone else waits for that call and receives its result or
+its exception. Streamed completions are drained by a background pump into a
+shared buffer, so each caller replays the same chunks from the start and can
+stop reading without affecting the others; the upstream stream is closed only
+when the last reader stops early.
+"""
+import contextvars
+import hashlib
+import json
+import threading
+
+
+def flight_key(*parts):
+    """Stable hash of a request's model, messages and parameters."""
+    payload = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class _Call:
+    __slots__ = ("done", "result", "error", "tag")
+
+    def __init__(self, tag=None):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.tag = tag
+
+
+class SharedStream:
+    """
+    Buffers an upstream chunk iterator so several readers can consume it
+    independently. Once every reader has closed early the upstream stream is
+    closed too, so an abandoned completion stops instead of running to the end.
+    """
+
+    def __init__(self, upstream, on_finish=None):
+        self._chunks = []
+        self._finished = False
+        self._error = None
+        self._readers = 0
+        self._abandoned = False
+        self._condition = threading.Condition()
+        self._on_finish = on_finish
+        # Run in the leader's context, so e.g. retries made while pumping reach its telemetry record
+        threading.Thread(
+            target=contextvars.copy_context().run,
+            args=(self._pump, upstream),
+            name="single-flight-stream",
+            daemon=True,
+        ).start()
+
+    def _pump(self, upstream):
+        try:
+            for chunk in upstream:
+                with self._condition:
+                    if self._abandoned:
+                        break
+                    self._chunks.append(chunk)
+                    self._condition.notify_all()
+        except BaseException as e:
+            self._error = e
+        finally:
+            with self._condition:
+                self._finished = True
+                self._condition.notify_all()
+            if self._abandoned:
+                close = getattr(upstream, "close", None)
+                if close is not None:
+                    close()
+            if self._on_finish:
+                self._on_finish()
+
+    def reader(self):
+        """A new reader from the first chunk, or None if the stream was already abandoned."""
+        with self._condition:
+            if self._abandoned:
+                return None
+            self._readers += 1
+        return self._read()
+
+    def _read(self):
+        index = 0
+        try:
+            while True:
+                with self._condition:
+                    while index >= len(self._chunks) and not self._finished:
+                        self._condition.wait()
+                    if index < len(self._chunks):
+                        chunk = self._chunks[index]
+                    elif self._error is not None:
+                        raise self._error
+                    else:
+                        return
+                index += 1
+                yield chunk
+        finally:
+            with self._condition:
+                self._readers -= 1
+                if self._readers == 0 and not self._finished:
+                    self._abandoned = True
+
+
+class SingleFlight:
+    def __init__(self):
+        self.leaders = 0
+        self.coalesced = 0
+        self.errors = 0
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def _join(self, key, tag, on_join):
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call(tag)
+                self.leaders += 1
+                return call, True
+            self.coalesced += 1
+        if on_join is not None:
+            on_join(call.tag)
+        return call, False
+
+    def _forget(self, key):
+        with self._lock:
+            self._calls.pop(key, None)
+
+    def do(self, key, fn, tag=None, on_join=None):
+        """
+        Run ``fn`` unless an identical call is already in flight, in which case
+        wait for it. Returns ``(result, shared)``; ``shared`` is True for callers
+        that did not make the upstream call themselves. A leader's ``tag`` is
+        passed to the ``on_join`` of every caller that joins it, e.g. so an
+        interactive caller can raise the priority of a background leader.
+        """
+        call, leader = self._join(key, tag, on_join)
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            with self._lock:
+                self.errors += 1
+            raise
+        finally:
+            self._forget(key)
+            call.done.set()
+        return call.result, False
+
+    def do_stream(self, key, fn, tag=None, on_join=None):
+        """
+        Like ``do`` for a call returning a chunk iterator. Every caller gets its
+        own reader over one shared upstream stream, which stays joinable until
+        it has been fully received or abandoned by all of its readers.
+        """
+        call, leader = self._join(key, tag, on_join)
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            reader = call.result.reader()
+            if reader is not None:
+                return reader, True
+            # Every earlier reader closed it before the end, so it is being stopped
+            with self._lock:
+                self.coalesced -= 1
+            return fn(), False
+
+        try:
+            call.result = SharedStream(fn(), on_finish=lambda: self._forget(key))
+        except BaseException as e:
+            call.error = e
+            with self._lock:
+                self.errors += 1
+            self._forget(key)
+            raise
+        finally:
+            call.done.set()
+        return call.result.reader(), False
+
+    def stats(self):
+        with self._lock:
+            requests = self.leaders + self.coalesced
+            return {
+                "leaders": self.leaders,
+                "coalesced": self.coalesced,
+                "errors": self.errors,
+                "in_flight": len(self._calls),
+                "coalesced_rate": self.coalesced / requests if requests else 0.0,
+            }
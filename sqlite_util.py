@@ -0,0 +1,19 @@
+import os
+import sqlite3
+
+
+def connect(path, schema, **kwargs):
+    """
+    Open the SQLite database at ``path`` in WAL mode, creating its directory
+    and running ``schema`` (``CREATE ... IF NOT EXISTS`` statements) first.
+
+    The connection may be shared between threads; callers serialize access
+    with their own lock. Extra keyword arguments go to ``sqlite3.connect``.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    conn = sqlite3.connect(path, check_same_thread=False, **kwargs)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(schema)
+    return conn
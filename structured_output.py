@@ -0,0 +1,188 @@
+import json
+from telemetry import logger, note_parse_failure
+
+QUESTION_TYPES = ["scale", "multiple-choice", "open-ended"]
+IMPACT_LEVELS = ["high", "medium", "low"]
+
+# Declared shape of a question, used for both the OpenAI response schema and
+# validation of whatever actually comes back.
+QUESTION_FIELDS = {
+    "question_text": {"aliases": ["question"], "required": True},
+    "explanation": {"aliases": ["importance"], "default": ""},
+    "type": {"choices": QUESTION_TYPES, "default": "open-ended"},
+    "impact_level": {"choices": IMPACT_LEVELS, "default": ""},
+    "options": {"list": True, "default": []},
+}
+
+QUESTIONS_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "ai_readiness_questions",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "questions": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "question_text": {"type": "string"},
+                            "explanation": {"type": "string"},
+                            "type": {"type": "string", "enum": QUESTION_TYPES},
+                            "impact_level": {"type": "string", "enum": IMPACT_LEVELS},
+                            "options": {"type": "array", "items": {"type": "string"}},
+                        },
+                        "required": list(QUESTION_FIELDS),
+                        "additionalProperties": False,
+                    },
+                }
+            },
+            "required": ["questions"],
+            "additionalProperties": False,
+        },
+    },
+}
+
+JSON_OBJECT_RESPONSE_FORMAT = {"type": "json_object"}
+
+
+def normalize_question(q):
+    """
+    Validate a single question against QUESTION_FIELDS, returning the
+    normalized dict or None if it cannot be used.
+    """
+    if not isinstance(q, dict):
+        return None
+
+    normalized_q = {}
+    for field, spec in QUESTION_FIELDS.items():
+        value = q.get(field)
+        for alias in spec.get("aliases", []):
+            if value is None:
+                value = q.get(alias)
+
+        if spec.get("list"):
+            value = [str(item) for item in value] if isinstance(value, list) else spec["default"]
+        elif value is None or value == "":
+            if spec.get("required"):
+                return None  # Skip questions without text
+            value = spec["default"]
+        else:
+            value = str(value)
+            if "choices" in spec:
+                value = value.lower()
+                if value not in spec["choices"]:
+                    value = spec["default"]
+        normalized_q[field] = value
+
+    if normalized_q["type"] != "multiple-choice":
+        normalized_q["options"] = []
+    return normalized_q
+
+
+def questions_payload(data):
+    # Accept either {"questions": [...]} or a bare list
+    if isinstance(data, dict) and "questions" in data:
+        data = data["questions"]
+    if not isinstance(data, list):
+        raise ValueError("Unexpected JSON structure")
+    return data
+
+
+def normalize_result_key(key):
+    # The prompt asks for 'recommendations for future'; the page reads snake_case keys
+    return str(key).strip().lower().replace(" ", "_")
+
+
+def validate_readiness_result(data):
+    if not isinstance(data, dict):
+        raise ValueError("Unexpected JSON structure")
+
+    result = {normalize_result_key(key): value for key, value in data.items()}
+    for key in ["overall_score", "projected_score"]:
+        if key in result:
+            result[key] = _to_number(result[key])
+    if isinstance(result.get("area_scores"), dict):
+        result["area_scores"] = {
+            area: _to_number(score) for area, score in result["area_scores"].items()
+        }
+    return result
+
+
+def validate_recommendations(data):
+    if isinstance(data, dict) and "recommendations" in data:
+        data = data["recommendations"]
+    if not isinstance(data, (list, dict)):
+        raise ValueError("Unexpected JSON structure")
+    return data
+
+
+def _to_number(value):
+    if isinstance(value, (int, float)):
+        return value
+    try:
+        number = float(str(value).split("/")[0].strip().rstrip("%"))
+    except ValueError:
+        return value
+    return int(number) if number.is_integer() else number
+
+
+def parse_json_response(content):
+    # Remove any markdown formatting if present
+    content = content.replace("```json", "").replace("```", "").strip()
+    try:
+        return json.loads(content)
+    except json.JSONDecodeError as json_error:
+        note_parse_failure()
+        repaired = repair_json(content)
+        if repaired is None:
+            raise ValueError(f"Invalid JSON response from OpenAI: {str(json_error)}")
+        logger.warning("Repaired malformed JSON response: %s", json_error)
+        return repaired
+
+
+def repair_json(content, max_attempts=50):
+    """
+    Recover the longest valid prefix of a truncated or malformed JSON document
+    by cutting it after a completed value and closing any open brackets.
+    """
+    start = min(
+        (index for index in (content.find("{"), content.find("[")) if index != -1),
+        default=-1,
+    )
+    if start == -1:
+        return None
+
+    stack = []
+    in_string = False
+    escaped = False
+    cut_points = []
+    for i in range(start, len(content)):
+        char = content[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+            continue
+        if char == '"':
+            in_string = True
+        elif char in "{[":
+            stack.append("}" if char == "{" else "]")
+        elif char in "}]":
+            if not stack:
+                break
+            stack.pop()
+            cut_points.append((i + 1, "".join(reversed(stack))))
+            if not stack:
+                break
+
+    for end, closers in reversed(cut_points[-max_attempts:]):
+        try:
+            return json.loads(content[start:end] + closers)
+        except json.JSONDecodeError:
+            continue
+    return None
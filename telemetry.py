@@ -0,0 +1,301 @@
+"""
+Per-call instrumentation for the OpenAI helpers.
+
+Every ``generate_*`` call is wrapped in ``track_call``, which records tokens,
+wall time, retries, cache hits, stale-cache fallbacks, parse failures and
+whether the completion was shared with an identical in-flight request, and
+prices the tokens with ``MODEL_PRICES``. Calls are aggregated into
+Prometheus-style counters and histograms (``render_prometheus``, optionally
+served on ``AI_READINESS_METRICS_PORT``) and, if ``AI_READINESS_TRACE_PATH`` is
+set, appended to a JSONL trace. Raw responses are logged for only a sample of
+calls instead of being printed every time.
+
+Log records go to the ``ai_readiness.llm`` logger. Unless the host application
+has already given it a handler, it writes to stderr at ``AI_READINESS_LOG_LEVEL``
+(INFO by default, so the sampled responses are not dropped).
+"""
+import contextvars
+import inspect
+import json
+import logging
+import os
+import random
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+TRACE_PATH = os.getenv("AI_READINESS_TRACE_PATH")
+LOG_SAMPLE_RATE = float(os.getenv("AI_READINESS_LOG_SAMPLE_RATE", "0.01"))
+LOG_PREVIEW_CHARS = 500
+METRICS_PORT = os.getenv("AI_READINESS_METRICS_PORT")
+LATENCY_BUCKETS = [0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 40, 80]
+LOG_LEVEL = os.getenv("AI_READINESS_LOG_LEVEL", "INFO").upper()
+# USD per million (input, output) tokens; dated snapshots such as gpt-4o-mini-2024-07-18
+# match by prefix. Update alongside the provider's price list.
+MODEL_PRICES = {
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1": (2.00, 8.00),
+}
+
+logger = logging.getLogger("ai_readiness.llm")
+if not logger.handlers:
+    # Nothing else in the app configures logging, and the root logger's default
+    # WARNING threshold would drop the INFO records
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    logger.addHandler(_handler)
+    logger.setLevel(LOG_LEVEL)
+    logger.propagate = False
+
+_current_call = contextvars.ContextVar("current_llm_call", default=None)
+_lock = threading.Lock()
+_counters = defaultdict(float)
+_histogram_buckets = defaultdict(lambda: [0] * len(LATENCY_BUCKETS))
+_histogram_sums = defaultdict(float)
+_histogram_counts = defaultdict(int)
+
+
+class CallRecord:
+    __slots__ = (
+        "function", "model", "prompt_tokens", "completion_tokens", "started_at",
+        "duration", "retries", "cache_hit", "stale_cache", "coalesced", "parse_failures", "outcome",
+        "cost_usd",
+    )
+
+    def __init__(self, function):
+        self.function = function
+        self.model = None
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.started_at = time.time()
+        self.duration = 0.0
+        self.retries = 0
+        self.cache_hit = False
+        self.stale_cache = False
+        self.coalesced = False
+        self.parse_failures = 0
+        self.outcome = "ok"
+        self.cost_usd = 0.0
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+@contextmanager
+def track_call(function):
+    record = CallRecord(function)
+    token = _current_call.set(record)
+    started = time.perf_counter()
+    try:
+        yield record
+    except GeneratorExit:
+        record.outcome = "cancelled"  # A streaming consumer stopped early
+        raise
+    except BaseException:
+        record.outcome = "error"
+        raise
+    finally:
+        record.duration = time.perf_counter() - started
+        _current_call.reset(token)
+        _finish(record)
+
+
+def instrumented(function):
+    """Decorator form of ``track_call`` for plain and generator functions."""
+    name = function.__name__
+
+    if inspect.isgeneratorfunction(function):
+        @wraps(function)
+        def generator_wrapper(*args, **kwargs):
+            with track_call(name):
+                yield from function(*args, **kwargs)
+
+        return generator_wrapper
+
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        with track_call(name):
+            return function(*args, **kwargs)
+
+    return wrapper
+
+
+def current_call():
+    return _current_call.get()
+
+
+def note_usage(usage, model=None):
+    record = _current_call.get()
+    if record is None:
+        return
+    if usage is not None:
+        record.prompt_tokens += getattr(usage, "prompt_tokens", 0) or 0
+        record.completion_tokens += getattr(usage, "completion_tokens", 0) or 0
+    if model:
+        record.model = model
+
+
+def note_retry():
+    record = _current_call.get()
+    if record is not None:
+        record.retries += 1
+
+
+def note_cache_hit():
+    record = _current_call.get()
+    if record is not None:
+        record.cache_hit = True
+
+
+def note_stale_cache():
+    record = _current_call.get()
+    if record is not None:
+        record.stale_cache = True
+
+
+def note_coalesced():
+    record = _current_call.get()
+    if record is not None:
+        record.coalesced = True
+
+
+def note_parse_failure():
+    record = _current_call.get()
+    if record is not None:
+        record.parse_failures += 1
+
+
+def log_response(function, content):
+    """Log a truncated raw response for a sample of calls."""
+    if not logger.isEnabledFor(logging.DEBUG) and random.random() >= LOG_SAMPLE_RATE:
+        return
+    logger.info(
+        "llm_response %s",
+        json.dumps(
+            {
+                "function": function,
+                "chars": len(content),
+                "preview": content[:LOG_PREVIEW_CHARS],
+            }
+        ),
+    )
+
+
+def model_price(model):
+    """(input, output) USD per million tokens, or None for an unknown model."""
+    if not model:
+        return None
+    # Longest prefix first, so gpt-4o-mini is not priced as gpt-4o
+    for name in sorted(MODEL_PRICES, key=len, reverse=True):
+        if model.startswith(name):
+            return MODEL_PRICES[name]
+    return None
+
+
+def call_cost(model, prompt_tokens, completion_tokens):
+    price = model_price(model)
+    if price is None:
+        return 0.0
+    return (prompt_tokens * price[0] + completion_tokens * price[1]) / 1_000_000
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of ``values`` for latency reports; 0.0 when empty."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def _finish(record):
+    labels = (("function", record.function),)
+    record.cost_usd = call_cost(record.model, record.prompt_tokens, record.completion_tokens)
+    with _lock:
+        _counters[("llm_calls_total", labels + (("outcome", record.outcome),))] += 1
+        _counters[("llm_prompt_tokens_total", labels)] += record.prompt_tokens
+        _counters[("llm_completion_tokens_total", labels)] += record.completion_tokens
+        _counters[("llm_cost_usd_total", labels)] += record.cost_usd
+        _counters[("llm_retries_total", labels)] += record.retries
+        _counters[("llm_cache_hits_total", labels)] += record.cache_hit
+        _counters[("llm_cache_stale_total", labels)] += record.stale_cache
+        _counters[("llm_coalesced_total", labels)] += record.coalesced
+        _counters[("llm_parse_failures_total", labels)] += record.parse_failures
+        buckets = _histogram_buckets[labels]
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if record.duration <= bound:
+                buckets[i] += 1
+        _histogram_sums[labels] += record.duration
+        _histogram_counts[labels] += 1
+
+    if TRACE_PATH:
+        line = json.dumps(record.to_dict(), separators=(",", ":"))
+        with _lock, open(TRACE_PATH, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+
+def _format_labels(labels):
+    return "{" + ",".join(f'{key}="{value}"' for key, value in labels) + "}"
+
+
+def render_prometheus():
+    lines = []
+    with _lock:
+        seen = set()
+        for (name, labels), value in sorted(_counters.items()):
+            if name not in seen:
+                lines.append(f"# TYPE {name} counter")
+                seen.add(name)
+            lines.append(f"{name}{_format_labels(labels)} {value:g}")
+
+        lines.append("# TYPE llm_call_duration_seconds histogram")
+        for labels in sorted(_histogram_counts):
+            for bound, count in zip(LATENCY_BUCKETS, _histogram_buckets[labels]):
+                bucket_labels = labels + (("le", f"{bound:g}"),)
+                lines.append(f"llm_call_duration_seconds_bucket{_format_labels(bucket_labels)} {count}")
+            inf_labels = labels + (("le", "+Inf"),)
+            lines.append(
+                f"llm_call_duration_seconds_bucket{_format_labels(inf_labels)} {_histogram_counts[labels]}"
+            )
+            lines.append(f"llm_call_duration_seconds_sum{_format_labels(labels)} {_histogram_sums[labels]:g}")
+            lines.append(f"llm_call_duration_seconds_count{_format_labels(labels)} {_histogram_counts[labels]}")
+    return "\n".join(lines) + "\n"
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+_metrics_server = None
+
+
+def start_metrics_server(port):
+    global _metrics_server
+    with _lock:
+        if _metrics_server is None:
+            _metrics_server = ThreadingHTTPServer(("0.0.0.0", int(port)), _MetricsHandler)
+            threading.Thread(
+                target=_metrics_server.serve_forever, name="metrics-server", daemon=True
+            ).start()
+    return _metrics_server
+
+
+if METRICS_PORT:
+    try:
+        start_metrics_server(METRICS_PORT)
+    except OSError as e:
+        # Another worker on this host already serves the port
+        print(f"Metrics server not started: {str(e)}")
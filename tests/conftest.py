@@ -0,0 +1,142 @@
+import json
+import queue
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+
+class StubChatServer(ThreadingHTTPServer):
+    """
+    A local stand-in for the chat completions endpoint. Each request takes the
+    next scripted response from ``responses`` (or ``default`` when none are
+    queued): ``{"status": 500}`` fails the request, ``{"content": "..."}``
+    answers it, plus ``"fail_after": n`` to drop a stream after n chunks,
+    ``"hold": Event`` to stall a stream after its first chunk until the event is
+    set and ``"delay": seconds`` to stall before responding at all.
+    """
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), StubChatHandler)
+        self.responses = queue.Queue()
+        self.default = {"content": "Hello from the stub server"}
+        self.requests = []
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/v1"
+
+    def next_response(self, body):
+        self.requests.append(body)
+        try:
+            return self.responses.get_nowait()
+        except queue.Empty:
+            return self.default
+
+    def client(self):
+        from openai import OpenAI
+
+        return OpenAI(base_url=self.url, api_key="test", max_retries=0)
+
+
+class StubChatHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        response = self.server.next_response(body)
+        if "delay" in response:
+            time.sleep(response["delay"])
+        if "status" in response:
+            self.send_json(response["status"], {"error": {"message": "stub failure", "type": "server_error"}})
+        elif body.get("stream"):
+            self.send_stream(body["model"], response)
+        else:
+            self.send_json(200, completion(body["model"], response["content"]))
+
+    def send_json(self, status, payload):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def send_stream(self, model, response):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        content = response["content"]
+        pieces = [content[i : i + 5] for i in range(0, len(content), 5)]
+        events = [chunk(model, {"role": "assistant", "content": ""})]
+        events += [chunk(model, {"content": piece}) for piece in pieces]
+        events.append(chunk(model, {}, finish_reason="stop"))
+        for index, event in enumerate(events):
+            if index == response.get("fail_after"):
+                # Drop the connection in the middle of the chunked body
+                self.wfile.write(b"100\r\ndata: {")
+                self.wfile.flush()
+                self.close_connection = True
+                return
+            self.write_chunk(f"data: {json.dumps(event)}\n\n")
+            if index == 1 and "hold" in response:
+                response["hold"].wait(5)
+        self.write_chunk("data: [DONE]\n\n")
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+
+    def write_chunk(self, text):
+        data = text.encode("utf-8")
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        self.wfile.flush()
+
+
+def completion(model, content):
+    return {
+        "id": "chatcmpl-stub",
+        "object": "chat.completion",
+        "created": 0,
+        "model": model,
+        "choices": [
+            {"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}
+        ],
+        "usage": {"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15},
+    }
+
+
+def chunk(model, delta, finish_reason=None):
+    return {
+        "id": "chatcmpl-stub",
+        "object": "chat.completion.chunk",
+        "created": 0,
+        "model": model,
+        "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+    }
+
+
+@pytest.fixture
+def stub_server():
+    server = StubChatServer()
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def stub_helper(stub_server, monkeypatch):
+    """Route openai_helper through the stub server and a private scheduler, which is returned."""
+    import openai_helper
+    from llm_backends import OpenAIBackend
+    from llm_scheduler import RequestScheduler
+
+    scheduler = RequestScheduler(requests_per_minute=10_000, tokens_per_minute=10_000_000, max_concurrency=1)
+    monkeypatch.setattr(openai_helper, "scheduler", scheduler)
+    monkeypatch.setattr(openai_helper, "llm_backend", OpenAIBackend(stub_server.client))
+    return scheduler
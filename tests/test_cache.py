@@ -0,0 +1,56 @@
+import time
+
+import pytest
+
+import openai_helper
+from cache import ResponseCache
+from models import Question, encode_questions
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResponseCache(str(tmp_path / "cache.sqlite3"), ttl=60)
+
+
+def expire(cache, key):
+    cache._connect().execute("UPDATE responses SET created_at = ? WHERE key = ?", (time.time() - 120, key))
+
+
+def test_hits_and_misses(cache):
+    assert cache.get("key") is None
+    cache.set("key", {"value": 1})
+    assert cache.get("key") == {"value": 1}
+    assert cache.stats() == {"hits": 1, "misses": 1, "stale": 0, "hit_rate": 0.5, "size": 1}
+
+
+def test_stale_fallback_is_counted_once(cache):
+    cache.set("key", {"value": 1})
+    expire(cache, "key")
+    assert cache.get("key") is None
+    assert cache.get("key", allow_stale=True) == {"value": 1}
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["stale"]) == (0, 1, 1)
+
+
+def test_missing_fallback_is_not_a_second_miss(cache):
+    assert cache.get("key") is None
+    assert cache.get("key", allow_stale=True) is None
+    assert cache.stats()["misses"] == 1
+
+
+def test_generate_questions_counts_stale_fallback_once(cache, monkeypatch):
+    monkeypatch.setattr(openai_helper, "question_cache", cache)
+    question = Question("How mature is your data platform?", "", "scale", "high")
+    key = openai_helper.questions_cache_key("Retail", "Small", "Germany")
+    cache.set(key, encode_questions([question]))
+    expire(cache, key)
+
+    def unavailable(*args, **kwargs):
+        raise RuntimeError("upstream unavailable")
+
+    monkeypatch.setattr(openai_helper, "_generate_questions_uncached", unavailable)
+    assert openai_helper.generate_questions("Retail", "Small", "Germany") == [question]
+    monkeypatch.setattr(openai_helper, "create_completion", unavailable)
+    assert list(openai_helper.generate_questions_stream("Retail", "Small", "Germany")) == [question]
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["stale"]) == (0, 2, 2)
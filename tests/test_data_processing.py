@@ -0,0 +1,100 @@
+import math
+
+import numpy as np
+import pytest
+
+from data_processing import (
+    CATEGORIES,
+    IMPACT_WEIGHTS,
+    answer_to_number,
+    calculate_scores,
+    default_question_categories,
+    score_cohort,
+)
+from models import Question
+
+NAN = float("nan")
+IMPACTS = ["high", "low", "medium", "HIGH", "unknown"] * 3
+
+
+def weighted_mean(pairs):
+    pairs = [(value, weight) for value, weight in pairs if not math.isnan(value)]
+    if not pairs:
+        return NAN
+    return sum(value * weight for value, weight in pairs) / sum(weight for _, weight in pairs)
+
+
+def scalar_scores(answers, categories, impacts):
+    # One assessment at a time, the way the scores are described to users
+    weights = [IMPACT_WEIGHTS.get(level.lower(), 2.0) for level in impacts]
+    overall = weighted_mean(zip(answers, weights))
+    per_category = [
+        weighted_mean((answer, weight) for answer, weight, cat in zip(answers, weights, categories) if cat == c)
+        for c in range(len(CATEGORIES))
+    ]
+    return overall, per_category
+
+
+def test_default_categories_split_questions_into_equal_blocks():
+    assert default_question_categories(15).tolist() == [0, 0, 0, 1, 1, 1, 2, 2, 2, 3, 3, 3, 4, 4, 4]
+    assert default_question_categories(5).tolist() == [0, 1, 2, 3, 4]
+
+
+@pytest.mark.parametrize("custom_categories", [False, True], ids=["default", "custom"])
+def test_score_cohort_matches_scalar_path(custom_categories):
+    rng = np.random.default_rng(7)
+    matrix = rng.integers(1, 6, size=(20, 15)).astype(float)
+    matrix[rng.random(matrix.shape) < 0.2] = NAN
+    categories = rng.integers(0, len(CATEGORIES), 15) if custom_categories else default_question_categories(15)
+
+    overall, per_category = score_cohort(matrix, categories, IMPACTS)
+
+    for row, answers in enumerate(matrix.tolist()):
+        expected_overall, expected_categories = scalar_scores(answers, categories.tolist(), IMPACTS)
+        assert overall[row] == pytest.approx(expected_overall, nan_ok=True)
+        assert per_category[row].tolist() == pytest.approx(expected_categories, nan_ok=True)
+
+
+def test_impact_level_weights_the_average():
+    overall, per_category = score_cohort([[5, 1, 3, 3, 3]], [0, 0, 1, 2, 3], ["high", "low", "", "", ""])
+    assert per_category[0, 0] == pytest.approx((5 * 3 + 1 * 1) / 4)
+    assert overall[0] == pytest.approx((15 + 1 + 3 * 2 * 3) / 10)
+
+
+def test_missing_answers_are_skipped_and_empty_categories_are_nan():
+    overall, per_category = score_cohort([[NAN, 4, NAN, NAN, 2]], [0, 0, 1, 1, 2])
+    assert overall[0] == 3
+    assert per_category[0, 0] == 4
+    assert np.isnan(per_category[0, 1])
+    assert np.isnan(per_category[0, 3])
+
+    overall, _ = score_cohort([[NAN] * 5])
+    assert np.isnan(overall[0])
+
+
+def test_calculate_scores_returns_plain_values():
+    answers = [str(value % 5 + 1) for value in range(15)]
+    overall, category_scores = calculate_scores(answers)
+    expected_overall, expected_categories = scalar_scores(
+        [float(a) for a in answers], default_question_categories(15).tolist(), ["medium"] * 15
+    )
+    assert isinstance(overall, float)
+    assert overall == pytest.approx(expected_overall)
+    assert list(category_scores) == CATEGORIES
+    assert list(category_scores.values()) == pytest.approx(expected_categories)
+
+
+@pytest.mark.parametrize(
+    "answer, question, expected",
+    [
+        ("4", Question("Scale?", type="scale"), 4.0),
+        ("n/a", Question("Scale?", type="scale"), NAN),
+        ("Never", Question("Choice?", type="multiple-choice", options=("Never", "Sometimes", "Always")), 1.0),
+        ("Sometimes", Question("Choice?", type="multiple-choice", options=("Never", "Sometimes", "Always")), 3.0),
+        ("Always", Question("Choice?", type="multiple-choice", options=("Never", "Sometimes", "Always")), 5.0),
+        ("Other", Question("Choice?", type="multiple-choice", options=("Never", "Always")), NAN),
+        ("We use spreadsheets", Question("Describe?"), NAN),
+    ],
+)
+def test_answer_to_number(answer, question, expected):
+    assert answer_to_number(answer, question) == pytest.approx(expected, nan_ok=True)
@@ -0,0 +1,65 @@
+import json
+
+import pytest
+
+from json_stream import JSONArrayStreamParser, JSONObjectStreamParser, iter_json_array
+
+ELEMENTS = [
+    {"question_text": 'Do you "measure" AI?', "options": ["Yes, [always]", "No {never}"]},
+    [1, [2, 3]],
+    "a \\ backslash, and a comma",
+    42,
+    -1.5e3,
+    True,
+    None,
+]
+ARRAY_TEXT = '```json\n{"questions": ' + json.dumps(ELEMENTS) + "}\n```"
+MEMBERS = {"score": 72, "rationale": 'Data is "siloed", {mostly}', "areas": {"Data": [50, 60]}, "done": False}
+OBJECT_TEXT = "Here you go:\n" + json.dumps(MEMBERS) + "\ntrailing text"
+
+
+def feed_in_chunks(parser, text, size):
+    parsed = []
+    for start in range(0, len(text), size):
+        parsed.extend(parser.feed(text[start : start + size]))
+    return parsed
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, len(ARRAY_TEXT)])
+def test_array_elements_survive_any_chunking(size):
+    parser = JSONArrayStreamParser()
+    assert feed_in_chunks(parser, ARRAY_TEXT, size) == ELEMENTS
+    assert parser.finished
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, len(OBJECT_TEXT)])
+def test_object_members_survive_any_chunking(size):
+    parser = JSONObjectStreamParser()
+    assert dict(feed_in_chunks(parser, OBJECT_TEXT, size)) == MEMBERS
+    assert parser.finished
+
+
+def test_containers_are_returned_at_their_closing_bracket():
+    parser = JSONArrayStreamParser()
+    assert parser.feed('[{"a": 1}') == [{"a": 1}]
+    assert parser.feed(", 2") == []
+    assert parser.feed("]") == [2]
+
+
+def test_object_member_waits_for_its_terminator():
+    parser = JSONObjectStreamParser()
+    assert parser.feed('{"a": {"b": 1}') == []
+    assert parser.feed(', "c"') == [("a", {"b": 1})]
+    assert not parser.finished
+
+
+def test_iter_json_array_stops_at_the_closing_bracket():
+    chunks = iter(["[1, ", "2]", " ignored"])
+    assert list(iter_json_array(chunks)) == [1, 2]
+    assert next(chunks) == " ignored"
+
+
+@pytest.mark.parametrize("parser, text", [(JSONArrayStreamParser(), "[1, tru]"), (JSONObjectStreamParser(), '{"a" 1}')])
+def test_invalid_elements_raise_value_error(parser, text):
+    with pytest.raises(ValueError):
+        parser.feed(text)
@@ -0,0 +1,237 @@
+import threading
+import time
+
+import pytest
+from openai import APIConnectionError, APITimeoutError, BadRequestError
+
+import llm_scheduler
+import openai_helper
+from llm_scheduler import BACKGROUND, INTERACTIVE, Priority, RequestScheduler
+from telemetry import track_call
+
+MESSAGES = [{"role": "user", "content": "Hello"}]
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(llm_scheduler, "retry_delay", lambda error, attempt: 0.0)
+
+
+def make_scheduler(**kwargs):
+    return RequestScheduler(requests_per_minute=10_000, tokens_per_minute=10_000_000, **kwargs)
+
+
+def complete(server, **kwargs):
+    return lambda: server.client().chat.completions.create(model="stub", messages=MESSAGES, **kwargs)
+
+
+def stream_text(chunks):
+    return "".join(chunk.choices[0].delta.content or "" for chunk in chunks if chunk.choices)
+
+
+def test_call_returns_completion(stub_server):
+    scheduler = make_scheduler()
+    completion = scheduler.call(complete(stub_server), tokens=10)
+    assert completion.choices[0].message.content == "Hello from the stub server"
+    assert scheduler.stats() == {"in_flight": 0, "waiting": 0, "retries": 0}
+
+
+def test_call_retries_server_errors(stub_server):
+    stub_server.responses.put({"status": 500})
+    stub_server.responses.put({"status": 429})
+    scheduler = make_scheduler()
+    completion = scheduler.call(complete(stub_server), tokens=10)
+    assert completion.choices[0].message.content == "Hello from the stub server"
+    assert scheduler.retries == 2
+    assert len(stub_server.requests) == 3
+
+
+def test_call_does_not_retry_client_errors(stub_server):
+    stub_server.responses.put({"status": 400})
+    scheduler = make_scheduler()
+    with pytest.raises(BadRequestError):
+        scheduler.call(complete(stub_server), tokens=10)
+    assert scheduler.retries == 0
+    assert scheduler.in_flight == 0
+
+
+def test_call_gives_up_after_max_retries(stub_server):
+    for _ in range(3):
+        stub_server.responses.put({"status": 503})
+    scheduler = make_scheduler(max_retries=2)
+    with pytest.raises(Exception):
+        scheduler.call(complete(stub_server), tokens=10)
+    assert len(stub_server.requests) == 3
+    assert scheduler.in_flight == 0
+
+
+def test_stream_holds_slot_until_exhausted(stub_server):
+    scheduler = make_scheduler()
+    chunks = scheduler.call(complete(stub_server, stream=True), tokens=10, stream=True)
+    first = next(chunks)
+    assert scheduler.in_flight == 1
+    assert stream_text([first, *chunks]) == "Hello from the stub server"
+    assert scheduler.in_flight == 0
+
+
+def test_stream_releases_slot_when_closed(stub_server):
+    scheduler = make_scheduler()
+    chunks = scheduler.call(complete(stub_server, stream=True), tokens=10, stream=True)
+    next(chunks)
+    chunks.close()
+    assert scheduler.in_flight == 0
+
+
+def test_max_concurrency_limits_streams(stub_server):
+    hold = threading.Event()
+    stub_server.responses.put({"content": "First stream", "hold": hold})
+    scheduler = make_scheduler(max_concurrency=1)
+    first = scheduler.call(complete(stub_server, stream=True), tokens=10, stream=True)
+    next(first)
+
+    second_started = threading.Event()
+
+    def read_second():
+        chunks = scheduler.call(complete(stub_server, stream=True), tokens=10, stream=True)
+        next(chunks)
+        second_started.set()
+        list(chunks)
+
+    reader = threading.Thread(target=read_second)
+    reader.start()
+    time.sleep(0.2)
+    assert not second_started.is_set()
+    assert scheduler.stats()["waiting"] == 1
+
+    hold.set()
+    assert stream_text(first) == "First stream"
+    reader.join(5)
+    assert second_started.is_set()
+    assert len(stub_server.requests) == 2
+
+
+def test_stream_retries_failure_before_content(stub_server):
+    # The first event only carries the assistant role
+    stub_server.responses.put({"content": "Hello from the stub server", "fail_after": 1})
+    scheduler = make_scheduler()
+    chunks = scheduler.call(complete(stub_server, stream=True), tokens=10, stream=True)
+    assert stream_text(chunks) == "Hello from the stub server"
+    assert scheduler.retries == 1
+    assert scheduler.in_flight == 0
+
+
+def test_stream_retries_status_errors(stub_server):
+    stub_server.responses.put({"status": 500})
+    scheduler = make_scheduler()
+    chunks = scheduler.call(complete(stub_server, stream=True), tokens=10, stream=True)
+    assert stream_text(chunks) == "Hello from the stub server"
+    assert scheduler.retries == 1
+
+
+def test_stream_raises_failure_after_content(stub_server):
+    stub_server.responses.put({"content": "Hello from the stub server", "fail_after": 3})
+    scheduler = make_scheduler()
+    chunks = scheduler.call(complete(stub_server, stream=True), tokens=10, stream=True)
+    received = []
+    with pytest.raises(APIConnectionError):
+        for chunk in chunks:
+            received.append(chunk)
+    assert stream_text(received) == "Hello from"
+    assert scheduler.retries == 0
+    assert scheduler.in_flight == 0
+
+
+@pytest.mark.parametrize("single_flight", [True, False])
+def test_create_completion_streams_through_scheduler(stub_server, stub_helper, monkeypatch, single_flight):
+    monkeypatch.setattr(openai_helper, "SINGLE_FLIGHT", single_flight)
+    stub_server.responses.put({"status": 502})
+
+    chunks = openai_helper.create_completion("Hello", 50, stream=True)
+    assert stream_text(chunks) == "Hello from the stub server"
+    assert stub_server.requests[-1]["stream_options"] == {"include_usage": True}
+    assert stub_helper.retries == 1
+    # A shared stream is drained by a background thread, which releases the slot when it finishes
+    deadline = time.monotonic() + 5
+    while stub_helper.in_flight and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert stub_helper.in_flight == 0
+
+
+@pytest.mark.parametrize("single_flight", [True, False])
+def test_stream_retries_reach_the_callers_telemetry(stub_server, stub_helper, monkeypatch, single_flight):
+    monkeypatch.setattr(openai_helper, "SINGLE_FLIGHT", single_flight)
+    stub_server.responses.put({"status": 502})
+    with track_call("test") as record:
+        assert stream_text(openai_helper.create_completion("Hello", 50, stream=True)) == "Hello from the stub server"
+    assert stub_helper.retries == 1
+    assert record.retries == 1
+
+
+def test_raise_priority_moves_a_waiting_request_ahead():
+    scheduler = make_scheduler(max_concurrency=1)
+    scheduler.acquire(10)
+    admitted = []
+
+    def wait(name, priority):
+        scheduler.acquire(10, priority)
+        admitted.append(name)
+        scheduler.release()
+
+    leader = Priority(BACKGROUND)
+    threads = [threading.Thread(target=wait, args=("batch", BACKGROUND))]
+    threads[0].start()
+    assert wait_until(lambda: scheduler.stats()["waiting"] == 1)
+    threads.append(threading.Thread(target=wait, args=("joined", leader)))
+    threads[1].start()
+    assert wait_until(lambda: scheduler.stats()["waiting"] == 2)
+
+    scheduler.raise_priority(leader, INTERACTIVE)
+    scheduler.release()
+    for thread in threads:
+        thread.join(5)
+    assert admitted == ["joined", "batch"]
+
+
+def test_interactive_follower_raises_background_leader(stub_server, stub_helper, monkeypatch):
+    hold = threading.Event()
+    stub_server.responses.put({"content": "Shared answer", "hold": hold})
+    raised = []
+    raise_priority = stub_helper.raise_priority
+
+    def record_raise(handle, level):
+        raised.append((handle.level, level))
+        raise_priority(handle, level)
+
+    monkeypatch.setattr(stub_helper, "raise_priority", record_raise)
+
+    leader = threading.Thread(
+        target=lambda: list(openai_helper.create_completion("Hello", 50, BACKGROUND, stream=True))
+    )
+    leader.start()
+    assert wait_until(lambda: stub_helper.in_flight == 1)
+    follower = openai_helper.create_completion("Hello", 50, INTERACTIVE, stream=True)
+    hold.set()
+    assert stream_text(follower) == "Shared answer"
+    leader.join(5)
+    assert raised == [(BACKGROUND, INTERACTIVE)]
+
+
+def wait_until(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_hung_request_is_cut_off_at_the_request_budget(stub_server, stub_helper, monkeypatch, stream):
+    monkeypatch.setattr(openai_helper, "REQUEST_TIMEOUT_SECONDS", 0.5)
+    stub_server.default = {"content": "Too late", "delay": 3}
+    started = time.monotonic()
+    with pytest.raises((TimeoutError, APITimeoutError)):
+        completion = openai_helper.create_completion("Hello", 50, stream=stream)
+        if stream:
+            list(completion)
+    # Retries share the budget instead of each getting a fresh one
+    assert time.monotonic() - started < 2
+    assert wait_until(lambda: stub_helper.in_flight == 0)
@@ -0,0 +1,101 @@
+import json
+import queue
+import threading
+import time
+
+import pytest
+
+import openai_helper
+from models import CompanyInfo
+from pipeline import PipelineCancelled, ResultsPipeline
+from single_flight import SingleFlight
+
+COMPANY = CompanyInfo("Retail", "Medium (51-500 employees)", "Germany")
+SCORE = {
+    "overall_score": 62,
+    "explanation": "Solid data foundations, little governance.",
+    "area_scores": {"AI Strategy and Leadership": 55},
+    "projected_score": 75,
+}
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+@pytest.mark.parametrize("single_flight", [True, False])
+def test_streamed_score_publishes_sections(stub_server, stub_helper, monkeypatch, single_flight):
+    monkeypatch.setattr(openai_helper, "SINGLE_FLIGHT", single_flight)
+    stub_server.default = {"content": json.dumps(SCORE)}
+    pipeline = ResultsPipeline("Q1: 3", COMPANY, {"score": openai_helper.generate_ai_readiness_score})
+
+    sections = dict(pipeline.sections("score", timeout=10))
+    assert sections == SCORE
+    assert pipeline.result("score").overall_score == 62
+
+
+@pytest.mark.parametrize("single_flight", [True, False])
+def test_cancel_stops_streamed_score(stub_server, stub_helper, monkeypatch, single_flight):
+    monkeypatch.setattr(openai_helper, "SINGLE_FLIGHT", single_flight)
+    hold = threading.Event()
+    stub_server.responses.put({"content": json.dumps(SCORE), "hold": hold})
+    pipeline = ResultsPipeline("Q1: 3", COMPANY, {"score": openai_helper.generate_ai_readiness_score})
+    assert wait_for(lambda: stub_helper.in_flight == 1)
+
+    pipeline.cancel()
+    hold.set()
+    with pytest.raises(Exception, match="Pipeline cancelled"):
+        pipeline.futures["score"].result(timeout=10)
+    assert pipeline.feeds["score"]._sections == []
+    assert wait_for(lambda: stub_helper.in_flight == 0)
+    with pytest.raises(PipelineCancelled):
+        pipeline.result("score")
+
+
+def gated_upstream(chunks, closed):
+    # Yields whatever is put on ``chunks`` until None
+    try:
+        for chunk in iter(chunks.get, None):
+            yield chunk
+    finally:
+        closed.set()
+
+
+def test_shared_stream_closes_upstream_when_every_reader_stops():
+    flight = SingleFlight()
+    chunks, closed = queue.Queue(), threading.Event()
+    first, shared = flight.do_stream("key", lambda: gated_upstream(chunks, closed))
+    second, joined = flight.do_stream("key", lambda: pytest.fail("should join the running stream"))
+    assert (shared, joined) == (False, True)
+
+    chunks.put(0)
+    assert next(first) == 0 and next(second) == 0
+    first.close()
+    chunks.put(1)
+    assert not closed.wait(0.1)
+    assert next(second) == 1
+    second.close()
+    # The pump notices at the next chunk
+    chunks.put(2)
+    assert closed.wait(5)
+    assert wait_for(lambda: flight.stats()["in_flight"] == 0)
+
+
+def test_abandoned_shared_stream_is_not_joined():
+    flight = SingleFlight()
+    chunks, closed = queue.Queue(), threading.Event()
+    first, _ = flight.do_stream("key", lambda: gated_upstream(chunks, closed))
+    chunks.put(0)
+    next(first)
+    first.close()
+
+    # Still registered until the pump notices, but a late caller starts its own stream
+    late, shared = flight.do_stream("key", lambda: iter(["fresh"]))
+    assert not shared
+    assert list(late) == ["fresh"]
+    assert flight.stats()["coalesced"] == 0
+    chunks.put(1)
+    assert closed.wait(5)
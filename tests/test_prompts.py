@@ -0,0 +1,79 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+import prompts
+from models import Answer, CompanyInfo
+from openai_helper import (
+    build_questions_prompt,
+    build_recommendations_prompt,
+    build_score_prompt,
+    format_answers,
+)
+from prompts import SYSTEM_PROMPT, build_messages, count_message_tokens, count_tokens
+
+COMPANY = CompanyInfo("Retail", "Medium (51-500 employees)", "Germany")
+ANSWERS = format_answers([Answer(i, f"Answer {i + 1}") for i in range(15)])
+
+
+@pytest.fixture(autouse=True)
+def heuristic_counts(monkeypatch):
+    # tiktoken is optional, so pin the counts every install produces
+    monkeypatch.setattr(prompts, "_get_encoding", lambda: None)
+
+
+def test_system_prompt_is_not_indented():
+    assert SYSTEM_PROMPT.startswith("You are an expert AI readiness consultant")
+    assert "\n2. Data Infrastructure and Management\n" in SYSTEM_PROMPT
+    assert not any(line.startswith(" ") for line in SYSTEM_PROMPT.splitlines())
+
+
+@pytest.mark.parametrize(
+    "prompt",
+    [
+        build_questions_prompt(COMPANY.industry, COMPANY.size, COMPANY.country),
+        build_recommendations_prompt(ANSWERS, COMPANY),
+        build_score_prompt(ANSWERS, COMPANY),
+    ],
+    ids=["questions", "recommendations", "score"],
+)
+def test_prompts_share_system_prefix(prompt):
+    assert build_messages(prompt)[0] == {"role": "system", "content": SYSTEM_PROMPT}
+    assert not prompt.startswith(" ")
+
+
+def test_prompt_token_counts():
+    # Update these deliberately when a prompt changes; an unexpected jump means wasted input tokens
+    assert count_tokens(SYSTEM_PROMPT) == 101
+    built = {
+        "questions": build_questions_prompt(COMPANY.industry, COMPANY.size, COMPANY.country),
+        "recommendations": build_recommendations_prompt(ANSWERS, COMPANY),
+        "score": build_score_prompt(ANSWERS, COMPANY),
+    }
+    counts = {name: count_message_tokens(build_messages(prompt)) for name, prompt in built.items()}
+    assert counts == {"questions": 473, "recommendations": 392, "score": 553}
+
+
+def test_max_tokens_follow_request_size():
+    assert prompts.questions_max_tokens() == 15 * 120 + 100
+    assert prompts.questions_max_tokens(5) == 5 * 120 + 100
+    assert prompts.recommendations_max_tokens() == 5 * 450 + 100
+
+
+def test_long_answers_are_trimmed():
+    trimmed = prompts.trim_answers("word " * 1000 + "\nshort answer", max_tokens=300)
+    first, second = trimmed.splitlines()
+    assert count_tokens(first) <= 302
+    assert first.endswith("...")
+    assert second == "short answer"
+
+
+def test_import_does_not_load_tiktoken():
+    code = "import sys, prompts; print('tiktoken' in sys.modules)"
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    output = subprocess.run(
+        [sys.executable, "-c", code], cwd=root, capture_output=True, text=True, check=True
+    )
+    assert output.stdout.strip() == "False"
@@ -0,0 +1,121 @@
+import json
+import time
+
+import pytest
+
+import openai_helper
+import question_bank
+from cache import ResponseCache
+from llm_backends import iter_stream_chunks, make_completion
+from models import Question, encode_questions
+from prompts import NUM_QUESTIONS
+
+PROFILE = ("Retail", "Small (1-50 employees)", "Germany")
+
+
+def questions_json(count=NUM_QUESTIONS):
+    return json.dumps(
+        {
+            "questions": [
+                {
+                    "question_text": f"How mature is practice {i + 1}?",
+                    "explanation": "",
+                    "type": "scale",
+                    "impact_level": "high",
+                    "options": [],
+                }
+                for i in range(count)
+            ]
+        }
+    )
+
+
+class FixedBackend:
+    def __init__(self, content, finish_reason="stop"):
+        self.content = content
+        self.finish_reason = finish_reason
+        self.calls = 0
+
+    def complete(self, model, messages, max_tokens, **kwargs):
+        self.calls += 1
+        if kwargs.get("stream"):
+            return iter_stream_chunks(self.content, model)
+        return make_completion(self.content, model, finish_reason=self.finish_reason)
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite3"), ttl=60)
+    monkeypatch.setattr(openai_helper, "question_cache", cache)
+    return cache
+
+
+@pytest.fixture
+def backend(monkeypatch):
+    def use(content, finish_reason="stop"):
+        backend = FixedBackend(content, finish_reason)
+        monkeypatch.setattr(openai_helper, "llm_backend", backend)
+        return backend
+
+    return use
+
+
+def cached(cache):
+    return cache.get(openai_helper.questions_cache_key(*PROFILE))
+
+
+def test_complete_set_is_cached(cache, backend):
+    backend(questions_json())
+    assert len(openai_helper.generate_questions(*PROFILE)) == NUM_QUESTIONS
+    assert len(cached(cache)) == NUM_QUESTIONS
+
+
+def test_truncated_response_is_served_but_not_cached(cache, backend):
+    content = questions_json()
+    calls = backend(content[: len(content) // 3], finish_reason="length")
+    partial = openai_helper.generate_questions(*PROFILE)
+    assert 0 < len(partial) < NUM_QUESTIONS
+    assert cached(cache) is None
+    openai_helper.generate_questions(*PROFILE)
+    assert calls.calls == 2
+
+
+def test_short_set_is_not_cached(cache, backend):
+    backend(questions_json(4))
+    assert len(openai_helper.generate_questions(*PROFILE)) == 4
+    assert cached(cache) is None
+
+
+def test_incomplete_set_falls_back_to_stale(cache, backend):
+    key = openai_helper.questions_cache_key(*PROFILE)
+    stale = [Question(f"Stale question {i}?") for i in range(NUM_QUESTIONS)]
+    cache.set(key, encode_questions(stale))
+    cache._connect().execute("UPDATE responses SET created_at = ?", (time.time() - 120,))
+    backend(questions_json(4))
+    assert openai_helper.generate_questions(*PROFILE) == stale
+
+
+def test_complete_stream_is_cached(cache, backend):
+    backend(questions_json())
+    assert len(list(openai_helper.generate_questions_stream(*PROFILE))) == NUM_QUESTIONS
+    assert len(cached(cache)) == NUM_QUESTIONS
+
+
+@pytest.mark.parametrize("content", [questions_json()[:-300], questions_json(4)], ids=["cut-off", "short"])
+def test_incomplete_stream_is_shown_but_not_cached(cache, backend, content):
+    backend(content)
+    questions = list(openai_helper.generate_questions_stream(*PROFILE))
+    assert 0 < len(questions) < NUM_QUESTIONS
+    assert cached(cache) is None
+
+
+def test_bank_warm_skips_incomplete_sets(tmp_path, backend, monkeypatch):
+    bank = question_bank.QuestionBank(str(tmp_path / "bank.sqlite3"))
+    monkeypatch.setattr(question_bank, "warm_profiles", lambda bank, top_countries: [PROFILE])
+    backend(questions_json(4))
+    assert question_bank.warm(bank) == (0, 1)
+    assert bank.get(*PROFILE) is None
+
+    backend(questions_json())
+    assert question_bank.warm(bank) == (1, 0)
+    assert len(bank.get(*PROFILE)) == NUM_QUESTIONS
@@ -0,0 +1,42 @@
+import logging
+from types import SimpleNamespace
+
+import pytest
+
+import telemetry
+from telemetry import call_cost, log_response, note_usage, percentile, render_prometheus, track_call
+
+
+def test_call_cost_matches_dated_snapshots_by_longest_prefix():
+    assert call_cost("gpt-4o-mini-2024-07-18", 1_000_000, 1_000_000) == pytest.approx(0.75)
+    assert call_cost("gpt-4o-2024-08-06", 1_000_000, 0) == pytest.approx(2.50)
+    assert call_cost("unknown-model", 1000, 1000) == 0.0
+    assert call_cost(None, 1000, 1000) == 0.0
+
+
+def test_cost_is_recorded_and_exported():
+    with track_call("cost_test") as record:
+        note_usage(SimpleNamespace(prompt_tokens=2000, completion_tokens=1000), "gpt-4o-mini")
+    assert record.cost_usd == pytest.approx((2000 * 0.15 + 1000 * 0.60) / 1_000_000)
+    assert 'llm_cost_usd_total{function="cost_test"} 0.0009' in render_prometheus()
+
+
+def test_sampled_responses_reach_a_handler(monkeypatch):
+    monkeypatch.setattr(telemetry, "LOG_SAMPLE_RATE", 1.0)
+    records = []
+    handler = logging.Handler()
+    handler.emit = records.append
+    telemetry.logger.addHandler(handler)
+    try:
+        log_response("generate_questions", "{}")
+    finally:
+        telemetry.logger.removeHandler(handler)
+    assert telemetry.logger.isEnabledFor(logging.INFO)
+    assert [record.levelno for record in records] == [logging.INFO]
+
+
+def test_percentile_uses_nearest_rank():
+    latencies = [0.5, 0.1, 0.4, 0.2, 0.3]
+    assert percentile(latencies, 0.5) == 0.3
+    assert percentile(latencies, 0.99) == 0.5
+    assert percentile([], 0.95) == 0.0
@@ -1,17 +1,97 @@
-import plotly.express as px
-import plotly.graph_objects as go
+import os
+from functools import lru_cache, wraps
 
+CHART_CACHE_SIZE = int(os.getenv("AI_READINESS_CHART_CACHE_SIZE", "256"))
+
+
+def _go():
+    # plotly.graph_objects takes a noticeable share of cold start, so defer it
+    import plotly.graph_objects as go
+
+    return go
+
+
+class _FrozenDict(tuple):
+    pass
+
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return _FrozenDict((key, _freeze(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _thaw(value):
+    if isinstance(value, _FrozenDict):
+        return {key: _thaw(item) for key, item in value}
+    return value
+
+
+def memoize_chart(builder):
+    """
+    Cache a figure builder on the value of its arguments, so identical scores
+    on a Streamlit rerun reuse the same figure. st.plotly_chart still validates
+    and serializes the figure on every rerun; only building it is saved.
+
+    Returned figures are shared between callers and must not be mutated.
+    """
+
+    @lru_cache(maxsize=CHART_CACHE_SIZE)
+    def cached_figure(args, kwargs):
+        return builder(*[_thaw(arg) for arg in args], **_thaw(kwargs))
+
+    @wraps(builder)
+    def wrapper(*args, **kwargs):
+        return cached_figure(_freeze(list(args)), _freeze(dict(sorted(kwargs.items()))))
+
+    wrapper.cache_info = cached_figure.cache_info
+    wrapper.cache_clear = cached_figure.cache_clear
+    return wrapper
+
+
+@memoize_chart
+def create_radar_chart(area_scores, max_score=100):
+    go = _go()
+    categories = list(area_scores.keys())
+    values = list(area_scores.values())
+
+    fig = go.Figure(data=go.Scatterpolar(r=values, theta=categories, fill="toself"))
 
-def create_radar_chart(df):
-    fig = px.line_polar(df, r="Score", theta="Category", line_close=True)
-    fig.update_traces(fill="toself")
     fig.update_layout(
-        polar=dict(radialaxis=dict(visible=True, range=[0, 5])), showlegend=False
+        polar=dict(radialaxis=dict(visible=True, range=[0, max_score])), showlegend=False
     )
+
     return fig
 
 
-def create_gauge_chart(score):
+@memoize_chart
+def create_benchmark_chart(company_score, industry_avg, top_10, bottom_10, median):
+    go = _go()
+    fig = go.Figure()
+
+    fig.add_trace(
+        go.Bar(
+            x=["Your Company", "Industry Average", "Top 10%", "Median", "Bottom 10%"],
+            y=[company_score, industry_avg, top_10, median, bottom_10],
+            marker_color=["#1E90FF", "#808080", "#90EE90", "#FFA500", "#FF6347"],
+        )
+    )
+
+    fig.update_layout(
+        title="AI Readiness Score Benchmark",
+        yaxis_title="AI Readiness Score",
+        yaxis=dict(range=[0, 100]),
+    )
+
+    return fig
+
+
+@memoize_chart
+def create_gauge_chart(score, max_score=5):
+    go = _go()
+    step = max_score / 5
     fig = go.Figure(
         go.Indicator(
             mode="gauge+number",
@@ -19,14 +99,14 @@ def create_gauge_chart(score):
             domain={"x": [0, 1], "y": [0, 1]},
             title={"text": "Overall AI Readiness Score"},
             gauge={
-                "axis": {"range": [0, 5], "tickwidth": 1, "tickcolor": "darkblue"},
+                "axis": {"range": [0, max_score], "tickwidth": 1, "tickcolor": "darkblue"},
                 "bar": {"color": "darkblue"},
                 "steps": [
-                    {"range": [0, 1], "color": "red"},
-                    {"range": [1, 2], "color": "orange"},
-                    {"range": [2, 3], "color": "yellow"},
-                    {"range": [3, 4], "color": "lightgreen"},
-                    {"range": [4, 5], "color": "green"},
+                    {"range": [0, step], "color": "red"},
+                    {"range": [step, 2 * step], "color": "orange"},
+                    {"range": [2 * step, 3 * step], "color": "yellow"},
+                    {"range": [3 * step, 4 * step], "color": "lightgreen"},
+                    {"range": [4 * step, max_score], "color": "green"},
                 ],
             },
         )
@@ -34,7 +114,9 @@ def create_gauge_chart(score):
     return fig
 
 
-def create_bar_chart(scores, title):
+@memoize_chart
+def create_bar_chart(scores, title, max_score=5):
+    go = _go()
     fig = go.Figure(
         go.Bar(
             x=list(scores.keys()),
@@ -47,6 +129,38 @@ def create_bar_chart(scores, title):
         title=title,
         xaxis_title="Category",
         yaxis_title="Score",
-        yaxis=dict(range=[0, 5])
+        yaxis=dict(range=[0, max_score])
+    )
+    return fig
+
+
+@memoize_chart
+def create_distribution_chart(counts, bin_width=5):
+    go = _go()
+    fig = go.Figure(
+        go.Bar(
+            x=[f"{start:g}-{start + bin_width - 1:g}" for start in counts],
+            y=list(counts.values()),
+        )
+    )
+    fig.update_layout(
+        title="Overall Score Distribution",
+        xaxis_title="AI Readiness Score",
+        yaxis_title="Assessments",
+    )
+    return fig
+
+
+@memoize_chart
+def create_trend_chart(series, title, max_score=100):
+    go = _go()
+    fig = go.Figure()
+    for name, points in series.items():
+        fig.add_trace(go.Scatter(x=list(points.keys()), y=list(points.values()), mode="lines+markers", name=name))
+    fig.update_layout(
+        title=title,
+        xaxis_title="Month",
+        yaxis_title="Mean Score",
+        yaxis=dict(range=[0, max_score]),
     )
     return fig